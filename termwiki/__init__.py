@@ -1,17 +1,42 @@
 # ** termwiki/__init__.py
 
-import bdb
 import os
-import click
-from rich.traceback import install as rich_traceback_install
+import sys
 
 from termwiki import consts
-from termwiki.log import console
 
 
-rich_traceback_install(
-    console=console, width=console.width, show_locals=True, extra_lines=5, suppress=(click, bdb)
-)
+def install_rich_traceback_on_first_exception():
+    """
+    Importing rich.traceback and click takes longer than the rest of the startup,
+    so they're imported only when there's an uncaught exception to show.
+    """
+    original_excepthook = sys.excepthook
+
+    def rich_excepthook(exc_type, exc_value, traceback):
+        try:
+            import bdb
+
+            import click
+            from rich.traceback import install as rich_traceback_install
+
+            from termwiki.log import console
+
+            rich_traceback_install(
+                console=console,
+                width=console.width,
+                show_locals=True,
+                extra_lines=5,
+                suppress=(click, bdb),
+            )
+        except ImportError:
+            sys.excepthook = original_excepthook
+        sys.excepthook(exc_type, exc_value, traceback)
+
+    sys.excepthook = rich_excepthook
+
+
+install_rich_traceback_on_first_exception()
 
 
 def improve_debug_convenience():
@@ -38,4 +63,7 @@ def improve_debug_convenience():
 if not consts.PYCHARM_HOSTED:
     improve_debug_convenience()
 
-from termwiki.page import page_tree
+from termwiki.util import lazy_import
+
+# Neither the page tree nor the pages package is built or imported until first accessed
+_, __getattr__ = lazy_import(__name__, ["termwiki.page:page_tree"])
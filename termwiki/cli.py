@@ -1,58 +1,44 @@
 from __future__ import annotations
 
-import subprocess
+import functools
 import sys
 from collections import OrderedDict
 from collections.abc import Sequence
-from typing import Iterable, Literal
-
-import click
+from typing import TYPE_CHECKING, Iterable
 
 from termwiki import page_tree
 from termwiki.log import log, log_in_out
-from termwiki.page import Page, PageNotFound
+from termwiki.page import FileTooLarge, Page, PageNotFound, UnreadableFile
 from termwiki.render import render_page
 
-fuzzy_search_cache = OrderedDict()
-
+if TYPE_CHECKING:
+    import click
 
-def check_output(
-    *args, **kwargs
-) -> tuple[Literal[True], str] | tuple[Literal[False], subprocess.CalledProcessError]:
-    try:
-        output: str = subprocess.check_output(*args, **kwargs).decode("utf-8").strip()
-        return True, output
-    except subprocess.CalledProcessError as e:
-        return False, e
+fuzzy_search_cache = OrderedDict()
 
 
 @log_in_out
 def fuzzy_search(iterable: Iterable[str], search_term: str) -> str | None:
-    # --exit-0 --select-1 --inline-info
-    # --no-select-1 --no-exit-0
-    if sys.stdin.isatty():
-        fzf_args = (
-            "--cycle --reverse --keep-right --scroll-off=1 --header-first"
-            f' --header="{search_term} not found; did you mean..."'
-        )
-    else:
-        fzf_args = "--filter --select-1"
-    line_separated_items = "\n".join(iterable)
-    command = f'echo "{line_separated_items}" | fzf {fzf_args} -q {search_term}'
-    succeeded, output = check_output(command, shell=True)
-    if succeeded:
-        return output
-    succeeded, interactive_output = check_output(command.partition(" -q")[0], shell=True)
-    if not succeeded:
-        log.error(f"Fuzzy search failed with {output!r}")
-        return None
-    return interactive_output
-
-
-def get_page(page_path: Sequence[str]) -> tuple[list[str], Page]:
+    """
+    Lets the user choose the page they meant among 'iterable', or, when stdin isn't
+    a terminal, returns the best match (like `fzf --filter --select-1`).
+    """
+    from termwiki import fuzzy_picker
+
+    if not sys.stdin.isatty():
+        matches = fuzzy_picker.filter_candidates(iterable, search_term)
+        return matches[0] if matches else None
+    return fuzzy_picker.pick(
+        iterable, search_term, header=f"{search_term} not found; did you mean..."
+    )
+
+
+def get_page(page_path: Sequence[str], max_depth: int | None = None) -> tuple[list[str], Page]:
     # todo: on_not_found=fuzzy_search is problematic, because what if
     #  want page from another indentation?
-    found_path, page = page_tree.deep_search(page_path, on_not_found=fuzzy_search, recursive=True)
+    found_path, page = page_tree.deep_search(
+        page_path, on_not_found=fuzzy_search, recursive=True, max_depth=max_depth
+    )
 
     if not page:
         error = f"Page not found! {page_path=} | {found_path=}"
@@ -64,25 +50,23 @@ def get_page(page_path: Sequence[str]) -> tuple[list[str], Page]:
 def print_subpages(page):
     list(page.traverse())
     print(page.name())
-    [print(f" · {p}") for p in page.pages]
+    [print(f" · {p}") for p in page.sub_pages()]
     return True
 
 
 def show_help():
     log.error("Must specify a page path.\n")
-    ctx = main.context_class(main)
-    print(main.get_help(ctx))
+    command = create_click_command()
+    ctx = command.context_class(command)
+    print(command.get_help(ctx))
 
 
-@click.command(no_args_is_help=True, context_settings={"help_option_names": ["-", "--help"]})
-@click.argument("page_path", required=False, nargs=-1)
-@click.option("-l", "--list", "list_subpages", is_flag=True, help="List subpages")
-def main(page_path: tuple[str], list_subpages: bool):
+def show_page(page_path: tuple[str], *, list_subpages: bool = False, max_depth: int | None = None):
     if not page_path or not any(page_path):
         show_help()
         return sys.exit(1)
     try:
-        found_path, page = get_page(page_path)
+        found_path, page = get_page(page_path, max_depth)
     except Exception as e:
         log.error(repr(e), exc_info=True)
         return sys.exit(1)
@@ -90,6 +74,47 @@ def main(page_path: tuple[str], list_subpages: bool):
     if list_subpages:
         return print_subpages(page)
 
-    rendered_text = render_page(page)
+    try:
+        rendered_text = render_page(page)
+    except FileTooLarge:
+        # It was asked for explicitly, so it's printed as is, without reading it into memory
+        for chunk in page.stream():
+            sys.stdout.write(chunk)
+        return sys.exit(0)
+    except UnreadableFile as e:
+        log.error(f"Can't show {'/'.join(found_path)}: {e.__class__.__name__} ({e})")
+        return sys.exit(1)
     print(rendered_text)
     return sys.exit(0)
+
+
+@functools.cache
+def create_click_command() -> "click.Command":
+    import click
+
+    @click.command(no_args_is_help=True, context_settings={"help_option_names": ["-", "--help"]})
+    @click.argument("page_path", required=False, nargs=-1)
+    @click.option("-l", "--list", "list_subpages", is_flag=True, help="List subpages")
+    @click.option(
+        "-d",
+        "--max-depth",
+        type=click.IntRange(min=1),
+        default=None,
+        help="Search at most this many levels down",
+    )
+    def tw(page_path: tuple[str], list_subpages: bool, max_depth: int | None):
+        return show_page(page_path, list_subpages=list_subpages, max_depth=max_depth)
+
+    return tw
+
+
+def main(argv: Sequence[str] | None = None):
+    """
+    `tw PAGE...` is the common case and doesn't need click, which is imported only
+    when there are options to parse or help to show.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and not any(arg.startswith("-") for arg in argv):
+        return show_page(tuple(argv))
+    return create_click_command().main(list(argv), prog_name="tw")
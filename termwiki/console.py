@@ -0,0 +1,114 @@
+"""
+Rich-based console and logging handler.
+Importing rich is relatively slow, so termwiki.log imports this module only when
+something is actually logged or printed to the console.
+"""
+
+import logging
+import sys
+from typing import ClassVar
+
+from rich.console import Console as RichConsole
+from rich.logging import RichHandler
+from rich.theme import Theme
+
+from termwiki import consts
+from termwiki.log import _format_args
+
+
+class Console(RichConsole):
+    _theme: ClassVar[dict[str, str]] = {
+        "debug": "dim",
+        "warn": "yellow",
+        "warning": "yellow",
+        "error": "red",
+        "fatal": "bright_red",
+        "success": "green",
+        "prompt": "b bright_cyan",
+        "title": "b bright_white",
+    }
+
+    def __init__(self, **kwargs):
+        theme = kwargs.pop(
+            "theme", Theme({**self._theme, **{k.upper(): v for k, v in self._theme.items()}})
+        )
+        super().__init__(
+            color_system="truecolor",
+            # force_terminal=True,
+            width=kwargs.pop("width", None if sys.stdin.isatty() else consts.NON_INTERACTIVE_WIDTH),
+            file=kwargs.pop("file", sys.stdout if consts.PYCHARM_HOSTED else sys.stderr),
+            tab_size=kwargs.pop("tab_size", 2),
+            log_time=kwargs.pop("log_time", False),
+            # log_time_format='[%d.%m.%Y][%T]',
+            log_path=kwargs.pop("log_path", True),
+            theme=theme,
+            **kwargs,
+            # safe_box=False,
+            # soft_wrap=True,
+        )
+        self.width -= 2
+
+    if consts.DEBUG:
+
+        @_format_args
+        def debug(self, *args, **kwargs):
+            return self.log(*args, _stack_offset=kwargs.pop("_stack_offset", 3), **kwargs)
+
+    else:
+
+        def debug(self, *args, **kwargs):
+            pass
+
+        print(f" ! Console.debug() disabled\n")
+
+    @_format_args
+    def info(self, *args, **kwargs):
+        return self.log(*args, _stack_offset=kwargs.pop("_stack_offset", 3), **kwargs)
+
+    @_format_args
+    def warning(self, *args, **kwargs):
+        return self.log(*args, _stack_offset=kwargs.pop("_stack_offset", 3), **kwargs)
+
+    @_format_args
+    def error(self, *args, **kwargs):
+        return self.log(*args, _stack_offset=kwargs.pop("_stack_offset", 3), **kwargs)
+
+    @_format_args
+    def fatal(self, *args, **kwargs):
+        return self.log(*args, _stack_offset=kwargs.pop("_stack_offset", 3), **kwargs)
+
+    @_format_args
+    def success(self, *args, **kwargs):
+        return self.log(*args, _stack_offset=kwargs.pop("_stack_offset", 3), **kwargs)
+
+    @_format_args
+    def prompt(self, *args, **kwargs):
+        return self.log(*args, _stack_offset=kwargs.pop("_stack_offset", 3), **kwargs)
+
+    @_format_args
+    def title(self, *args, **kwargs):
+        return self.log(*args, _stack_offset=kwargs.pop("_stack_offset", 3), **kwargs)
+
+
+class MyRichHandler(RichHandler):
+    def emit(self, record: logging.LogRecord) -> None:
+        record_pathname = getattr(record, "pathname", None)
+        if record_pathname:
+            record_pathname = record_pathname.removeprefix(consts.PROJECT_ROOT_PATH)
+            if "site-packages/" in record_pathname:
+                *venv_path, record_pathname = record_pathname.partition("site-packages/")
+            record.pathname = record_pathname
+        super().emit(record)
+
+
+def create_rich_handler(console: Console, level: int) -> MyRichHandler:
+    return MyRichHandler(
+        console=console,
+        level=level,
+        markup=True,
+        omit_repeated_times=False,
+        enable_link_path=False,
+        rich_tracebacks=True,
+        tracebacks_show_locals=True,
+        locals_max_string=max(console.width, consts.NON_INTERACTIVE_WIDTH) - 20,
+    )
@@ -8,6 +8,14 @@ PROJECT_ROOT_PATH = str(Path(termwiki.__path__[0]).parent) + "/"
 DEBUG: bool = os.getenv("TERMWIKI_DEBUG", "true").lower() in ("1", "true")
 PYCHARM_HOSTED = os.getenv("PYCHARM_HOSTED", "0") == "1"
 NON_INTERACTIVE_WIDTH = 160
+CACHE_DIR_PATH = Path(
+    os.getenv("TERMWIKI_CACHE_DIR")
+    or Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "termwiki"
+)
+FILE_PAGE_MAX_BYTES = int(os.getenv("TERMWIKI_FILE_PAGE_MAX_BYTES") or 1024 * 1024)
+"""Larger files aren't read into memory; they're only streamed when asked for explicitly."""
+FILE_PAGE_SNIFF_BYTES = int(os.getenv("TERMWIKI_FILE_PAGE_SNIFF_BYTES") or 8192)
+"""How much of a file is looked at to tell whether it's binary."""
 
 literal_linebreak = r"\n"
 linebreak = "\n"
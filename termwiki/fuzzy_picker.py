@@ -0,0 +1,306 @@
+"""
+An in-process, fzf-like fuzzy picker: 'filter_candidates' ranks candidates against a query
+non-interactively (like `fzf --filter`), and 'pick' lets the user choose one in the
+terminal, narrowing the previous matches with each typed character instead of
+rescoring all candidates.
+"""
+
+import os
+from collections.abc import Iterable
+from typing import NamedTuple
+
+WORD_SEPARATORS = frozenset(" _-./")
+MATCH_SCORE = 16
+WORD_START_BONUS = 8
+CONSECUTIVE_BONUS = 4
+GAP_START_PENALTY = 3
+GAP_EXTENSION_PENALTY = 1
+
+
+class Match(NamedTuple):
+    score: int
+    positions: tuple[int, ...]
+    """Indices in the candidate of the query's characters."""
+
+
+def match(query: str, candidate: str) -> Match | None:
+    """
+    Whether query's characters appear in candidate in order (case-insensitively), and how well:
+    characters at the start of words, and runs of consecutive ones, score higher,
+    and gaps lower.
+    Like fzf, the match is the shortest one that ends where the first one ends.
+    Returns None if it doesn't match.
+    """
+    if not query:
+        return Match(0, ())
+    text = candidate.lower()
+    query = query.lower()
+    query_index = 0
+    end = -1
+    for i, char in enumerate(text):
+        if char == query[query_index]:
+            query_index += 1
+            if query_index == len(query):
+                end = i
+                break
+    if end == -1:
+        return None
+    positions = []
+    query_index = len(query) - 1
+    for i in range(end, -1, -1):
+        if text[i] == query[query_index]:
+            positions.append(i)
+            query_index -= 1
+            if query_index < 0:
+                break
+    positions.reverse()
+
+    score = 0
+    previous_position = None
+    chunk_bonus = 0
+    for position in positions:
+        bonus = WORD_START_BONUS if _is_word_start(candidate, position) else 0
+        if previous_position is not None and position == previous_position + 1:
+            # A run of consecutive characters is as good as its best start
+            chunk_bonus = max(chunk_bonus, bonus, CONSECUTIVE_BONUS)
+            bonus = chunk_bonus
+        else:
+            if previous_position is not None:
+                gap = position - previous_position - 1
+                score -= GAP_START_PENALTY + GAP_EXTENSION_PENALTY * (gap - 1)
+            chunk_bonus = bonus
+        score += MATCH_SCORE + bonus
+        previous_position = position
+    return Match(score, tuple(positions))
+
+
+def _is_word_start(candidate: str, position: int) -> bool:
+    if position == 0:
+        return True
+    previous_char, char = candidate[position - 1], candidate[position]
+    return previous_char in WORD_SEPARATORS or (previous_char.islower() and char.isupper())
+
+
+class FuzzyFilter:
+    """
+    The candidates matching a query, best first; ties go to the shorter candidate,
+    then to the one that comes first.
+    Setting a query that extends the previous one only rescores the previous matches,
+    since whatever matches the longer query also matches its prefix; results of shorter
+    queries are kept, so deleting characters doesn't rescore anything.
+    """
+
+    def __init__(self, candidates: Iterable[str]) -> None:
+        self.candidates: list[str] = list(dict.fromkeys(candidates))
+        self._indices = {candidate: i for i, candidate in enumerate(self.candidates)}
+        self._results: list[tuple[str, list[tuple[str, Match]]]] = [
+            ("", [(candidate, Match(0, ())) for candidate in self.candidates])
+        ]
+        """(query, matches) of the current query and its cached prefixes, shortest first."""
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(candidates={len(self.candidates)}, query={self.query!r})"
+
+    @property
+    def query(self) -> str:
+        return self._results[-1][0]
+
+    @property
+    def matches(self) -> list[tuple[str, Match]]:
+        return self._results[-1][1]
+
+    def set_query(self, query: str) -> list[tuple[str, Match]]:
+        while not query.startswith(self._results[-1][0]):
+            self._results.pop()
+        while self.query != query:
+            narrowed_query = query[: len(self.query) + 1]
+            narrowed_matches = []
+            for candidate, _ in self.matches:
+                candidate_match = match(narrowed_query, candidate)
+                if candidate_match is not None:
+                    narrowed_matches.append((candidate, candidate_match))
+            narrowed_matches.sort(key=self._sort_key)
+            self._results.append((narrowed_query, narrowed_matches))
+        return self.matches
+
+    def _sort_key(self, item: tuple[str, Match]) -> tuple[int, int, int]:
+        candidate, candidate_match = item
+        return -candidate_match.score, len(candidate), self._indices[candidate]
+
+
+def filter_candidates(candidates: Iterable[str], query: str) -> list[str]:
+    """The candidates that match query, best first. Like `fzf --filter`."""
+    return [candidate for candidate, _ in FuzzyFilter(candidates).set_query(query)]
+
+
+KEYS = {
+    "\r": "accept",
+    "\n": "accept",
+    "\x1b": "abort",
+    "\x03": "abort",  # ctrl-c
+    "\x07": "abort",  # ctrl-g
+    "\x7f": "backspace",
+    "\x08": "backspace",
+    "\x15": "clear",  # ctrl-u
+    "\x17": "delete_word",  # ctrl-w
+    "\x1b[A": "up",
+    "\x10": "up",  # ctrl-p
+    "\x0b": "up",  # ctrl-k
+    "\x1b[B": "down",
+    "\x0e": "down",  # ctrl-n
+    "\t": "down",
+    "\x1b[Z": "up",  # shift-tab
+}
+
+
+def split_keys(data: str) -> list[str]:
+    """
+    Splits what was read from the terminal into keys, keeping escape sequences whole.
+    A CSI sequence ('\x1b[' + parameters + a final byte, e.g. Delete's '\x1b[3~' or
+    ctrl-up's '\x1b[1;5A') is one key. SS3 ('\x1bO' + a byte) keys are read as their
+    CSI equivalent, so e.g. arrows are the same key in both cursor modes.
+    """
+    keys = []
+    i = 0
+    while i < len(data):
+        if data[i] == "\x1b" and data[i + 1 : i + 2] == "O" and i + 2 < len(data):
+            keys.append("\x1b[" + data[i + 2])
+            i += 3
+        elif data[i] == "\x1b" and data[i + 1 : i + 2] == "[" and i + 2 < len(data):
+            end = i + 2
+            while end < len(data) and not "\x40" <= data[end] <= "\x7e":
+                end += 1
+            keys.append(data[i : end + 1])
+            i = end + 1
+        else:
+            keys.append(data[i])
+            i += 1
+    return keys
+
+
+class Picker:
+    """
+    The state of an interactive pick: the query, the matches and the selected one.
+    handle_key() applies a key, and render() returns the lines to show; 'pick' does
+    the terminal I/O.
+    """
+
+    def __init__(
+        self,
+        candidates: Iterable[str],
+        query: str = "",
+        *,
+        header: str | None = None,
+        height: int = 10,
+    ) -> None:
+        self.fuzzy_filter = FuzzyFilter(candidates)
+        self.header = header
+        self.height = height
+        self.selected = 0
+        self.done = False
+        self.result: str | None = None
+        self.set_query(query)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(query={self.query!r}, selected={self.selected})"
+
+    @property
+    def query(self) -> str:
+        return self.fuzzy_filter.query
+
+    def set_query(self, query: str) -> None:
+        self.fuzzy_filter.set_query(query)
+        self.selected = 0
+
+    def handle_key(self, key: str) -> bool:
+        """Applies key. Returns whether the pick is done (see self.result)."""
+        action = KEYS.get(key)
+        matches = self.fuzzy_filter.matches
+        if action == "accept":
+            self.result = matches[self.selected][0] if matches else None
+            self.done = True
+        elif action == "abort":
+            self.result = None
+            self.done = True
+        elif action == "backspace":
+            self.set_query(self.query[:-1])
+        elif action == "clear":
+            self.set_query("")
+        elif action == "delete_word":
+            self.set_query(self.query.rstrip().rpartition(" ")[0])
+        elif action == "up":
+            if matches:
+                self.selected = (self.selected - 1) % min(len(matches), self.height)
+        elif action == "down":
+            if matches:
+                self.selected = (self.selected + 1) % min(len(matches), self.height)
+        elif key.isprintable():
+            self.set_query(self.query + key)
+        return self.done
+
+    def render(self, width: int = 80) -> list[str]:
+        """The header (if any), the prompt line, and the top matches, selected one marked."""
+        lines = [] if self.header is None else [self.header[:width]]
+        matches = self.fuzzy_filter.matches
+        lines.append(f"> {self.query}  {len(matches)}/{len(self.fuzzy_filter.candidates)}")
+        for i, (candidate, candidate_match) in enumerate(matches[: self.height]):
+            highlighted_chars = []
+            positions = set(candidate_match.positions)
+            for position, char in enumerate(candidate[: width - 2]):
+                highlighted_chars.append(
+                    f"\x1b[1m{char}\x1b[22m" if position in positions else char
+                )
+            marker = "\x1b[7m>\x1b[27m " if i == self.selected else "  "
+            lines.append(marker + "".join(highlighted_chars))
+        return lines
+
+    @property
+    def prompt_line_index(self) -> int:
+        return 0 if self.header is None else 1
+
+
+def pick(
+    candidates: Iterable[str], query: str = "", *, header: str | None = None, height: int = 10
+) -> str | None:
+    """
+    Lets the user choose one of the candidates in the terminal (/dev/tty, so it works
+    when stdin or stdout are piped), starting with query. If nothing matches query,
+    starts with an empty query. Returns None if aborted.
+    """
+    import termios
+    import tty
+
+    picker = Picker(candidates, query, header=header, height=height)
+    if not picker.fuzzy_filter.matches:
+        picker.set_query("")
+    tty_fd = os.open("/dev/tty", os.O_RDWR)
+    original_attributes = termios.tcgetattr(tty_fd)
+    try:
+        tty.setraw(tty_fd)
+        _draw(tty_fd, picker, first=True)
+        while True:
+            data = os.read(tty_fd, 1024).decode(errors="ignore")
+            if any(picker.handle_key(key) for key in split_keys(data)):
+                break
+            _draw(tty_fd, picker)
+    finally:
+        # Erase the picker, and leave the cursor where it started
+        os.write(tty_fd, _up(picker.prompt_line_index).encode() + b"\r\x1b[J")
+        termios.tcsetattr(tty_fd, termios.TCSADRAIN, original_attributes)
+        os.close(tty_fd)
+    return picker.result
+
+
+def _up(line_count: int) -> str:
+    return f"\x1b[{line_count}A" if line_count else ""
+
+
+def _draw(tty_fd: int, picker: Picker, *, first: bool = False) -> None:
+    """Redraws the picker, with the cursor left at the end of the prompt line."""
+    width = os.get_terminal_size(tty_fd).columns or 80
+    lines = picker.render(width)
+    output = "" if first else _up(picker.prompt_line_index)
+    output += "\r\x1b[J" + "\r\n".join(lines)
+    output += _up(len(lines) - 1 - picker.prompt_line_index)
+    output += f"\r\x1b[{len(picker.query) + 2}C"
+    os.write(tty_fd, output.encode())
@@ -1,11 +1,6 @@
 import functools
 import inspect
 import logging
-import sys
-
-from rich.console import Console as RichConsole
-from rich.logging import RichHandler
-from rich.theme import Theme
 
 from termwiki import consts
 
@@ -56,110 +51,54 @@ def log_in_out(func_or_nothing=None, watch=()):
     return decorator
 
 
-class Console(RichConsole):
-    _theme = {
-        "debug": "dim",
-        "warn": "yellow",
-        "warning": "yellow",
-        "error": "red",
-        "fatal": "bright_red",
-        "success": "green",
-        "prompt": "b bright_cyan",
-        "title": "b bright_white",
-    }
-
-    def __init__(self, **kwargs):
-        theme = kwargs.pop(
-            "theme", Theme({**self._theme, **{k.upper(): v for k, v in self._theme.items()}})
-        )
-        super().__init__(
-            color_system="truecolor",
-            # force_terminal=True,
-            width=kwargs.pop("width", None if sys.stdin.isatty() else consts.NON_INTERACTIVE_WIDTH),
-            file=kwargs.pop("file", sys.stdout if consts.PYCHARM_HOSTED else sys.stderr),
-            tab_size=kwargs.pop("tab_size", 2),
-            log_time=kwargs.pop("log_time", False),
-            # log_time_format='[%d.%m.%Y][%T]',
-            log_path=kwargs.pop("log_path", True),
-            theme=theme,
-            **kwargs,
-            # safe_box=False,
-            # soft_wrap=True,
-        )
-        self.width -= 2
-
-    if consts.DEBUG:
-
-        @_format_args
-        def debug(self, *args, **kwargs):
-            return self.log(*args, _stack_offset=kwargs.pop("_stack_offset", 3), **kwargs)
-
-    else:
-
-        def debug(self, *args, **kwargs):
-            pass
-
-        print(f" ! Console.debug() disabled\n")
-
-    @_format_args
-    def info(self, *args, **kwargs):
-        return self.log(*args, _stack_offset=kwargs.pop("_stack_offset", 3), **kwargs)
-
-    @_format_args
-    def warning(self, *args, **kwargs):
-        return self.log(*args, _stack_offset=kwargs.pop("_stack_offset", 3), **kwargs)
-
-    @_format_args
-    def error(self, *args, **kwargs):
-        return self.log(*args, _stack_offset=kwargs.pop("_stack_offset", 3), **kwargs)
-
-    @_format_args
-    def fatal(self, *args, **kwargs):
-        return self.log(*args, _stack_offset=kwargs.pop("_stack_offset", 3), **kwargs)
-
-    @_format_args
-    def success(self, *args, **kwargs):
-        return self.log(*args, _stack_offset=kwargs.pop("_stack_offset", 3), **kwargs)
-
-    @_format_args
-    def prompt(self, *args, **kwargs):
-        return self.log(*args, _stack_offset=kwargs.pop("_stack_offset", 3), **kwargs)
-
-    @_format_args
-    def title(self, *args, **kwargs):
-        return self.log(*args, _stack_offset=kwargs.pop("_stack_offset", 3), **kwargs)
-
-
-class MyRichHandler(RichHandler):
+class LazyRichHandler(logging.Handler):
+    """
+    Creates the rich handler (and the console) only when the first record is emitted,
+    so importing termwiki doesn't pay for importing rich.
+    """
+
+    def __init__(self, level: int) -> None:
+        super().__init__(level)
+        self._rich_handler = None
+
     def emit(self, record: logging.LogRecord) -> None:
-        record_pathname = getattr(record, "pathname", None)
-        if record_pathname:
-            record_pathname = record_pathname.removeprefix(consts.PROJECT_ROOT_PATH)
-            if "site-packages/" in record_pathname:
-                *venv_path, record_pathname = record_pathname.partition("site-packages/")
-            record.pathname = record_pathname
-        super().emit(record)
+        if self._rich_handler is None:
+            from termwiki.console import create_rich_handler
 
+            self._rich_handler = create_rich_handler(get_console(), self.level)
+            self._rich_handler.setFormatter(self.formatter)
+        self._rich_handler.emit(record)
 
-console = Console()
 
-rich_handler = MyRichHandler(
-    console=console,
-    level=logging.DEBUG if consts.DEBUG else logging.INFO,
-    markup=True,
-    omit_repeated_times=False,
-    enable_link_path=False,
-    rich_tracebacks=True,
-    tracebacks_show_locals=True,
-    locals_max_string=max(console.width, consts.NON_INTERACTIVE_WIDTH) - 20,
-)
+_console = None
+
+
+def get_console():
+    global _console
+    if _console is None:
+        from termwiki.console import Console
+
+        _console = Console()
+    return _console
+
+
+def __getattr__(name):
+    if name == "console":
+        return get_console()
+    if name == "rich_handler":
+        return _lazy_rich_handler._rich_handler
+    message = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(message)
+
+
+_lazy_rich_handler = LazyRichHandler(level=logging.DEBUG if consts.DEBUG else logging.INFO)
 
 logging.basicConfig(
     level=logging.DEBUG if consts.DEBUG else logging.INFO,
     format="%(pathname)s %(funcName)s() %(message)s",
     datefmt="[%T]",
     force=True,
-    handlers=[rich_handler],
+    handlers=[_lazy_rich_handler],
 )
 
 log = logging.getLogger("root")
@@ -1,4 +1,4 @@
-from .page import Page, Traversable
+from .page import Page, ReadOutcome, Traversable
 from .merged_page import MergedPage
 from .variable_page import VariablePage
 from .function_page import FunctionPage
@@ -6,5 +6,12 @@ from .file_page import FilePage
 from .markdown_file_page import MarkdownFilePage
 from .python_file_page import PythonFilePage
 from .directory_page import DirectoryPage
-from .page_tree import page_tree
+from .page_index import PageIndex, IndexEntry
+from .typo_index import TypoIndex
+from .name_map import NameMap
+from .ast_cache import AstCache
 from .errors import *
+from termwiki.util import lazy_import
+
+# Building the page tree is deferred until it's first accessed
+_, __getattr__ = lazy_import(__name__, [".page_tree:page_tree"])
@@ -0,0 +1,184 @@
+"""
+A persistent cache of parsed Python page files, so repeated invocations don't re-parse
+files that haven't changed.
+
+Each source file has a small record (size, mtime, content digest and extracted metadata,
+e.g. the page index's symbols), and its AST is stored separately, addressed by the content
+digest. A record is fresh if the file's size and mtime didn't change; if only the mtime
+changed (e.g. after a checkout), the content digest decides.
+Both are keyed by the interpreter too, since AST node classes change between Python versions.
+"""
+
+import ast
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from types import ModuleType
+from typing import Any, NamedTuple, TypeVar
+
+from termwiki import consts
+from termwiki.log import log
+
+from .ast_utils import get_node_span
+
+AST_CACHE_FORMAT_VERSION = 1
+INTERPRETER_TAG = sys.implementation.cache_tag
+"""E.g. 'cpython-312'. Pickled ASTs are only read by the interpreter that wrote them."""
+
+T = TypeVar("T")
+
+
+class SourceRecord(NamedTuple):
+    size: int
+    mtime: int
+    digest: str
+    """sha1 of the file's content."""
+    metadata: dict[str, Any]
+    """Values extracted from the file's AST, by name. See file_metadata()."""
+
+
+class AstCache:
+    def __init__(self, cache_dir: Path | str | None = None) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else consts.CACHE_DIR_PATH / "ast"
+        self._records: dict[str, SourceRecord] = {}
+        self._asts: dict[str, ast.Module] = {}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(cache_dir={str(self.cache_dir)!r})"
+
+    def parse_file(self, python_file_path: Path | str) -> ast.Module:
+        python_file_path = str(Path(python_file_path).resolve())
+        record, source = self._fresh_record(python_file_path)
+        return self._get_ast(python_file_path, record, source)
+
+    def file_metadata(
+        self, python_file_path: Path | str, name: str, extract: Callable[[ast.Module], T]
+    ) -> T:
+        """
+        Returns extract(parsed file), computed once per file content and persisted
+        alongside the file's record. If it's already cached, the file isn't even parsed.
+        """
+        python_file_path = str(Path(python_file_path).resolve())
+        record, source = self._fresh_record(python_file_path)
+        if name in record.metadata:
+            return record.metadata[name]
+        python_module_ast = self._get_ast(python_file_path, record, source)
+        record.metadata[name] = extract(python_module_ast)
+        self._save_record(python_file_path, record)
+        return record.metadata[name]
+
+    def parse_source_of(self, obj: Callable | ModuleType) -> ast.Module:
+        """
+        Like ast.parse(inspect.getsource(obj)), but without re-reading and re-parsing the file
+        obj is defined in. The returned module's body is the node that defines obj.
+        Line numbers are relative to obj's file.
+        """
+        if isinstance(obj, ModuleType):
+            return self.parse_file(obj.__file__)
+        obj = inspect.unwrap(obj)
+        source_file = inspect.getsourcefile(obj)
+        first_lineno = getattr(getattr(obj, "__code__", None), "co_firstlineno", None)
+        if source_file and first_lineno:
+            python_module_ast = self.parse_file(source_file)
+            for node in ast.walk(python_module_ast):
+                if (
+                    isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+                    and node.name == obj.__name__
+                    and get_node_span(node)[0] == first_lineno
+                ):
+                    return ast.Module(body=[node], type_ignores=[])
+        log.warning(f"{self!r}.parse_source_of({obj!r}) | definition not found in cache")
+        return ast.parse(inspect.getsource(obj))
+
+    def clear(self) -> None:
+        self._records.clear()
+        self._asts.clear()
+
+    # *** Persistence
+
+    def _record_path(self, python_file_path: str) -> Path:
+        path_digest = hashlib.sha1(python_file_path.encode()).hexdigest()[:16]
+        return self.cache_dir / f"source-{INTERPRETER_TAG}-{path_digest}.pickle"
+
+    def _ast_path(self, digest: str) -> Path:
+        return self.cache_dir / f"ast-{INTERPRETER_TAG}-{digest}.pickle"
+
+    def _fresh_record(self, python_file_path: str) -> tuple[SourceRecord, bytes | None]:
+        """Returns the file's record, and its source if it had to be read."""
+        stat = Path(python_file_path).stat()
+        record = self._records.get(python_file_path)
+        if record is None:
+            record = self._load(self._record_path(python_file_path))
+        if record is not None and (record.size, record.mtime) == (stat.st_size, stat.st_mtime_ns):
+            self._records[python_file_path] = record
+            return record, None
+        source = Path(python_file_path).read_bytes()
+        digest = hashlib.sha1(source).hexdigest()
+        if record is not None and record.digest == digest:
+            record = record._replace(mtime=stat.st_mtime_ns)
+        else:
+            if record is not None:
+                self._evict_ast(record.digest)
+            record = SourceRecord(len(source), stat.st_mtime_ns, digest, {})
+        self._records[python_file_path] = record
+        self._save_record(python_file_path, record)
+        return record, source
+
+    def _get_ast(self, python_file_path: str, record: SourceRecord, source: bytes | None):
+        python_module_ast = self._asts.get(record.digest)
+        if python_module_ast is not None:
+            return python_module_ast
+        ast_path = self._ast_path(record.digest)
+        python_module_ast = self._load(ast_path)
+        if python_module_ast is None:
+            if source is None:
+                source = Path(python_file_path).read_bytes()
+            python_module_ast = ast.parse(source, filename=python_file_path)
+            self._save(ast_path, python_module_ast)
+        self._asts[record.digest] = python_module_ast
+        return python_module_ast
+
+    def _evict_ast(self, digest: str) -> None:
+        """
+        Removes the AST of a file's previous content, so the cache doesn't grow with every edit.
+        Another file with the same content will just be parsed again.
+        """
+        self._asts.pop(digest, None)
+        try:
+            self._ast_path(digest).unlink(missing_ok=True)
+        except OSError as e:
+            log.warning(f"{self!r}._evict_ast({digest!r}) | {e!r}")
+
+    def _save_record(self, python_file_path: str, record: SourceRecord) -> None:
+        self._save(self._record_path(python_file_path), record)
+
+    def _load(self, path: Path):
+        try:
+            with path.open("rb") as f:
+                version, value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            log.warning(f"{self!r}._load({str(path)!r}) | {e!r}")
+            return None
+        if version != AST_CACHE_FORMAT_VERSION:
+            return None
+        return value
+
+    def _save(self, path: Path, value) -> None:
+        temporary_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with temporary_path.open("wb") as f:
+                pickle.dump((AST_CACHE_FORMAT_VERSION, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            temporary_path.replace(path)
+        except OSError as e:
+            log.warning(f"{self!r}._save({str(path)!r}) | {e!r}")
+
+
+ast_cache = AstCache()
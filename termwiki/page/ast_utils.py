@@ -1,10 +1,12 @@
 import ast
 import inspect
-from collections.abc import Generator
+import sys
+from collections.abc import Generator, Iterable
 from importlib import import_module
 from pathlib import Path
-from types import ModuleType
-from typing import Callable, ParamSpec
+from types import CodeType, ModuleType
+from typing import Any, Callable, ParamSpec
+from weakref import WeakKeyDictionary
 
 from termwiki.consts import NON_LETTER_RE, PROJECT_ROOT_PATH
 from termwiki.log import log
@@ -13,7 +15,8 @@ ParamSpec = ParamSpec("ParamSpec")
 
 
 def normalize_page_name(page_name: str) -> str:
-    return NON_LETTER_RE.sub("", page_name).lower()
+    # Interned, because the same names recur all over a tree (as dict keys and page names)
+    return sys.intern(NON_LETTER_RE.sub("", page_name).lower())
 
 
 def import_module_by_path(path: Path) -> ModuleType:
@@ -26,6 +29,50 @@ def import_module_by_path(path: Path) -> ModuleType:
     return imported_module
 
 
+def get_node_span(node: ast.stmt) -> tuple[int, int]:
+    """First and last line of node, including its decorators if it has any."""
+    decorator_linenos = [decorator.lineno for decorator in getattr(node, "decorator_list", ())]
+    return min([node.lineno, *decorator_linenos]), node.end_lineno
+
+
+def get_alias_decorator_args(function_def: ast.FunctionDef) -> list[str]:
+    """
+    The aliases passed to @alias(...) decorators of function_def, without executing anything.
+    Only string constants are supported, e.g. @alias('with_alias', 'another alias')."""
+    aliases = []
+    for decorator in function_def.decorator_list:
+        if not isinstance(decorator, ast.Call):
+            continue
+        decorator_function = decorator.func
+        if isinstance(decorator_function, ast.Attribute):
+            decorator_name = decorator_function.attr
+        else:
+            decorator_name = getattr(decorator_function, "id", None)
+        if decorator_name != "alias":
+            continue
+        for arg in decorator.args:
+            if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                aliases.append(arg.value)
+    return aliases
+
+
+def get_exclude_names(python_module_ast: ast.Module) -> set[str]:
+    """The module-level __exclude__ names, if it's assigned a literal."""
+    for node in python_module_ast.body:
+        if not isinstance(node, ast.Assign):
+            continue
+        if not any(getattr(target, "id", None) == "__exclude__" for target in node.targets):
+            continue
+        try:
+            return set(ast.literal_eval(node.value))
+        except ValueError:
+            log.warning(
+                f"get_exclude_names(...): __exclude__ is not a literal: {ast.unparse(node)}"
+            )
+            return set()
+    return set()
+
+
 def pformat_node(node: ast.AST, annotate_fields=True, include_attributes=False, indent=4):
     return ast.dump(
         node, annotate_fields=annotate_fields, include_attributes=include_attributes, indent=indent
@@ -56,25 +103,137 @@ def get_local_var_names_inside_joined_str(joined_str: ast.JoinedStr) -> list[str
     return var_names
 
 
+def get_referenced_names(node: ast.AST) -> set[str]:
+    """The names node loads, e.g. {'x', 'y'} for f'{x} {y.upper()}'."""
+    return {
+        child.id
+        for child in ast.walk(node)
+        if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Load)
+    }
+
+
+_compiled_expressions: "WeakKeyDictionary[ast.expr, CodeType]" = WeakKeyDictionary()
+
+
+def compile_expression(node: ast.expr) -> CodeType:
+    """node compiled for eval(), once."""
+    code = _compiled_expressions.get(node)
+    if code is None:
+        filename = f"<{node.__class__.__name__} at line {getattr(node, 'lineno', '?')}>"
+        code = compile(ast.Expression(body=node), filename, "eval")
+        _compiled_expressions[node] = code
+    return code
+
+
+class LocalsGraph:
+    """
+    The local assignments of a function, and which other locals each one references.
+    evaluate() evaluates locals after the locals they depend on (in topological order).
+    The values are kept for as long as the same globals are passed, so reading each of
+    a function's variables separately evaluates each local once.
+    """
+
+    def __init__(self, function_def: ast.FunctionDef) -> None:
+        self.function_def = function_def
+        self.assignments: dict[str, ast.expr] = {}
+        for node in function_def.body:
+            if not isinstance(node, ast.Assign):
+                continue
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    self.assignments[target.id] = node.value
+        self.dependencies: dict[str, set[str]] = {
+            name: get_referenced_names(value) & self.assignments.keys()
+            for name, value in self.assignments.items()
+        }
+        self._names_by_node_id = {id(value): name for name, value in self.assignments.items()}
+        self._globals: dict | None = None
+        self._values: dict[str, Any] = {}
+        """Evaluated with self._globals."""
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(function_def={self.function_def.name})"
+
+    def topological_order(self, names: Iterable[str]) -> list[str]:
+        """names and the locals they depend on, dependencies first. Cycles are cut."""
+        ordered = []
+        visited = set()
+        for name in names:
+            if name in visited or name not in self.assignments:
+                continue
+            visited.add(name)
+            stack = [(name, iter(self.dependencies[name]))]
+            while stack:
+                current_name, dependencies = stack[-1]
+                for dependency in dependencies:
+                    if dependency not in visited:
+                        visited.add(dependency)
+                        stack.append((dependency, iter(self.dependencies[dependency])))
+                        break
+                else:
+                    stack.pop()
+                    ordered.append(current_name)
+        return ordered
+
+    def assigned_name(self, node: ast.expr) -> str | None:
+        """The local that node (one of the function's nodes) is assigned to, if any."""
+        name = self._names_by_node_id.get(id(node))
+        if name is None or self.assignments[name] is not node:
+            return None
+        return name
+
+    def evaluate(self, names: Iterable[str], globals_: dict) -> dict[str, Any]:
+        """The values of names and of the locals they depend on."""
+        if globals_ is not self._globals:
+            self._globals = globals_
+            self._values = {}
+        values = self._values
+        ordered_names = self.topological_order(names)
+        for name in ordered_names:
+            if name in values:
+                continue
+            locals_ = {
+                dependency: values[dependency]
+                for dependency in self.dependencies[name]
+                if dependency in values
+            }
+            values[name] = eval(compile_expression(self.assignments[name]), globals_, locals_)
+        return {name: values[name] for name in ordered_names}
+
+
+_locals_graphs: "WeakKeyDictionary[ast.FunctionDef, LocalsGraph]" = WeakKeyDictionary()
+
+
+def get_locals_graph(function_def: ast.FunctionDef) -> LocalsGraph:
+    locals_graph = _locals_graphs.get(function_def)
+    if locals_graph is None:
+        locals_graph = LocalsGraph(function_def)
+        _locals_graphs[function_def] = locals_graph
+    return locals_graph
+
+
 def get_local_variables(
-    joined_str: ast.JoinedStr, parent: Callable[ParamSpec, str], globals_: dict
+    joined_str: ast.JoinedStr,
+    parent: Callable[ParamSpec, str],
+    globals_: dict,
+    parent_node: ast.FunctionDef | None = None,
 ) -> dict:
+    """
+    'parent_node' is the node that defines 'parent', if the caller already has it.
+    Otherwise, it's looked up in the parsed source file of 'parent'.
+    """
     isinstance(joined_str, ast.JoinedStr) or breakpoint()
     local_var_names_in_fstring = get_local_var_names_inside_joined_str(joined_str)
     local_var_names_in_fstring or breakpoint()
     local_variables = dict.fromkeys(local_var_names_in_fstring)
-    # In terms of reuse, FunctionPage.python_module_ast() also does this
-    # traverse_assign_node(source_node, parent)
-    source_parent_node: ast.Module = ast.parse(inspect.getsource(parent))
-    source_node = source_parent_node.body[0]
+    if parent_node is None:
+        from .ast_cache import ast_cache
+
+        parent_node = ast_cache.parse_source_of(parent).body[0]
+    source_node = parent_node
     if isinstance(source_node, ast.FunctionDef):
-        for assign in source_node.body:
-            if not isinstance(assign, ast.Assign):
-                continue
-            for target in assign.targets:
-                if target.id in local_var_names_in_fstring:
-                    var_value = eval_node(assign.value, parent, globals_)
-                    local_variables[target.id] = var_value
+        locals_graph = get_locals_graph(source_node)
+        local_variables |= locals_graph.evaluate(get_referenced_names(joined_str), globals_)
     elif isinstance(source_node, ast.Assign):
         # breakpoint()
         for var_name, var_value in traverse_assign_node(source_node, parent):
@@ -92,74 +251,127 @@ def get_local_variables(
         breakpoint()
         msg = (
             f"get_local_variables(...)\n\t{source_node=}"
-            f"\n\tnot FunctionDef, not Assign nor ImportFrom\n\t{source_parent_node=}"
+            f"\n\tnot FunctionDef, not Assign nor ImportFrom"
             f"\n\t{parent=}"
         )
         raise NotImplementedError(msg)
     return local_variables
 
 
-def eval_node(node, parent, globals_):
+def eval_node(node, parent, globals_, parent_node: ast.FunctionDef | None = None):
     try:
-        unparsed_value = ast.unparse(node)
+        if isinstance(parent_node, ast.FunctionDef):
+            # A local: evaluated (once) along with the locals it's composed of
+            locals_graph = get_locals_graph(parent_node)
+            name = locals_graph.assigned_name(node)
+            if name is not None:
+                return locals_graph.evaluate([name], globals_)[name]
+        code = compile_expression(node)
         try:
-            evaled: str = eval(unparsed_value, globals_)
+            evaled: str = eval(code, globals_)
         except NameError as e:
             # This happens when the value is composed of other local variables
             #  within the same function. E.g the value is "f'{x}'", and x is a local variable.
             #  'x' isn't in the globals, so it's a NameError.
             #  We're resolving the values of the composing local variables.
 
-            locals_ = get_local_variables(node, parent, globals_)
-            evaled = eval(unparsed_value, globals_, locals_)
+            locals_ = get_local_variables(node, parent, globals_, parent_node)
+            evaled = eval(code, globals_, locals_)
         return evaled
     except Exception as e:
         print(repr(e))
         breakpoint()
 
 
-def traverse_immutable_when_unparsed(node, parent, target_id):
-    """
-    JoinedStr, Constant, Name, FormattedValue, or sometimes even a simple Expr,
-    when ast.unparse(node) returns a string that can be evaluated and used as-is."""
-    from . import VariablePage
-
+def get_globals(parent: Callable[ParamSpec, str] | ModuleType) -> dict:
+    """The globals that expressions inside parent (a function or a module) are evaluated with."""
     if hasattr(parent, "__globals__"):
         assert callable(parent) and not isinstance(parent, ModuleType), (
             f"{parent} is not a function"
         )
-        globals_ = parent.__globals__
-    elif isinstance(parent, ModuleType):
-        globals_ = {
+        return parent.__globals__
+    if isinstance(parent, ModuleType):
+        return {
             var: val for var, val in vars(parent).items() if not var.startswith("__")
         }  # todo: more specific, also think about module-level alias etc
-    elif hasattr(parent, "__builtins__"):
+    if hasattr(parent, "__builtins__"):
         assert not callable(parent), f"{parent} is a callable"
-        globals_ = parent.__builtins__
-    else:
-        msg = (
-            f"traverse_immutable_when_unparsed(\n\t{node=},\n\t{parent=},\n\t{target_id=}): parent"
-            " has neither __globals__ nor is it a ModuleType, not does it have"
-            f" __builtins__.\n\t{type(parent) = }"
+        return parent.__builtins__
+    msg = (
+        f"get_globals({parent=}): parent has neither __globals__ nor is it a ModuleType,"
+        f" not does it have __builtins__.\n\t{type(parent) = }"
+    )
+    raise AttributeError(msg)
+
+
+class DeferredEvaluation:
+    """
+    A node to evaluate only when its value is first needed, and what it's evaluated within:
+    its parent (a function or a module), and the parent's node if it's a function.
+    The parent is either given, or returned by get_parent, e.g. when getting it
+    requires importing its module.
+    """
+
+    def __init__(
+        self,
+        node: ast.expr,
+        parent: Callable[ParamSpec, str] | ModuleType | None = None,
+        *,
+        get_parent: Callable[[], Callable[ParamSpec, str] | ModuleType] | None = None,
+        parent_node: ast.FunctionDef | None = None,
+    ) -> None:
+        self.node = node
+        self._parent = parent
+        self._get_parent = get_parent
+        self.parent_node = parent_node
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({self.node.__class__.__name__} at line {self.node.lineno})"
         )
-        raise AttributeError(msg)
-    rendered = eval_node(node.value, parent, globals_)
-    yield target_id, VariablePage(rendered, target_id)
+
+    def parent(self) -> Callable[ParamSpec, str] | ModuleType:
+        if self._parent is None:
+            self._parent = self._get_parent()
+        return inspect.unwrap(self._parent)
+
+    def __call__(self) -> str:
+        parent = self.parent()
+        return eval_node(self.node, parent, get_globals(parent), self.parent_node)
+
+
+def traverse_immutable_when_unparsed(node, parent, target_id, parent_node=None):
+    """
+    JoinedStr, Constant, Name, FormattedValue, or sometimes even a simple Expr,
+    when ast.unparse(node) returns a string that can be evaluated and used as-is.
+    It's evaluated when the page is read, not when it's traversed."""
+    from . import VariablePage
+
+    evaluation = DeferredEvaluation(node.value, parent, parent_node=parent_node)
+    yield target_id, VariablePage(name=target_id, evaluate=evaluation)
 
 
 def traverse_assign_node(
-    node: ast.Assign, parent: Callable[ParamSpec, str] | ModuleType
+    node: ast.Assign,
+    parent: Callable[ParamSpec, str] | ModuleType,
+    parent_node: ast.FunctionDef | None = None,
 ) -> Generator[tuple[str, "VariablePage"]]:
     from . import VariablePage
 
     parent = inspect.unwrap(parent)  # parent isn't necessarily a function, but that's ok
     target: ast.Name
+    variable_page = None
     for target in node.targets:
         target_id = normalize_page_name(target.id)
-        if isinstance(node.value, ast.Constant):
-            yield target_id, VariablePage(node.value.value, target_id)
-        else:
-            yield from traverse_immutable_when_unparsed(node, parent, target_id)
+        if variable_page is None:
+            if isinstance(node.value, ast.Constant):
+                variable_page = VariablePage(node.value.value, target_id)
+            else:
+                [(_, variable_page)] = traverse_immutable_when_unparsed(
+                    node, parent, target_id, parent_node
+                )
+        # e.g. 'cognitive = mental = ...': all targets are one page, evaluated once
+        yield target_id, variable_page
 
 
 def traverse_function(
@@ -169,11 +381,11 @@ def traverse_function(
     function_def_ast: ast.FunctionDef = python_module_ast.body[0]
     for node in function_def_ast.body:
         if isinstance(node, ast.Assign):
-            yield from traverse_assign_node(node, function)
+            yield from traverse_assign_node(node, function, function_def_ast)
         else:
             assert hasattr(node, "value"), f"{node} has no value attribute" or breakpoint()
             yield from traverse_immutable_when_unparsed(
-                node, function, function_def_ast.name
+                node, function, function_def_ast.name, function_def_ast
             )  # note: when node is ast.Return, function_def_ast.name is the function name
 
 
@@ -190,12 +402,13 @@ def traverse_module(
                 continue
             if isinstance(node, ast.FunctionDef):
                 function = getattr(module, node.name)
-                yield node_name, FunctionPage(function)
+                function_page = FunctionPage(function, function_def=node)
+                yield node_name, function_page
 
                 # this will be replaced with import hook
                 if hasattr(function, "aliases"):
                     for alias in function.aliases:
-                        yield normalize_page_name(alias), FunctionPage(function)
+                        yield normalize_page_name(alias), function_page
             else:
                 log.warning(
                     f'traverse_module({module}): {node} has "name" but is not a FunctionDef'
@@ -228,3 +441,100 @@ def traverse_module(
             " Assign nor an Expr for module.__doc__"
         )
         breakpoint()
+
+
+# *** Static traversal: yield pages from the AST alone, without importing.
+#  Evaluating non-constant values, and calling functions, is deferred until a page is read.
+
+
+def create_static_variable_page(
+    node: ast.expr,
+    name: str,
+    get_parent: Callable[[], Callable[ParamSpec, str] | ModuleType],
+    parent_node: ast.FunctionDef | None = None,
+) -> "VariablePage":
+    from . import VariablePage
+
+    if isinstance(node, ast.Constant):
+        return VariablePage(node.value, name)
+    evaluation = DeferredEvaluation(node, get_parent=get_parent, parent_node=parent_node)
+    return VariablePage(name=name, evaluate=evaluation)
+
+
+def traverse_assign_node_statically(
+    node: ast.Assign,
+    get_parent: Callable[[], Callable[ParamSpec, str] | ModuleType],
+    parent_node: ast.FunctionDef | None = None,
+) -> Generator[tuple[str, "VariablePage"]]:
+    variable_page = None
+    for target in node.targets:
+        if not isinstance(target, ast.Name):
+            continue
+        target_id = normalize_page_name(target.id)
+        if variable_page is None:
+            variable_page = create_static_variable_page(
+                node.value, target_id, get_parent, parent_node
+            )
+        yield target_id, variable_page
+
+
+def iter_function_values(function_def: ast.FunctionDef) -> Generator[tuple[str, ast.expr]]:
+    """
+    (normalized name, value node) of each variable page in function_def's body.
+    Assignments are named after their targets, and other values (e.g. the returned value)
+    after the function.
+    """
+    function_name = normalize_page_name(function_def.name)
+    for node in function_def.body:
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    yield normalize_page_name(target.id), node.value
+        elif hasattr(node, "value"):
+            yield function_name, node.value
+
+
+def traverse_function_statically(
+    function_def: ast.FunctionDef, get_function: Callable[[], Callable[ParamSpec, str]]
+) -> Generator[tuple[str, "VariablePage"]]:
+    """Like traverse_function, but without evaluating anything until read."""
+    previous_value_node = variable_page = None
+    for name, value_node in iter_function_values(function_def):
+        if value_node is not previous_value_node:
+            # Otherwise it's another target of the same assignment, so it's the same page
+            variable_page = create_static_variable_page(
+                value_node, name, get_function, function_def
+            )
+            previous_value_node = value_node
+        yield name, variable_page
+
+
+def traverse_module_statically(
+    python_file_page: "PythonFilePage", python_module_ast: ast.Module
+) -> Generator[tuple[str, "Page"]]:
+    """Like traverse_module, but the module is imported only when one of its pages is read."""
+    from . import FunctionPage
+
+    exclude_names = get_exclude_names(python_module_ast)
+    for i, node in enumerate(python_module_ast.body):
+        if isinstance(node, ast.FunctionDef):
+            node_name = normalize_page_name(node.name)
+            if node.name in exclude_names or node_name in exclude_names:
+                continue
+            function_page = FunctionPage(function_def=node, python_file_page=python_file_page)
+            yield node_name, function_page
+            for alias in get_alias_decorator_args(node):
+                yield normalize_page_name(alias), function_page
+            continue
+        if isinstance(node, ast.Assign):
+            yield from traverse_assign_node_statically(node, python_file_page.python_module)
+            continue
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            continue
+        is_docstring = isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant)
+        if i == 0 and is_docstring:
+            continue
+        log.warning(
+            f"traverse_module_statically({python_file_page}): skipping line {node.lineno}:"
+            f" {node} is not a FunctionDef, an Assign, an import nor the module docstring"
+        )
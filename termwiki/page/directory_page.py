@@ -1,3 +1,4 @@
+import os
 from collections.abc import Generator
 from pathlib import Path
 from types import ModuleType
@@ -5,6 +6,7 @@ from types import ModuleType
 from . import ast_utils
 from .file_page import FilePage
 from .markdown_file_page import MarkdownFilePage
+from .merged_page import MergedPage
 from .page import Page, Traversable
 from .python_file_page import PythonFilePage
 
@@ -12,31 +14,47 @@ from .python_file_page import PythonFilePage
 class DirectoryPage(Traversable):
     """A directory / package / namespace."""
 
+    __slots__ = (
+        "_entries_by_page_name",
+        "_package",
+        "_pages_python_file_page",
+        "_path",
+        "_scanned_entries",
+    )
+    kind = "directory"
+
     def __init__(self, package: ModuleType | Path) -> None:
+        """
+        Works from the file system path alone. If 'package' is a path, the package
+        is not imported, unless reading one of its Python pages requires executing it.
+        """
         super().__init__()
         self._package = package
-        self._path = None
+        if isinstance(package, ModuleType):
+            self._path = package_path(package)
+        else:
+            self._path = Path(package)
+        self._scanned_entries: list[tuple[str, bool]] | None = None
+        self._entries_by_page_name: dict[str, list[tuple[str, bool]]] | None = None
+        self._pages_python_file_page: PythonFilePage | None = None
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(package={self._package!r})"
 
     def package(self) -> ModuleType:
+        """Imports the package if it was given as a path. Traversing and searching don't call this."""
         if isinstance(self._package, ModuleType):
             return self._package
-        self._package = ast_utils.import_module_by_path(self._package)
+        self._package = ast_utils.import_module_by_path(self._path)
         return self._package
 
+    def imported_package(self) -> ModuleType | None:
+        """The package module, if it was already imported."""
+        if isinstance(self._package, ModuleType):
+            return self._package
+        return None
+
     def path(self) -> Path:
-        if self._path is not None:
-            return self._path
-        package = self.package()
-        # Namespaces __file__ attribute is None
-        if package.__file__:
-            self._path = Path(package.__file__).parent
-        else:
-            # Also works: self.package.__spec__.submodule_search_locations[0]
-            # self._path = Path(package.__package__.replace('.', '/'))
-            self._path = Path(package.__path__[0])
         return self._path
 
     def stem(self) -> str:
@@ -44,49 +62,91 @@ class DirectoryPage(Traversable):
 
     name = stem
 
+    def scan(self) -> list[tuple[str, bool]]:
+        """
+        (name, is_dir) of the entries that are pages, sorted by name, from a single scandir.
+        Given e.g name/ and name.md, name/ comes first.
+        """
+        if self._scanned_entries is None:
+            with os.scandir(self.path()) as dir_entries:
+                self._scanned_entries = sorted(
+                    (dir_entry.name, dir_entry.is_dir())
+                    for dir_entry in dir_entries
+                    if not dir_entry.name.startswith((".", "_"))
+                )
+        return self._scanned_entries
+
+    def create_page(self, name: str, *, is_dir: bool) -> tuple[str, Page]:
+        """The normalized page name and the page of a directory entry."""
+        path = self.path() / name
+        if is_dir:
+            return ast_utils.normalize_page_name(name), DirectoryPage(path)
+        path_stem = ast_utils.normalize_page_name(path.stem)
+        if path.suffix == ".py":
+            return path_stem, PythonFilePage(path, self.imported_package())
+        if path.suffix == ".md":
+            return path_stem, MarkdownFilePage(path)
+        return path_stem, FilePage(path)
+
+    def pages_python_file_page(self) -> PythonFilePage | None:
+        """The pages.py file, whose pages are immediate sub-pages of this directory."""
+        if self._pages_python_file_page is None and ("pages.py", False) in self.scan():
+            pages_python_file = self.path() / "pages.py"
+            self._pages_python_file_page = PythonFilePage(
+                pages_python_file, self.imported_package()
+            )
+        return self._pages_python_file_page
+
+    def probe(self, page_name: str) -> Page | None:
+        """
+        Creates only the sub-page named page_name, without creating its siblings.
+        Like traversal, same-name entries (in sorted order) and a same-name page
+        in pages.py are merged.
+        """
+        if self._entries_by_page_name is None:
+            entries_by_page_name = {}
+            for name, is_dir in self.scan():
+                path = Path(name)
+                entry_page_name = name if is_dir else path.stem
+                normalized_entry_page_name = ast_utils.normalize_page_name(entry_page_name)
+                entries_by_page_name.setdefault(normalized_entry_page_name, []).append((
+                    name,
+                    is_dir,
+                ))
+            self._entries_by_page_name = entries_by_page_name
+        found_pages = [
+            self.create_page(name, is_dir=is_dir)[1]
+            for name, is_dir in self._entries_by_page_name.get(page_name, [])
+        ]
+        pages_python_file_page = self.pages_python_file_page()
+        if pages_python_file_page is not None and pages_python_file_page.defines(page_name):
+            pages_python_file_sub_page = pages_python_file_page.search(page_name)
+            if pages_python_file_sub_page is None:
+                return None
+            found_pages.append(pages_python_file_sub_page)
+        if not found_pages:
+            return None
+        if len(found_pages) == 1:
+            return found_pages[0]
+        return MergedPage(*found_pages)
+
+    def merge_same_name_pages(self, cached_page: Page, page: Page) -> Page:
+        """Same-name entries, e.g. 'name/' and 'name.md', are all kept."""
+        return MergedPage(cached_page, page)
+
     def traverse(self, *args, cache_ok=True, **kwargs) -> Generator[tuple[str, Page]]:
         """
         Traverse the directory and yield (name, page) pairs.
         Pages with the same name are both yielded (e.g. a sub-directory
         and a file with the same name)."""
         self.__traverse_exhaused__ and breakpoint()
-        self_directory_path = self.path()
-        pages_with_same_name_as_us = []
-        # sorted(bla.iterdir()), sorted(bla.glob('*')) and glob.glob(bla) are all about 20 µs
-        for path in sorted(
-            self_directory_path.iterdir()
-        ):  # given e.g name/ and name.md, name/ comes first
-            if path.name.startswith(".") or path.name.startswith("_"):
-                continue
-            path_stem = ast_utils.normalize_page_name(path.stem)
-            path_name = ast_utils.normalize_page_name(path.name)
-            if path.is_dir():
-                directory_page = DirectoryPage(path)
-                # self._cache_page(path_name, directory_page)
-                yield path_name, directory_page
-            else:
-                if path.suffix == ".py":
-                    package = self.package()
-                    python_file_page = PythonFilePage(path, package)
-                    # self._cache_page(path_stem, python_file_page)
-                    yield path_stem, python_file_page
-                elif path.suffix == ".md":
-                    markdown_file_page = MarkdownFilePage(path)
-                    # self._cache_page(path_stem, markdown_file_page)
-                    yield path_stem, markdown_file_page
-                else:
-                    file_page = FilePage(path)
-                    # self._cache_page(path_stem, file_page)
-                    yield path_stem, file_page
+        for name, is_dir in self.scan():
+            yield self.create_page(name, is_dir=is_dir)
 
         # todo: not sure this belongs here. read() also does something similar (inherently lazier)
-        pages_python_file = self_directory_path / "pages.py"
-        if pages_python_file.exists():
-            package = self.package()
-            python_file_page = PythonFilePage(pages_python_file, package)
-            for name, page in python_file_page.traverse():
-                # self._cache_page(name, page)
-                yield name, page
+        pages_python_file_page = self.pages_python_file_page()
+        if pages_python_file_page is not None:
+            yield from pages_python_file_page.traverse()
 
         # self_directory_name = self_directory_path.stem
         # if self_directory_name == 'pages':
@@ -94,3 +154,11 @@ class DirectoryPage(Traversable):
 
         # for subpath_with_same_name in self_directory_path.glob(f'{self_directory_name}*'):
         #     yield from self.search(subpath_with_same_name.name).traverse()
+
+
+def package_path(package: ModuleType) -> Path:
+    # Namespaces __file__ attribute is None
+    if package.__file__:
+        return Path(package.__file__).parent
+    # Also works: package.__spec__.submodule_search_locations[0]
+    return Path(package.__path__[0])
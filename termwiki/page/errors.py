@@ -1,2 +1,18 @@
 class PageNotFound(Exception):
     pass
+
+
+class UnreadableFile(Exception):
+    """A file that isn't read as a page (see FilePage)."""
+
+
+class BinaryFile(UnreadableFile):
+    pass
+
+
+class NotRegularFile(UnreadableFile):
+    """A directory, FIFO, device etc., whose 'contents' can't be read as text."""
+
+
+class FileTooLarge(UnreadableFile):
+    """Larger than consts.FILE_PAGE_MAX_BYTES; FilePage.stream() still reads it."""
@@ -1,9 +1,38 @@
+import stat
+from collections.abc import Generator
 from pathlib import Path
 
+from termwiki import consts
+from termwiki.log import log
+from termwiki.util import cached_property
+
+from .errors import BinaryFile, FileTooLarge, NotRegularFile, UnreadableFile
 from .page import Page
 
+BINARY_MAGIC_NUMBERS = (
+    b"\x7fELF",  # ELF
+    b"\xcf\xfa\xed\xfe",  # Mach-O, 64 bit
+    b"\xce\xfa\xed\xfe",  # Mach-O, 32 bit
+    b"\xca\xfe\xba\xbe",  # Mach-O universal / Java class
+    b"\x89PNG",
+    b"\xff\xd8\xff",  # JPEG
+    b"GIF8",
+    b"%PDF",
+    b"PK\x03\x04",  # zip
+    b"\x1f\x8b",  # gzip
+)
+
 
 class FilePage(Page):
+    """
+    A file that's read as is. Binary files (judging by the first block) aren't read,
+    and files larger than consts.FILE_PAGE_MAX_BYTES are only streamed, so neither
+    ends up in memory when e.g. their directory is read.
+    """
+
+    __slots__ = ("_is_binary", "filename")
+    kind = "file"
+
     def __init__(self, filename: str | Path) -> None:
         super().__init__()
         self.filename = filename
@@ -11,7 +40,54 @@ class FilePage(Page):
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(filename={self.filename!r})"
 
+    @cached_property
+    def is_binary(self) -> bool:
+        """Whether the first block starts with a known binary format's magic number, or has a NUL."""
+        with Path(self.filename).open("rb") as f:
+            first_block = f.read(consts.FILE_PAGE_SNIFF_BYTES)
+        return first_block.startswith(BINARY_MAGIC_NUMBERS) or b"\0" in first_block
+
+    def check_readable(self) -> int:
+        """
+        Returns the file's size, or raises OSError if it can't be stat'ed, NotRegularFile,
+        BinaryFile, or FileTooLarge.
+        """
+        file_stat = Path(self.filename).stat()
+        if not stat.S_ISREG(file_stat.st_mode):
+            msg = f"{self.filename} is not a regular file"
+            raise NotRegularFile(msg)
+        if self.is_binary:
+            raise BinaryFile(self.filename)
+        if file_stat.st_size > consts.FILE_PAGE_MAX_BYTES:
+            msg = (
+                f"{self.filename} is {file_stat.st_size:,} bytes,"
+                f" more than {consts.FILE_PAGE_MAX_BYTES:,}"
+            )
+            raise FileTooLarge(msg)
+        return file_stat.st_size
+
+    @cached_property
+    def readable(self) -> bool:
+        """A non-empty text file, small enough to read (see check_readable)."""
+        try:
+            return self.check_readable() > 0
+        except (OSError, UnreadableFile) as e:
+            log.debug(f"{self!r}.readable | {e!r}")
+            return False
+
     def read(self, *args, **kwargs) -> str:
-        with open(self.filename) as f:
+        self.check_readable()
+        with Path(self.filename).open() as f:
             file_content = f.read()
         return file_content
+
+    def stream(self, chunk_size: int = consts.FILE_PAGE_SNIFF_BYTES) -> Generator[str]:
+        """
+        The file's text, chunk by chunk, however large it is; for when it's asked for
+        explicitly. Raises BinaryFile if it's binary.
+        """
+        if self.is_binary:
+            raise BinaryFile(self.filename)
+        with Path(self.filename).open(errors="replace") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
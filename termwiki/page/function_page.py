@@ -1,31 +1,66 @@
 import ast
-import inspect
 from collections.abc import Generator
-from typing import Callable, ParamSpec
+from typing import TYPE_CHECKING, Callable, ParamSpec
 
 from . import ast_utils
+from .ast_cache import ast_cache
 from .page import Traversable
 from .variable_page import VariablePage
 
+if TYPE_CHECKING:
+    from .python_file_page import PythonFilePage
+
 ParamSpec = ParamSpec("ParamSpec")
 
 
 class FunctionPage(Traversable):
-    def __init__(self, function: Callable[ParamSpec, str | None]) -> None:
+    __slots__ = ("_function", "_python_module_ast", "function_def", "python_file_page")
+    kind = "function"
+
+    def __init__(
+        self,
+        function: Callable[ParamSpec, str | None] | None = None,
+        *,
+        function_def: ast.FunctionDef | None = None,
+        python_file_page: "PythonFilePage | None" = None,
+    ) -> None:
+        """
+        Either 'function', or 'function_def' and the 'python_file_page' it's defined in.
+        The latter is static: sub-pages are yielded from function_def, and the module
+        is imported only when the function has to be called.
+        If both 'function' and 'function_def' are given, function_def is the already parsed
+        definition of function, so its source isn't looked up again.
+        """
         super().__init__()
-        self.function = function
+        self._function = function
+        self.function_def = function_def
+        self.python_file_page = python_file_page
         self._python_module_ast = None
 
     def __repr__(self) -> str:
-        return f"{self.__class__.__name__}(function={self.function.__qualname__})"
+        if self._function is None:
+            return f"{self.__class__.__name__}(function_def={self.function_def.name})"
+        return f"{self.__class__.__name__}(function={self._function.__qualname__})"
+
+    @property
+    def function(self) -> Callable[ParamSpec, str | None]:
+        if self._function is None:
+            python_module = self.python_file_page.python_module()
+            self._function = getattr(python_module, self.function_def.name)
+        return self._function
 
     def python_module_ast(self) -> ast.Module:
         if self._python_module_ast:
             return self._python_module_ast
-        self._python_module_ast: ast.Module = ast.parse(inspect.getsource(self.function))
+        if self.function_def is not None:
+            self._python_module_ast = ast.Module(body=[self.function_def], type_ignores=[])
+        else:
+            self._python_module_ast: ast.Module = ast_cache.parse_source_of(self.function)
         return self._python_module_ast
 
     def name(self):
+        if self.function_def is not None:
+            return self.function_def.name
         return self.function.__name__
 
     def read(self, *args, **kwargs) -> str:
@@ -35,7 +70,6 @@ class FunctionPage(Traversable):
         # If a function doesn't return:
         #  search for self-named variable
         #  if not found, return its joined variables values
-        # todo: super doesn't skip variables pointing to the same object
         return super().read(*args, **kwargs)
         # noinspection PyUnreachableCode
         variable_texts = []
@@ -50,7 +84,35 @@ class FunctionPage(Traversable):
 
     __call__ = read
 
+    def probe(self, page_name: str) -> VariablePage | None:
+        """
+        Creates only the variable page named page_name, if traversal is static.
+        If another target of the same assignment was already found, its page is returned.
+        """
+        if self.python_file_page is None:
+            return None
+        value_nodes = {}
+        for name, value_node in ast_utils.iter_function_values(self.function_def):
+            value_nodes[name] = value_node
+        found_value_node = value_nodes.get(page_name)
+        if found_value_node is None:
+            return None
+        for name, value_node in value_nodes.items():
+            if value_node is not found_value_node:
+                continue
+            shared_page = self._cached_page(name)
+            if shared_page is not None:
+                return shared_page
+        return ast_utils.create_static_variable_page(
+            found_value_node, page_name, lambda: self.function, self.function_def
+        )
+
     def traverse(self, *args, cache_ok=True, **kwargs) -> Generator[tuple[str, VariablePage]]:
         self.__traverse_exhaused__ and breakpoint()
+        if self.python_file_page is not None:
+            yield from ast_utils.traverse_function_statically(
+                self.function_def, lambda: self.function
+            )
+            return
         python_module_ast = self.python_module_ast()
         yield from ast_utils.traverse_function(self.function, python_module_ast)
@@ -3,3 +3,6 @@ from .file_page import FilePage
 
 class MarkdownFilePage(FilePage):  # maybe subclassing Page is better
     """Traverses headings"""
+
+    __slots__ = ()
+    kind = "markdown_file"
@@ -1,33 +1,51 @@
 import os
 from collections.abc import Generator
 
+from termwiki.util import cached_property
+
 from .page import Page, Traversable
 
 
 class MergedPage(Traversable):
-    """A page that is the merge of several pages"""
+    """
+    A page that is the merge of several pages, e.g. a 'readable/' directory and
+    a 'readable.md' file. It's a lazy view of its members: building it is O(members),
+    searching a sub-page searches each member, and traversal chains the members'
+    traversals, merging their same-name sub-pages.
+    """
+
+    __slots__ = ("members",)
+    kind = "merged"
 
-    def __init__(self, pages: dict[str, Page]) -> None:
+    def __init__(self, *pages: Page) -> None:
+        """
+        MergedPages among 'pages' are flattened into their members, and a page that's
+        there several times (e.g. a function and its alias) is a member once.
+        """
         super().__init__()
-        self.pages = pages
+        members = {}
+        for page in pages:
+            for member in page.members if isinstance(page, MergedPage) else (page,):
+                members.setdefault(id(member), member)
+        self.members: tuple[Page, ...] = tuple(members.values())
 
     def __repr__(self) -> str:
-        if self.pages:
+        if self.members:
             shorten_line = lambda line: line[:30] + " ... " + line[-30:] if len(line) > 65 else line
-            pages_values = list(self.pages.values())
+            pages_values = self.members
             first_page_repr = repr(pages_values[0])
             first_page_short_repr = shorten_line(first_page_repr)
-            if len(self.pages) == 1:
+            if len(self.members) == 1:
                 pages_repr = f"[{first_page_short_repr}]"
             else:
                 second_page_repr = repr(pages_values[1])
                 second_page_short_repr = shorten_line(second_page_repr)
-                if len(self.pages) == 2:
+                if len(self.members) == 2:
                     pages_repr = f"[\n\t\t{first_page_short_repr},\n\t\t{second_page_short_repr}]"
                 else:
                     last_page_repr = repr(pages_values[-1])
                     last_page_short_repr = shorten_line(last_page_repr)
-                    if len(self.pages) == 3:
+                    if len(self.members) == 3:
                         pages_repr = (
                             f"[\n\t\t{first_page_short_repr},"
                             f"\n\t\t{second_page_short_repr},"
@@ -37,7 +55,7 @@ class MergedPage(Traversable):
                         pages_repr = (
                             f"[\n\t\t{first_page_short_repr},"
                             f"\n\t\t{second_page_short_repr},"
-                            f"\n\t\t... ({len(self.pages) - 3} more),"
+                            f"\n\t\t... ({len(self.members) - 3} more),"
                             f"\n\t\t{last_page_short_repr}]"
                         )
 
@@ -56,42 +74,43 @@ class MergedPage(Traversable):
         )
         prefix = self.__class__.__name__ + "("
         joiner_str = "\n\t\t" if os.environ.get("PYCHARM_HOSTED") else ", "
-        sub_pages_names = joiner_str.join(safe_page_name(page) for page in self.pages.values())
+        sub_pages_names = joiner_str.join(safe_page_name(page) for page in self.members)
         return prefix + sub_pages_names + ")"
 
-    def merge_sub_pages(self) -> "MergedPage":
-        sub_pages: dict[str, Page] = {}
-        for name, page in self.pages.items():
-            if isinstance(page, MergedPage):
-                raise RuntimeError(
-                    f"MergedPage.merge_sub_pages, "
-                    f"one of the sub-pages is a MergedPage! "
-                    f"this should not happen (I think).\n"
-                    f"─" * 80 + f"\npage: {page!r}.\n─" * 80 + f"\nself: {self!r}.\n"
-                )
-            if hasattr(page, "pages"):
-                sub_pages.update(page.pages)
-            else:
-                sub_pages[name] = page
+    def merge_same_name_pages(self, cached_page: Page, page: Page) -> Page:
+        return MergedPage(cached_page, page)
 
-        if sub_pages == self.pages:
-            return self
-        merged_sub_pages = MergedPage(sub_pages)
-        return merged_sub_pages
+    def probe(self, page_name: str) -> Page | None:
+        """The members' sub-pages named page_name, without traversing the members."""
+        found_pages = []
+        for member in self.members:
+            if isinstance(member, Traversable):
+                found_page = member.search(page_name)
+                if found_page is not None:
+                    found_pages.append(found_page)
+        if not found_pages:
+            return None
+        if len(found_pages) == 1:
+            return found_pages[0]
+        return MergedPage(*found_pages)
 
     def traverse(self, *args, cache_ok=True, **kwargs) -> Generator[tuple[str, Page]]:
-        for _name, page in self.pages.items():
-            if hasattr(page, "traverse"):
-                yield from page.traverse()
-        raise NotImplementedError(
-            "MergedPage.traverse currently recursively yields from (sub)page.traverse(), "
-            "but not sure if should also 'yield name, page' for the MergedPage itself."
-        )
+        self.__traverse_exhaused__ and breakpoint()
+        for member in self.members:
+            if isinstance(member, Traversable):
+                yield from member.traverse()
+
+    @cached_property
+    def readable(self) -> bool:
+        return any(member.readable for member in self.members)
 
     def read(self, *args, **kwargs) -> str:
+        """The texts of the members that read successfully, each read once."""
         page_texts = []
-        for _name, page in self.pages.items():
-            if page.readable:
-                page_text = page.read()
+        for page in self.members:
+            if not page.readable:
+                continue
+            page_text, error = page.try_read()
+            if error is None:
                 page_texts.append(page_text)
         return "\n\n".join(page_texts)
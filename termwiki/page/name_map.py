@@ -0,0 +1,161 @@
+"""
+An in-memory map of the pages below a Traversable, by normalized name and by depth,
+so recursive searches are lookups instead of merging and searching one level at a time.
+It's the counterpart of PageIndex for trees that don't have an index.
+"""
+
+import threading
+from collections.abc import Callable, Generator, Iterable
+from typing import TYPE_CHECKING, Self
+
+from . import ast_utils
+from .page_index import AncestryPath, _choose
+
+if TYPE_CHECKING:
+    from .page import Page, Traversable
+
+NameMapEntry = tuple[AncestryPath, "Page"]
+
+
+class NameMap:
+    """
+    Built one depth level at a time, as deep as queries need (once, even if queried from
+    several threads), by a breadth-first walk of the tree, so the pages of each name are
+    listed shallowest first, and in traversal order within a level.
+
+    Paths are relative to 'root', e.g. ('bash', 'xargs'). A sub-page's map is a view of
+    its tree's map (see sub_map), so the tree is walked once however deep searches go.
+    """
+
+    def __init__(self, root: "Traversable") -> None:
+        self.root = root
+        self.tree_map = self
+        """The map that's actually built; self, unless this is a sub_map."""
+        self.prefix: AncestryPath = ()
+        """The root's path in tree_map."""
+        self._names: dict[str, list[NameMapEntry]] = {}
+        self._levels: list[dict[str, list[NameMapEntry]]] = []
+        """Index 0 is the root's children, 1 its grandchildren, etc."""
+        self._frontier: list[NameMapEntry] | None = [((), root)]
+        """The pages of the last built level, whose children are the next level. None once all are built."""
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(root={self.root!r})"
+
+    def sub_map(self, path: AncestryPath, page: "Traversable") -> Self:
+        """The map of 'page', found at 'path' below self.root, without walking it again."""
+        sub_map = self.__class__(page)
+        sub_map.tree_map = self.tree_map
+        sub_map.prefix = (*self.prefix, *path)
+        return sub_map
+
+    def find(self, page_name: str) -> list[NameMapEntry]:
+        """All (path, page) entries of page_name, shallowest first. Builds the whole map."""
+        self.tree_map._level(None)
+        normalized_page_name = ast_utils.normalize_page_name(page_name)
+        return self._below_root(self.tree_map._names.get(normalized_page_name, []))
+
+    def resolve(
+        self,
+        page_name: str,
+        *,
+        on_not_found: Callable[[Iterable[str], str], str | None] | None = None,
+        max_depth: int | None = None,
+    ) -> NameMapEntry | None:
+        """The best match of page_name (see resolve_all). Returns None if not found."""
+        entries = self.resolve_all(page_name, on_not_found=on_not_found, max_depth=max_depth)
+        return entries[0] if entries else None
+
+    def resolve_all(
+        self,
+        page_name: str,
+        *,
+        on_not_found: Callable[[Iterable[str], str], str | None] | None = None,
+        max_depth: int | None = None,
+    ) -> list[NameMapEntry]:
+        """
+        Like PageIndex.resolve_all(recursive=True): the shallowest exact matches (several if
+        they're at the same depth), else the page 'on_not_found' chooses among all the names
+        down to max_depth (1 being the root's children), shallowest first. It's asked once,
+        so an interactive chooser is shown once.
+        The map is built only as deep as the shallowest exact match.
+        """
+        normalized_page_name = ast_utils.normalize_page_name(page_name)
+        for level in self._iter_levels(max_depth):
+            if normalized_page_name in level:
+                return level[normalized_page_name]
+        if on_not_found is None:
+            return []
+        shallowest_entries: dict[str, list[NameMapEntry]] = {}
+        for level in self._iter_levels(max_depth):
+            for name, entries in level.items():
+                shallowest_entries.setdefault(name, entries)
+        chosen_page_name = _choose(normalized_page_name, shallowest_entries, on_not_found)
+        if chosen_page_name is None:
+            return []
+        return shallowest_entries[chosen_page_name]
+
+    def _below_root(self, entries: list[NameMapEntry]) -> list[NameMapEntry]:
+        """Entries below self.root, with paths relative to it."""
+        if not self.prefix:
+            return entries
+        prefix_length = len(self.prefix)
+        return [
+            (path[prefix_length:], page)
+            for path, page in entries
+            if len(path) > prefix_length and path[:prefix_length] == self.prefix
+        ]
+
+    def _iter_levels(self, max_depth: int | None) -> Generator[dict[str, list[NameMapEntry]]]:
+        """The levels below the root, from its children down to max_depth, built as they're reached."""
+        level_index = len(self.prefix)
+        depth = 1
+        while max_depth is None or depth <= max_depth:
+            level = self.tree_map._level(level_index)
+            if level is None:
+                return
+            if not self.prefix:
+                yield level
+            else:
+                level_below_root = {}
+                for name, entries in level.items():
+                    if entries_below_root := self._below_root(entries):
+                        level_below_root[name] = entries_below_root
+                yield level_below_root
+            level_index += 1
+            depth += 1
+
+    def _level(self, level_index: int | None) -> dict[str, list[NameMapEntry]] | None:
+        """
+        Builds the levels down to level_index (all of them if None), and returns it,
+        or None if the tree isn't that deep.
+        """
+        levels = self._levels
+        if level_index is not None and level_index < len(levels):
+            return levels[level_index]
+        with self._lock:
+            while self._frontier is not None and (
+                level_index is None or level_index >= len(self._levels)
+            ):
+                self._build_next_level()
+            if level_index is None or level_index >= len(self._levels):
+                return None
+            return self._levels[level_index]
+
+    def _build_next_level(self) -> None:
+        level: dict[str, list[NameMapEntry]] = {}
+        children = []
+        for parent_path, parent in self._frontier:
+            if not hasattr(parent, "sub_pages"):
+                continue
+            for name, page in parent.sub_pages().items():
+                entry = ((*parent_path, name), page)
+                level.setdefault(name, []).append(entry)
+                self._names.setdefault(name, []).append(entry)
+                children.append(entry)
+        if not level:
+            self._frontier = None
+            return
+        self._levels.append(level)
+        self._frontier = children
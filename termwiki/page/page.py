@@ -1,33 +1,174 @@
+import threading
 from abc import abstractmethod
-from collections.abc import Generator, Iterable, Sequence
-from typing import Any, Callable, ForwardRef, NoReturn, ParamSpec, Self, TypeVar
+from collections.abc import Generator, Iterable, Mapping, Sequence
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    ForwardRef,
+    NamedTuple,
+    NoReturn,
+    ParamSpec,
+    Self,
+    TypeVar,
+)
 
 from termwiki.log import log
 from termwiki.util import cached_property
 
 from . import ast_utils
+from .name_map import NameMap
+from .page_index import AncestryPath, PageIndex, PageKind
 
 DecoratedCallable = TypeVar("DecoratedCallable", bound=Callable[[Self, ...], Any])
 ParamSpec = ParamSpec("ParamSpec")
 
+EMPTY_PAGES: Mapping[str, "Page"] = MappingProxyType({})
+"""Shared by all Traversables that have no (known) sub-pages, instead of an empty dict each."""
+
+
+class TraversalCursor:
+    """
+    An in-progress traversal: the (name, page) pairs yielded so far, and the generator
+    that yields the rest. Iterating it replays what was already yielded, then continues
+    the same generator, so a traversal that was stopped early (e.g. by a search that
+    found its page) is resumed rather than restarted. Concurrent iterations share
+    the generator, and each pair is added to 'pages' once, when it's first yielded.
+
+    Iterations may run in different threads: the generator is advanced while holding
+    'lock' (the page's lock), so each pair is produced once, and the others wait for it.
+    A page that was already probed stays the one in 'pages', so searching a name gives
+    the same page before, during and after the traversal. When a name is yielded again,
+    'merge' decides what 'pages' keeps (see Traversable.merge_same_name_pages).
+    """
+
+    def __init__(
+        self,
+        generator: Generator[tuple[str, "Page"]],
+        pages: dict[str, "Page"],
+        lock: threading.RLock,
+        probed_pages: dict[str, "Page"],
+        merge: Callable[["Page", "Page"], "Page"],
+    ) -> None:
+        self.generator = generator
+        self.pages = pages
+        self.lock = lock
+        self.probed_pages = probed_pages
+        self.merge = merge
+        self.yielded: list[tuple[str, Page]] = []
+        self.substitutes: dict[int, Page] = {}
+        """id(yielded page): the probed page that replaced it in 'pages'."""
+        self.exhausted = False
+        self.error: Exception | None = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(yielded={len(self.yielded)})"
+
+    def __iter__(self) -> Generator[tuple[str, "Page"]]:
+        i = 0
+        while True:
+            if i == len(self.yielded) and not self._advance(i):
+                return
+            yield self.yielded[i]
+            i += 1
+
+    def _advance(self, i: int) -> bool:
+        """Makes sure self.yielded[i] exists. Returns False if the traversal is over."""
+        with self.lock:
+            if i < len(self.yielded):
+                # Another thread advanced the generator while we waited
+                return True
+            if self.error is not None:
+                # The generator died in another thread; it wouldn't yield the rest
+                raise self.error
+            if self.exhausted:
+                return False
+            try:
+                name, page = next(self.generator)
+            except StopIteration:
+                self.exhausted = True
+                return False
+            except Exception as e:
+                self.error = e
+                raise
+            self.yielded.append((name, page))
+            probed_page = self.probed_pages.get(name)
+            if probed_page is None:
+                probed_page = self.substitutes.get(id(page))
+            if probed_page is not None:
+                # Probing already found all the pages with this name
+                self.pages[name] = probed_page
+                if probed_page is not page:
+                    # So names that share the yielded page (e.g. aliases) share the probed one
+                    self.substitutes[id(page)] = probed_page
+            elif name in self.pages:
+                self.pages[name] = self.merge(self.pages[name], page)
+            else:
+                self.pages[name] = page
+            return True
+
 
 def create_caching_traverse(traverse_fn: DecoratedCallable) -> DecoratedCallable:
     def caching_traverse(self: Self, *args, cache_ok=True, **kwargs) -> Generator[tuple[str, Page]]:
-        if self.__traverse_exhaused__ and cache_ok:
-            pages_iterable = self._pages.items()
-        else:
-            pages_iterable = traverse_fn(self, *args, **kwargs)
-
-        for name, page in pages_iterable:
-            self._pages[name] = page
-            yield name, page
+        with self._lock:
+            if self.__traverse_exhaused__ and cache_ok:
+                traversal_cursor = None
+            elif self._traversal_cursor is None or not cache_ok:
+                # Pages that were probed before are re-added as they're yielded,
+                # so pages are in traversal order
+                self._pages = {}
+                if not cache_ok or self._probed_pages is EMPTY_PAGES:
+                    self._probed_pages = {}
+                generator = traverse_fn(self, *args, **kwargs)
+                traversal_cursor = TraversalCursor(
+                    generator,
+                    self._pages,
+                    self._lock,
+                    self._probed_pages,
+                    self.merge_same_name_pages,
+                )
+                self._traversal_cursor = traversal_cursor
+            else:
+                traversal_cursor = self._traversal_cursor
+        if traversal_cursor is None:
+            yield from self._pages.items()
+            return
 
-        self.__traverse_exhaused__ = True
+        try:
+            yield from traversal_cursor
+        except Exception:
+            # The generator is dead, so the next traversal starts over
+            with self._lock:
+                if self._traversal_cursor is traversal_cursor:
+                    self._traversal_cursor = None
+            raise
+
+        with self._lock:
+            if self._traversal_cursor is traversal_cursor:
+                self._traversal_cursor = None
+                self.__traverse_exhaused__ = True
+                # Probed pages that were yielded are in self._pages now
+                self._probed_pages = EMPTY_PAGES
+                if not self._pages:
+                    self._pages = EMPTY_PAGES
 
     return caching_traverse
 
 
+class ReadOutcome(NamedTuple):
+    """What Page.try_read returns: either the text, or the error reading raised."""
+
+    text: str | None
+    error: Exception | None = None
+
+
 class Page:
+    __slots__ = ("_readable",)
+
+    kind: ClassVar[PageKind]
+    """Which kind of page this is, like in the page index."""
+
     # def __init__(self):
     #     # self.pages = {}
     #     # self.__traverse_exhaused__ = False
@@ -36,23 +177,53 @@ class Page:
     @abstractmethod
     def read(self, *args, **kwargs) -> str: ...
 
-    @cached_property
-    def readable(self) -> bool:
+    def try_read(self, *args, **kwargs) -> ReadOutcome:
+        """Reads once, and returns the text, or the error read() raised instead of raising it."""
         try:
-            self.read()
-            return True
+            return ReadOutcome(self.read(*args, **kwargs))
         except Exception as e:
-            log.warning(f"{self!r}.readable | {e!r}")
-            return False
+            log.warning(f"{self!r}.try_read() | {e!r}")
+            return ReadOutcome(None, e)
+
+    @cached_property
+    def readable(self) -> bool:
+        """
+        Whether this page has anything to read, judging by its kind and metadata (e.g.
+        a file's size), without reading it. A readable page may still fail to read;
+        try_read tells for sure.
+        """
+        return True
 
 
 class Traversable(Page):
-    pages: dict[str, Page]
+    __slots__ = (
+        "__traverse_exhaused__",
+        "_lock",
+        "_name_map",
+        "_pages",
+        "_probed_pages",
+        "_traversal_cursor",
+        "index",
+        "index_path",
+    )
+
+    pages: Mapping[str, Page]
 
     def __init__(self):
-        self._pages = {}
+        self._pages: Mapping[str, Page] = EMPTY_PAGES
         """Cache of visited (traversed) pages. Populated and used by 'traverse' method."""
         self.__traverse_exhaused__ = False
+        self._traversal_cursor: TraversalCursor | None = None
+        """Set while a traversal is in progress, so it's resumed instead of restarted."""
+        self._lock = threading.RLock()
+        """Held while traversing or probing, so concurrent callers wait for a single one."""
+        self._probed_pages: Mapping[str, Page] = EMPTY_PAGES
+        """Pages found by 'probe', kept when the same names are traversed later."""
+        self.index: PageIndex | None = None
+        """If set, used to resolve names without traversing. Propagated to sub-pages by 'search'."""
+        self.index_path: AncestryPath = ()
+        """This page's path within self.index."""
+        self._name_map: NameMap | None = None
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__()
@@ -67,17 +238,14 @@ class Traversable(Page):
     @abstractmethod
     def name(self) -> str: ...
 
-    # def _cache_page(self, page_tuple: tuple[str, Page]) -> Page:
-    #     normalized_page_name, page = page_tuple
-    #     if normalized_page_name in self.pages:
-    #         cached_page = self.pages[normalized_page_name]
-    #         if isinstance(cached_page, MergedPage):
-    #             cached_page.extend(page)
-    #         else:
-    #             self.pages[normalized_page_name] = MergedPage(cached_page, page)
-    #     else:
-    #         self.pages[normalized_page_name] = page
-    #     return self.pages[normalized_page_name]
+    def merge_same_name_pages(self, cached_page: Page, page: Page) -> Page:
+        """
+        What's kept when traversal yields a name it already yielded. By default the later
+        page replaces the earlier one, like rebinding a name in Python. Subclasses whose
+        same-name sub-pages are all meaningful (e.g. 'name/' and 'name.md') return
+        a MergedPage.
+        """
+        return page
 
     @abstractmethod
     # @CachingGenerator
@@ -91,18 +259,18 @@ class Traversable(Page):
         list(self.traverse())
 
     @property
-    def pages(self) -> dict[str, Page]:
-        self._ensure_pages_are_populated()
-        return self._pages
+    def pages(self) -> Mapping[str, Page]:
+        return self.sub_pages()
 
     @pages.setter
-    def pages(self, pages: dict[str, Page]):
+    def pages(self, pages: Mapping[str, Page]):
         self._pages = pages
         self.__traverse_exhaused__ = True
 
-    # traverse.set_cacher(lambda self, page: self._cache_page(page))
-
-    # traverse._cacher = lambda self, page: self._cache_page(page)
+    def sub_pages(self) -> Mapping[str, Page]:
+        """All immediate sub-pages by name, traversing if needed. The same as self.pages."""
+        self._ensure_pages_are_populated()
+        return self._pages
 
     def search(
         self, name: str, *, on_not_found: Callable[[Iterable[str], str], str | None] | None = None
@@ -112,17 +280,71 @@ class Traversable(Page):
         If not found, and 'on_not_found' is given, it will be called with
         the names of the immediate children. Otherwise None is returned."""
         normalized_page_name = ast_utils.normalize_page_name(name)
-        if normalized_page_name in self.pages:
-            return self.pages[normalized_page_name]
-        if on_not_found is None:
-            return None
-        page_name = on_not_found(self.pages.keys(), normalized_page_name)
-        if page_name is None:
-            return None
-        return self.pages[page_name]
+        if self.index is not None and not self.index.has_child(
+            self.index_path, normalized_page_name
+        ):
+            # The index lists all our sub-pages, so no need to traverse just to find out.
+            if on_not_found is None:
+                return None
+            page_name = on_not_found(self.index.children(self.index_path), normalized_page_name)
+            if page_name is None:
+                return None
+            normalized_page_name = page_name
+        elif (
+            self._probe_cached(normalized_page_name) is None
+            and normalized_page_name not in self.sub_pages()
+        ):
+            if on_not_found is None:
+                return None
+            page_name = on_not_found(self.sub_pages().keys(), normalized_page_name)
+            if page_name is None:
+                return None
+            normalized_page_name = page_name
+        page = self._probe_cached(normalized_page_name)
+        if page is None:
+            page = self.sub_pages().get(normalized_page_name)
+        if self.index is not None and isinstance(page, Traversable) and page.index is None:
+            page.index = self.index
+            page.index_path = (*self.index_path, normalized_page_name)
+        return page
 
     __getitem__ = search
 
+    def probe(self, page_name: str) -> Page | None:
+        """
+        Returns the immediate sub-page named page_name (normalized) without traversing,
+        or None if it can't be found that way. Subclasses that can look up a single sub-page
+        more cheaply than traversing all of them override this.
+        """
+        return None
+
+    def _probe_cached(self, page_name: str) -> Page | None:
+        page = self._cached_page(page_name)
+        if page is not None or self.__traverse_exhaused__:
+            return page
+        with self._lock:
+            # Another thread may have probed or traversed it while we waited
+            page = self._cached_page(page_name)
+            if page is not None or self.__traverse_exhaused__:
+                return page
+            page = self.probe(page_name)
+            if page is not None:
+                if self._probed_pages is EMPTY_PAGES:
+                    self._probed_pages = {}
+                self._probed_pages[page_name] = page
+                if self._traversal_cursor is None:
+                    # Otherwise it's added when the traversal yields it, in traversal order
+                    if self._pages is EMPTY_PAGES:
+                        self._pages = {}
+                    self._pages[page_name] = page
+            return page
+
+    def _cached_page(self, page_name: str) -> Page | None:
+        page = self._pages.get(page_name)
+        if page is None:
+            page = self._probed_pages.get(page_name)
+        return page
+
     # @log.log_in_out
     def deep_search(
         self,
@@ -130,6 +352,7 @@ class Traversable(Page):
         *,
         on_not_found: Callable[[Iterable[str], str], str | None] | None = None,
         recursive: bool = False,
+        max_depth: int | None = None,
     ) -> tuple[list[str], Page]:
         """
         Searches a possibly nested page by it's full path.
@@ -137,33 +360,55 @@ class Traversable(Page):
         - its return tuple, with the first item being the path taken from here to the page (including up to the page),
         - its ability to search recursively.
 
-        Note: when searching recursively, the tree is traversed all the way down,
-        and unless there's only one matching page in the tree, a MergedPage
-        is returned containing a flat list of all the matching pages.
+        When searching recursively, each name in the path is resolved best-first:
+        the shallowest exact match wins (same-depth ones are merged), and 'on_not_found'
+        is only asked to choose (once, with the shallowest names first) if there's no
+        exact match down to max_depth (1 being the immediate sub-pages; None for no limit).
+        With an index, the closest typo correction wins, and 'on_not_found' only chooses
+        between equally close ones (see PageIndex.resolve_all).
+        Without an index, deeper names are looked up in self.name_map(), which traverses
+        the tree only as deep as the shallowest exact match.
         """
         if not page_path:
             return [], self
         # if isinstance(self, MergedPage) and not self.pages:
         #     breakpoint()
-        from termwiki.page import MergedPage
 
         if isinstance(page_path, str):
             page_path = page_path.split(" ")
+        if self.index is not None:
+            found = self._index_deep_search(
+                page_path, on_not_found=on_not_found, recursive=recursive, max_depth=max_depth
+            )
+            if found is not None:
+                return found
         first_page_path, *second_and_on_page_paths = page_path
-        first_page: Page | Traversable = self.search(first_page_path, on_not_found=on_not_found)
+        first_page: Page | Traversable = self.search(
+            first_page_path,
+            # An exact match deeper down is better than whatever on_not_found chooses here
+            on_not_found=None if recursive else on_not_found,
+        )
         if not first_page:
             if not recursive:
                 return [], self
-            merged_sub_pages: MergedPage = self.merge_sub_pages()
-            if merged_sub_pages.pages == self.pages:
+            entries = self.name_map().resolve_all(
+                first_page_path, on_not_found=on_not_found, max_depth=max_depth
+            )
+            if not entries:
                 return [], self
-                # if not recursive:
-                #     return [], self
-                # for sub_page in merged_sub_pages.traverse():
-            found_paths, found_page = merged_sub_pages.deep_search(
-                page_path, on_not_found=on_not_found, recursive=True
+            resolved_path, first_page = _merge_entries(entries)
+            if not second_and_on_page_paths or not hasattr(first_page, "deep_search"):
+                return list(resolved_path), first_page
+            if first_page._name_map is None and len(entries) == 1:
+                # The rest of the path is searched in the part of the tree that's already mapped
+                first_page._name_map = self.name_map().sub_map(resolved_path, first_page)
+            found_paths, found_page = first_page.deep_search(
+                second_and_on_page_paths,
+                on_not_found=on_not_found,
+                recursive=recursive,
+                max_depth=max_depth,
             )
-            return found_paths, found_page
+            return [*resolved_path, *found_paths], found_page
 
         if not second_and_on_page_paths or not hasattr(first_page, "deep_search"):
             return [first_page_path], first_page
@@ -171,7 +416,10 @@ class Traversable(Page):
         first_page: Traversable
 
         found_paths, found_page = first_page.deep_search(
-            second_and_on_page_paths, on_not_found=on_not_found, recursive=recursive
+            second_and_on_page_paths,
+            on_not_found=on_not_found,
+            recursive=recursive,
+            max_depth=max_depth,
         )
         return [first_page_path, *found_paths], found_page
         # if not found_paths and recursive:
@@ -181,10 +429,61 @@ class Traversable(Page):
         #                                         recursive=True)
         # return [first_page_path] + found_paths, found_page
 
+    def _index_deep_search(
+        self,
+        page_path: Sequence[str],
+        *,
+        on_not_found: Callable[[Iterable[str], str], str | None] | None,
+        recursive: bool,
+        max_depth: int | None,
+    ) -> tuple[list[str], Page] | None:
+        """
+        Resolves the first name in page_path with self.index, then materializes only
+        the pages along the resolved paths. Returns None if the index and the actual
+        pages disagree (e.g. a page that's only known at runtime), so deep_search
+        can fall back to traversing.
+        """
+        first_page_path, *second_and_on_page_paths = page_path
+        resolved_paths = self.index.resolve_all(
+            first_page_path,
+            under=self.index_path,
+            on_not_found=on_not_found,
+            recursive=recursive,
+            max_depth=max_depth,
+        )
+        if not resolved_paths:
+            return [], self
+        entries = []
+        for resolved_path in resolved_paths:
+            found_page = self
+            for page_name in resolved_path:
+                found_page = found_page.search(page_name)
+                if found_page is None:
+                    return None
+            entries.append((resolved_path, found_page))
+        resolved_path, found_page = _merge_entries(entries)
+        if not second_and_on_page_paths or not hasattr(found_page, "deep_search"):
+            return list(resolved_path), found_page
+        found_paths, found_page = found_page.deep_search(
+            second_and_on_page_paths,
+            on_not_found=on_not_found,
+            recursive=recursive,
+            max_depth=max_depth,
+        )
+        return [*resolved_path, *found_paths], found_page
+
+    def name_map(self) -> NameMap:
+        """All pages below this one by name, built on first use (see NameMap)."""
+        if self._name_map is None:
+            with self._lock:
+                if self._name_map is None:
+                    self._name_map = NameMap(self)
+        return self._name_map
+
     def merge_sub_pages(self) -> ForwardRef("MergedPage"):
         from .merged_page import MergedPage
 
-        merged_sub_pages = MergedPage(self.pages)
+        merged_sub_pages = MergedPage(*self.sub_pages().values())
         return merged_sub_pages
 
     def read(self, *args, **kwargs) -> str:
@@ -196,8 +495,7 @@ class Traversable(Page):
         Subclasses that have an inherent way to return their own content
         should override this method, and call super().read() in case of failure.
         """
-        # todo: if deep_search had a depth parameter, this would be equivalent to
-        #  self.deep_search(self.name(), recursive=True, depth=2)
+        # todo: consider self.deep_search(self.name(), recursive=True, max_depth=2)
         name = self.name()
         page = self.search(name)
         if page:
@@ -206,3 +504,16 @@ class Traversable(Page):
         merged_sub_pages = self.merge_sub_pages()
         merged_sub_pages_text = merged_sub_pages.read()
         return merged_sub_pages_text
+
+
+def _merge_entries(entries: list[tuple[AncestryPath, Page]]) -> tuple[AncestryPath, Page]:
+    """
+    The best matches of a recursive search are at the same depth; several are merged
+    like same-name sub-pages are, under the first one's path.
+    """
+    (first_path, first_page), *other_entries = entries
+    if not other_entries:
+        return first_path, first_page
+    from .merged_page import MergedPage
+
+    return first_path, MergedPage(first_page, *(page for _, page in other_entries))
@@ -0,0 +1,529 @@
+"""
+A persistent index of a page tree, so resolving a page path doesn't require
+walking the tree, importing page modules nor parsing them.
+
+The index maps ancestry paths (tuples of normalized page names, relative to the
+root directory) to the entries found there, mirroring what DirectoryPage,
+PythonFilePage and FunctionPage yield when traversed.
+It's stored under the termwiki cache directory, and validated incrementally when loaded:
+a directory is re-listed only if its mtime changed, and a file is re-parsed only if
+its mtime or size changed. A TypoIndex of all the names is stored in a cache file of its own,
+since it's much larger. It's loaded only when a typo is looked up, and then updated with
+only the names that were added or removed since it was saved.
+"""
+
+import ast
+import hashlib
+import os
+import pickle
+import threading
+from collections.abc import Callable, Generator, Iterable
+from pathlib import Path
+from typing import Literal, NamedTuple
+
+from termwiki import consts
+from termwiki.log import log
+
+from . import ast_utils
+from .ast_cache import ast_cache
+from .typo_index import TypoIndex
+
+INDEX_FORMAT_VERSION = 3
+
+PageKind = Literal[
+    "directory", "python_file", "markdown_file", "file", "function", "variable", "merged"
+]
+AncestryPath = tuple[str, ...]
+
+
+class IndexEntry(NamedTuple):
+    kind: PageKind
+    file: str
+    span: tuple[int, int] | None
+    """First and last lines in file. None for directories and whole files."""
+    mtime: int
+
+
+class DirectoryRecord(NamedTuple):
+    mtime: int
+    listing: list[tuple[str, bool]]
+    """(entry name, is_dir) pairs, filtered and sorted like DirectoryPage.traverse does."""
+
+
+class FileRecord(NamedTuple):
+    mtime: int
+    size: int
+    symbols: list[tuple[AncestryPath, PageKind, tuple[int, int]]]
+    """Pages defined in the file, relative to the file's own page."""
+
+
+def iter_function_symbols(function_def: ast.FunctionDef) -> Generator[tuple[str, tuple[int, int]]]:
+    """Mirrors ast_utils.traverse_function."""
+    function_name = ast_utils.normalize_page_name(function_def.name)
+    for node in function_def.body:
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    yield ast_utils.normalize_page_name(target.id), ast_utils.get_node_span(node)
+        elif hasattr(node, "value"):
+            yield function_name, ast_utils.get_node_span(node)
+
+
+def python_module_symbols(
+    python_module_ast: ast.Module,
+) -> list[tuple[AncestryPath, PageKind, tuple[int, int]]]:
+    """Mirrors ast_utils.traverse_module, without importing the module."""
+    exclude_names = ast_utils.get_exclude_names(python_module_ast)
+    symbols = []
+    for node in python_module_ast.body:
+        if isinstance(node, ast.FunctionDef):
+            function_name = ast_utils.normalize_page_name(node.name)
+            if node.name in exclude_names or function_name in exclude_names:
+                continue
+            function_span = ast_utils.get_node_span(node)
+            function_symbols = list(iter_function_symbols(node))
+            aliases = map(ast_utils.normalize_page_name, ast_utils.get_alias_decorator_args(node))
+            for page_name in (function_name, *aliases):
+                symbols.append(((page_name,), "function", function_span))
+                for variable_name, variable_span in function_symbols:
+                    symbols.append(((page_name, variable_name), "variable", variable_span))
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    variable_name = ast_utils.normalize_page_name(target.id)
+                    symbols.append(((variable_name,), "variable", ast_utils.get_node_span(node)))
+    return symbols
+
+
+def python_file_symbols(
+    python_file_path: str,
+) -> list[tuple[AncestryPath, PageKind, tuple[int, int]]]:
+    """Symbols are cached per file content by ast_cache, so unchanged files aren't parsed."""
+    try:
+        return ast_cache.file_metadata(
+            python_file_path, f"page_index_symbols_v{INDEX_FORMAT_VERSION}", python_module_symbols
+        )
+    except SyntaxError as e:
+        log.warning(f"python_file_symbols({python_file_path!r}) | {e!r}")
+        return []
+
+
+class PageIndex:
+    """
+    Loaded lazily, on first query. Querying methods take ancestry paths
+    relative to the root directory, e.g. ('bash', 'xargs').
+    """
+
+    def __init__(self, root: Path | str, cache_dir: Path | str | None = None) -> None:
+        self.root = str(Path(root).resolve())
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else consts.CACHE_DIR_PATH
+        self._directories: dict[str, DirectoryRecord] = {}
+        self._files: dict[str, FileRecord] = {}
+        self._entries: dict[AncestryPath, list[IndexEntry]] = {}
+        self._children: dict[AncestryPath, list[str]] = {}
+        self._names: dict[str, list[AncestryPath]] = {}
+        self._names_digest = ""
+        self._typo_index: TypoIndex | None = None
+        """Loaded on first lookup (see typo_index())."""
+        self._typo_index_names_digest = ""
+        self._is_fresh = False
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(root={self.root!r})"
+
+    @property
+    def cache_path(self) -> Path:
+        return self.cache_dir / f"page-index-{self._root_digest()}.pickle"
+
+    @property
+    def typo_index_cache_path(self) -> Path:
+        return self.cache_dir / f"typo-index-{self._root_digest()}.pickle"
+
+    def _root_digest(self) -> str:
+        return hashlib.sha1(self.root.encode()).hexdigest()[:16]
+
+    # *** Querying
+
+    def lookup(self, ancestry_path: AncestryPath) -> list[IndexEntry]:
+        self.ensure_fresh()
+        return self._entries.get(ancestry_path, [])
+
+    def children(self, ancestry_path: AncestryPath = ()) -> list[str]:
+        """Normalized names of the immediate sub-pages, in traversal order."""
+        self.ensure_fresh()
+        return self._children.get(ancestry_path, [])
+
+    def has_child(self, ancestry_path: AncestryPath, page_name: str) -> bool:
+        """Whether page_name (normalized) is an immediate sub-page, without listing them."""
+        self.ensure_fresh()
+        return (*ancestry_path, page_name) in self._entries
+
+    def find(self, page_name: str, under: AncestryPath = ()) -> list[AncestryPath]:
+        """All ancestry paths below 'under' that end with page_name, shallowest first."""
+        self.ensure_fresh()
+        normalized_page_name = ast_utils.normalize_page_name(page_name)
+        prefix_length = len(under)
+        ancestry_paths = [
+            ancestry_path
+            for ancestry_path in self._names.get(normalized_page_name, [])
+            if len(ancestry_path) > prefix_length and ancestry_path[:prefix_length] == under
+        ]
+        return sorted(ancestry_paths, key=len)
+
+    def find_typos(
+        self, page_name: str, under: AncestryPath = (), max_depth: int | None = None
+    ) -> list[tuple[int, AncestryPath]]:
+        """
+        (distance, ancestry path) of the pages below 'under' (down to max_depth) whose name
+        could be what page_name is a typo of (see TypoIndex.lookup), closest first, then shallowest.
+        """
+        typo_index = self.typo_index()
+        normalized_page_name = ast_utils.normalize_page_name(page_name)
+        prefix_length = len(under)
+        typos = []
+        for distance, name in typo_index.lookup(normalized_page_name):
+            for ancestry_path in self._names[name]:
+                depth = len(ancestry_path) - prefix_length
+                if depth < 1 or ancestry_path[:prefix_length] != under:
+                    continue
+                if max_depth is not None and depth > max_depth:
+                    continue
+                typos.append((distance, ancestry_path))
+        return sorted(typos, key=lambda typo: (typo[0], len(typo[1])))
+
+    def iter_levels(
+        self, under: AncestryPath = (), max_depth: int | None = None
+    ) -> Generator[dict[str, list[AncestryPath]]]:
+        """
+        Yields the descendants of 'under', one depth level at a time, starting from
+        the children and down to max_depth (all levels if None), as
+        {normalized name: [ancestry path, ...]} dicts."""
+        self.ensure_fresh()
+        prefix_length = len(under)
+        levels: dict[int, dict[str, list[AncestryPath]]] = {}
+        for ancestry_path in self._entries:
+            depth = len(ancestry_path) - prefix_length
+            if depth < 1 or ancestry_path[:prefix_length] != under:
+                continue
+            if max_depth is not None and depth > max_depth:
+                continue
+            level = levels.setdefault(depth, {})
+            level.setdefault(ancestry_path[-1], []).append(ancestry_path)
+        for depth in sorted(levels):
+            yield levels[depth]
+
+    def resolve(
+        self,
+        page_name: str,
+        *,
+        under: AncestryPath = (),
+        on_not_found: Callable[[Iterable[str], str], str | None] | None = None,
+        recursive: bool = False,
+        max_depth: int | None = None,
+    ) -> AncestryPath:
+        """
+        The path to the best match of page_name relative to 'under' (see resolve_all).
+        Returns an empty tuple if not found.
+        """
+        resolved_paths = self.resolve_all(
+            page_name,
+            under=under,
+            on_not_found=on_not_found,
+            recursive=recursive,
+            max_depth=max_depth,
+        )
+        return resolved_paths[0] if resolved_paths else ()
+
+    def resolve_all(
+        self,
+        page_name: str,
+        *,
+        under: AncestryPath = (),
+        on_not_found: Callable[[Iterable[str], str], str | None] | None = None,
+        recursive: bool = False,
+        max_depth: int | None = None,
+    ) -> list[AncestryPath]:
+        """
+        The paths to the best matches of page_name relative to 'under', ranked like
+        Traversable.deep_search ranks them: the shallowest exact matches (several if they're
+        at the same depth); else, if 'on_not_found' is given, the closest typo correction
+        (see find_typos) at any depth. If several names are equally close, 'on_not_found'
+        chooses among the corrections, closest first; if there are none, among the names
+        of all levels, shallowest first. It's asked once, so an interactive chooser is
+        shown once. Without 'recursive', only immediate children
+        are considered; otherwise down to max_depth (1 being the immediate children), or all the way down.
+        Returns an empty list if not found.
+        """
+        if not recursive:
+            max_depth = 1
+        normalized_page_name = ast_utils.normalize_page_name(page_name)
+        prefix_length = len(under)
+        exact_paths = [
+            ancestry_path[prefix_length:]
+            for ancestry_path in self.find(normalized_page_name, under)
+            if max_depth is None or len(ancestry_path) - prefix_length <= max_depth
+        ]
+        if exact_paths:
+            shallowest_depth = len(exact_paths[0])
+            return [path for path in exact_paths if len(path) == shallowest_depth]
+        if on_not_found is None:
+            return []
+        typos = self.find_typos(normalized_page_name, under, max_depth)
+        if typos:
+            shallowest_paths = _shallowest_typo_paths(typos)
+            closest_distance = typos[0][0]
+            closest_names = {
+                ancestry_path[-1]
+                for distance, ancestry_path in typos
+                if distance == closest_distance
+            }
+            if len(closest_names) == 1:
+                [chosen_page_name] = closest_names
+            else:
+                chosen_page_name = _choose(normalized_page_name, shallowest_paths, on_not_found)
+        else:
+            shallowest_paths = {}
+            for level in self.iter_levels(under, max_depth):
+                for name, ancestry_paths in level.items():
+                    shallowest_paths.setdefault(name, ancestry_paths)
+            chosen_page_name = _choose(normalized_page_name, shallowest_paths, on_not_found)
+        if chosen_page_name is None:
+            return []
+        return [
+            ancestry_path[prefix_length:] for ancestry_path in shallowest_paths[chosen_page_name]
+        ]
+
+    def typo_index(self) -> TypoIndex:
+        """
+        A TypoIndex of all the names. Loaded from its own cache file on first call,
+        and updated (and saved) if the names changed since.
+        """
+        self.ensure_fresh()
+        if self._typo_index is None:
+            self._load_typo_index()
+        if self._typo_index_names_digest != self._names_digest:
+            self._typo_index.update(self._names)
+            self._typo_index_names_digest = self._names_digest
+            self._save_typo_index()
+        return self._typo_index
+
+    # *** Loading and validation
+
+    def ensure_fresh(self) -> None:
+        if self._is_fresh:
+            return
+        self._load()
+        if self._validate():
+            self._save()
+        self._is_fresh = True
+
+    def invalidate(self) -> None:
+        """Makes the next query re-validate against the file system."""
+        self._is_fresh = False
+
+    def _load(self) -> None:
+        try:
+            with self.cache_path.open("rb") as f:
+                cached = pickle.load(f)
+            if cached.get("version") != INDEX_FORMAT_VERSION or cached.get("root") != self.root:
+                return
+            directories = cached["directories"]
+            files = cached["files"]
+            entries = cached["entries"]
+            children = cached["children"]
+            names = cached["names"]
+            names_digest = cached["names_digest"]
+        except FileNotFoundError:
+            return
+        except (OSError, EOFError, pickle.UnpicklingError, KeyError) as e:
+            log.warning(f"{self!r}._load() | {e!r}")
+            return
+        self._directories = directories
+        self._files = files
+        self._entries = entries
+        self._children = children
+        self._names = names
+        self._names_digest = names_digest
+
+    def _save(self) -> None:
+        cached = {
+            "version": INDEX_FORMAT_VERSION,
+            "root": self.root,
+            "directories": self._directories,
+            "files": self._files,
+            "entries": self._entries,
+            "children": self._children,
+            "names": self._names,
+            "names_digest": self._names_digest,
+        }
+        self._dump(cached, self.cache_path)
+
+    def _load_typo_index(self) -> None:
+        """A stale TypoIndex is loaded too, since updating it is cheaper than building one."""
+        self._typo_index = TypoIndex()
+        self._typo_index_names_digest = ""
+        try:
+            with self.typo_index_cache_path.open("rb") as f:
+                cached = pickle.load(f)
+            if cached.get("version") != INDEX_FORMAT_VERSION or cached.get("root") != self.root:
+                return
+            typo_index = cached["typo_index"]
+            names_digest = cached["names_digest"]
+        except FileNotFoundError:
+            return
+        except (OSError, EOFError, pickle.UnpicklingError, KeyError) as e:
+            log.warning(f"{self!r}._load_typo_index() | {e!r}")
+            return
+        self._typo_index = typo_index
+        self._typo_index_names_digest = names_digest
+
+    def _save_typo_index(self) -> None:
+        cached = {
+            "version": INDEX_FORMAT_VERSION,
+            "root": self.root,
+            "names_digest": self._typo_index_names_digest,
+            "typo_index": self._typo_index,
+        }
+        self._dump(cached, self.typo_index_cache_path)
+
+    def _dump(self, cached: dict, cache_path: Path) -> None:
+        """Writes to a temporary file first, so concurrent readers never see a partial pickle."""
+        temporary_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with temporary_path.open("wb") as f:
+                pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+            temporary_path.replace(cache_path)
+        except OSError as e:
+            log.warning(f"{self!r}._dump({cache_path.name!r}) | {e!r}")
+
+    def _validate(self) -> bool:
+        """Re-lists changed directories and re-parses changed files. Returns whether anything changed."""
+        directories: dict[str, DirectoryRecord] = {}
+        files: dict[str, FileRecord] = {}
+        changed = self._validate_directory(self.root, directories, files)
+        changed |= directories.keys() != self._directories.keys()
+        changed |= files.keys() != self._files.keys()
+        self._directories = directories
+        self._files = files
+        if changed:
+            self._rebuild()
+        return changed
+
+    def _validate_directory(
+        self,
+        directory_path: str,
+        directories: dict[str, DirectoryRecord],
+        files: dict[str, FileRecord],
+    ) -> bool:
+        changed = False
+        directory_mtime = Path(directory_path).stat().st_mtime_ns
+        directory_record = self._directories.get(directory_path)
+        if directory_record is None or directory_record.mtime != directory_mtime:
+            listing = [
+                (dir_entry.name, dir_entry.is_dir())
+                for dir_entry in sorted(os.scandir(directory_path), key=lambda e: e.name)
+                if not dir_entry.name.startswith((".", "_"))
+            ]
+            directory_record = DirectoryRecord(directory_mtime, listing)
+            changed = True
+        directories[directory_path] = directory_record
+        for entry_name, is_dir in directory_record.listing:
+            entry_path = str(Path(directory_path, entry_name))
+            if is_dir:
+                changed |= self._validate_directory(entry_path, directories, files)
+            else:
+                changed |= self._validate_file(entry_path, files)
+        return changed
+
+    def _validate_file(self, file_path: str, files: dict[str, FileRecord]) -> bool:
+        try:
+            stat = Path(file_path).stat()
+        except FileNotFoundError:
+            return True
+        file_record = self._files.get(file_path)
+        if (
+            file_record is not None
+            and file_record.mtime == stat.st_mtime_ns
+            and file_record.size == stat.st_size
+        ):
+            files[file_path] = file_record
+            return False
+        symbols = python_file_symbols(file_path) if file_path.endswith(".py") else []
+        files[file_path] = FileRecord(stat.st_mtime_ns, stat.st_size, symbols)
+        return True
+
+    def _rebuild(self) -> None:
+        self._entries = {}
+        self._add_directory(self.root, ())
+        children: dict[AncestryPath, dict[str, None]] = {}
+        self._names = {}
+        for ancestry_path in self._entries:
+            page_name = ancestry_path[-1]
+            children.setdefault(ancestry_path[:-1], {})[page_name] = None
+            self._names.setdefault(page_name, []).append(ancestry_path)
+        self._children = {parent_path: list(names) for parent_path, names in children.items()}
+        self._names_digest = hashlib.sha1("\0".join(sorted(self._names)).encode()).hexdigest()
+
+    def _add_entry(self, ancestry_path: AncestryPath, entry: IndexEntry) -> None:
+        self._entries.setdefault(ancestry_path, []).append(entry)
+
+    def _add_directory(self, directory_path: str, ancestry_path: AncestryPath) -> None:
+        directory_record = self._directories[directory_path]
+        for entry_name, is_dir in directory_record.listing:
+            entry_path = str(Path(directory_path, entry_name))
+            if is_dir:
+                if entry_path not in self._directories:
+                    continue
+                page_path = (*ancestry_path, ast_utils.normalize_page_name(entry_name))
+                mtime = self._directories[entry_path].mtime
+                self._add_entry(page_path, IndexEntry("directory", entry_path, None, mtime))
+                self._add_directory(entry_path, page_path)
+                continue
+            file_record = self._files.get(entry_path)
+            if file_record is None:
+                continue
+            entry_name_path = Path(entry_name)
+            stem, suffix = entry_name_path.stem, entry_name_path.suffix
+            kind: PageKind = {".py": "python_file", ".md": "markdown_file"}.get(suffix, "file")
+            page_path = (*ancestry_path, ast_utils.normalize_page_name(stem))
+            self._add_entry(page_path, IndexEntry(kind, entry_path, None, file_record.mtime))
+            self._add_symbols(page_path, entry_path, file_record)
+
+        # Like DirectoryPage.traverse, pages in pages.py are also immediate sub-pages of the directory
+        pages_python_file_path = str(Path(directory_path, "pages.py"))
+        pages_python_file_record = self._files.get(pages_python_file_path)
+        if pages_python_file_record is not None:
+            self._add_symbols(ancestry_path, pages_python_file_path, pages_python_file_record)
+
+    def _add_symbols(
+        self, ancestry_path: AncestryPath, file_path: str, file_record: FileRecord
+    ) -> None:
+        for symbol_path, kind, span in file_record.symbols:
+            entry = IndexEntry(kind, file_path, span, file_record.mtime)
+            self._add_entry((*ancestry_path, *symbol_path), entry)
+
+
+def _shallowest_typo_paths(typos: list[tuple[int, AncestryPath]]) -> dict[str, list[AncestryPath]]:
+    """{name: its shallowest ancestry paths} of find_typos' corrections, in their order."""
+    shallowest_paths: dict[str, list[AncestryPath]] = {}
+    for _distance, ancestry_path in typos:
+        ancestry_paths = shallowest_paths.setdefault(ancestry_path[-1], [ancestry_path])
+        if ancestry_path not in ancestry_paths and len(ancestry_path) == len(ancestry_paths[0]):
+            ancestry_paths.append(ancestry_path)
+    return shallowest_paths
+
+
+def _choose(
+    normalized_page_name: str,
+    page_names: dict[str, ...],
+    on_not_found: Callable[[Iterable[str], str], str | None] | None,
+) -> str | None:
+    if normalized_page_name in page_names:
+        return normalized_page_name
+    if on_not_found is None or not page_names:
+        return None
+    chosen_page_name = on_not_found(page_names.keys(), normalized_page_name)
+    if chosen_page_name not in page_names:
+        return None
+    return chosen_page_name
@@ -1,5 +1,10 @@
-from termwiki import private_pages
+import importlib.util
+from pathlib import Path
 
-from . import DirectoryPage
+from . import DirectoryPage, PageIndex
 
-page_tree = DirectoryPage(private_pages)
+# Found without executing it: its modules are imported only when their pages are read
+private_pages_spec = importlib.util.find_spec("termwiki.private_pages")
+
+page_tree = DirectoryPage(Path(private_pages_spec.submodule_search_locations[0]))
+page_tree.index = PageIndex(page_tree.path())
@@ -1,31 +1,59 @@
 import ast
-import inspect
 from collections.abc import Generator
 from pathlib import Path
 from types import ModuleType
 
 from . import ast_utils
+from .ast_cache import ast_cache
+from .function_page import FunctionPage
 from .page import Page, Traversable
+from .source_segments import SourceSegments
 
 
 class PythonFilePage(Traversable):
     """A Python module representing a file (not a package)"""
 
-    def __init__(self, python_module: ModuleType | Path, parent: ModuleType | None = None) -> None:
+    __slots__ = ("_python_module", "_python_module_ast", "_source_segments", "parent", "static")
+    kind = "python_file"
+
+    def __init__(
+        self,
+        python_module: ModuleType | Path,
+        parent: ModuleType | None = None,
+        *,
+        static: bool = True,
+    ) -> None:
+        """
+        If 'static' (default), sub-pages are yielded from the source's AST, and the module
+        is imported only when reading a sub-page requires executing it. Otherwise, the module
+        is imported on traversal, and sub-pages are yielded from its runtime objects.
+        """
         super().__init__()
         self._python_module = python_module
         self._python_module_ast = None
+        self._source_segments = None
         self.parent = parent
+        self.static = static
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(python_module={self._python_module!r})"
 
+    def path(self) -> Path:
+        if isinstance(self._python_module, ModuleType):
+            return Path(self._python_module.__file__)
+        return Path(self._python_module)
+
     def python_module_ast(self) -> ast.Module:
         if self._python_module_ast:
             return self._python_module_ast
-        self._python_module_ast: ast.Module = ast.parse(inspect.getsource(self.python_module()))
+        self._python_module_ast: ast.Module = ast_cache.parse_file(self.path())
         return self._python_module_ast
 
+    def source_segments(self) -> SourceSegments:
+        if self._source_segments is None:
+            self._source_segments = SourceSegments(self.path().read_text())
+        return self._source_segments
+
     def python_module(self) -> ModuleType:
         if isinstance(self._python_module, ModuleType):
             return self._python_module
@@ -36,12 +64,49 @@ class PythonFilePage(Traversable):
         return self._python_module
 
     def name(self):
-        python_module = self.python_module()
-        module_name = Path(python_module.__file__).stem
-        return module_name
+        return self.path().stem
+
+    def defines(self, page_name: str) -> bool:
+        """Whether page_name is one of this file's pages, without parsing the whole file."""
+        if self._python_module_ast is not None or not self.static:
+            return page_name in self.pages
+        return self.source_segments().find(page_name) is not None
+
+    def probe(self, page_name: str) -> Page | None:
+        """
+        Parses only the top-level statement that defines page_name, unless the whole file
+        is already parsed. Listing all pages still parses the whole file.
+        If the statement's page was already found by another name (an alias, or another
+        target of the same assignment), that page is returned.
+        """
+        if not self.static or self._python_module_ast is not None:
+            return None
+        source_segments = self.source_segments()
+        segment = source_segments.find(page_name)
+        if segment is None:
+            return None
+        for name in map(ast_utils.normalize_page_name, segment.names):
+            if source_segments.find(name) is not segment:
+                continue
+            shared_page = self._cached_page(name)
+            if shared_page is not None:
+                return shared_page
+        node = source_segments.parse(segment)
+        if node is None:
+            return None
+        if segment.kind == "function":
+            return FunctionPage(function_def=node, python_file_page=self)
+        found_page = None
+        for name, page in ast_utils.traverse_assign_node_statically(node, self.python_module):
+            if name == page_name:
+                found_page = page
+        return found_page
 
     def traverse(self, *args, cache_ok=True, **kwargs) -> Generator[tuple[str, Page]]:
         self.__traverse_exhaused__ and breakpoint()
-        python_module: ModuleType = self.python_module()
         python_module_ast: ast.Module = self.python_module_ast()
+        if self.static:
+            yield from ast_utils.traverse_module_statically(self, python_module_ast)
+            return
+        python_module: ModuleType = self.python_module()
         yield from ast_utils.traverse_module(python_module, python_module_ast)
@@ -0,0 +1,172 @@
+"""
+A cheap scan of a Python page file's top-level statements, so a single function or
+variable can be parsed on its own, without parsing the whole file.
+
+The scan is line-based: a top-level statement starts at a line that begins at column 0.
+Strings, comments and brackets are skipped with a regex tokenizer, so lines inside
+multiline strings or calls aren't mistaken for statements. It's not a full tokenizer, so
+a segment is only trusted if it parses to what the scan said it is; callers fall back to
+a full parse otherwise.
+"""
+
+import ast
+import re
+from ast import literal_eval
+from typing import Literal, NamedTuple
+
+from .ast_utils import normalize_page_name
+
+SegmentKind = Literal["function", "assign", "other"]
+
+_TOKEN_RE = re.compile(
+    r"""
+    ^(?P<statement>(?=[^\s\#]))
+    | (?P<string>
+        \"\"\"[^"\\]*(?:(?:\\[\s\S]|"(?!""))[^"\\]*)*\"\"\"
+      | '''[^'\\]*(?:(?:\\[\s\S]|'(?!''))[^'\\]*)*'''
+      | "[^"\\\n]*(?:\\[\s\S][^"\\\n]*)*"
+      | '[^'\\\n]*(?:\\[\s\S][^'\\\n]*)*'
+    )
+    | (?P<comment>\#[^\n]*)
+    | (?P<open>[(\[{])
+    | (?P<close>[)\]}])
+    """,
+    re.MULTILINE | re.VERBOSE,
+)
+_FUNCTION_RE = re.compile(r"(?:async\s+)?def\s+(?P<name>\w+)")
+_ASSIGN_TARGETS_RE = re.compile(r"(?:[A-Za-z_]\w*\s*=(?!=)\s*)+")
+_ALIAS_DECORATOR_RE = re.compile(r"@(?:\w+\.)*alias\((?P<args>.*)\)\s*$")
+_STRING_ARG_RE = re.compile(r"'(?P<single>[^'\\]*)'|\"(?P<double>[^\"\\]*)\"")
+
+
+class Segment(NamedTuple):
+    kind: SegmentKind
+    names: tuple[str, ...]
+    """The function's name and its @alias names, or the assignment's target names."""
+    start: int
+    """First line (1-based), including decorators."""
+    end: int
+    """Last line, exclusive of the next segment's first line."""
+
+
+def scan_statement_lines(source: str) -> list[int]:
+    """The (1-based) first line of each top-level statement in source."""
+    statement_lines = []
+    depth = 0
+    line = 1
+    position = 0
+    for match in _TOKEN_RE.finditer(source):
+        kind = match.lastgroup
+        if kind == "open":
+            depth += 1
+        elif kind == "close":
+            depth = max(depth - 1, 0)
+        elif kind == "statement" and depth == 0:
+            line += source.count("\n", position, match.start())
+            position = match.start()
+            statement_lines.append(line)
+    return statement_lines
+
+
+def get_alias_args(decorator_line: str) -> list[str]:
+    """Like ast_utils.get_alias_decorator_args, for simple string literals."""
+    match = _ALIAS_DECORATOR_RE.match(decorator_line)
+    if not match:
+        return []
+    return [
+        string_match["single"] if string_match["single"] is not None else string_match["double"]
+        for string_match in _STRING_ARG_RE.finditer(match["args"])
+    ]
+
+
+def scan_segments(source: str) -> list[Segment]:
+    lines = source.splitlines()
+    statement_lines = scan_statement_lines(source)
+    segments = []
+    decorator_lines = []
+    for i, statement_line in enumerate(statement_lines):
+        end = statement_lines[i + 1] - 1 if i + 1 < len(statement_lines) else len(lines)
+        first_line = lines[statement_line - 1]
+        if first_line.startswith("@"):
+            decorator_lines.append(statement_line)
+            continue
+        start = decorator_lines[0] if decorator_lines else statement_line
+        if function_match := _FUNCTION_RE.match(first_line):
+            aliases = []
+            for decorator_line in decorator_lines:
+                aliases.extend(get_alias_args(lines[decorator_line - 1]))
+            segments.append(Segment("function", (function_match["name"], *aliases), start, end))
+        elif assign_match := _ASSIGN_TARGETS_RE.match(first_line):
+            names = tuple(name.strip() for name in assign_match.group().split("=") if name.strip())
+            segments.append(Segment("assign", names, start, end))
+        else:
+            segments.append(Segment("other", (), start, end))
+        decorator_lines = []
+    return segments
+
+
+class SourceSegments:
+    """The segments of a source, by normalized page name."""
+
+    def __init__(self, source: str) -> None:
+        self.lines = source.splitlines(keepends=True)
+        self.segments = scan_segments(source)
+        self._by_page_name: dict[str, int] | None = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(segments={len(self.segments)})"
+
+    def exclude_names(self) -> set[str]:
+        for segment in self.segments:
+            if segment.kind == "assign" and "__exclude__" in segment.names:
+                node = self.parse(segment)
+                try:
+                    return set(literal_eval(node.value)) if node else set()
+                except ValueError:
+                    return set()
+        return set()
+
+    def find(self, page_name: str) -> Segment | None:
+        """
+        The segment that defines the normalized page_name. Like traversal,
+        when there are several, the last one wins.
+        """
+        if self._by_page_name is None:
+            exclude_names = self.exclude_names()
+            self._by_page_name = {}
+            for i, segment in enumerate(self.segments):
+                if segment.kind == "function":
+                    function_name = segment.names[0]
+                    if {function_name, normalize_page_name(function_name)} & exclude_names:
+                        continue
+                for name in segment.names:
+                    self._by_page_name[normalize_page_name(name)] = i
+        i = self._by_page_name.get(page_name)
+        return None if i is None else self.segments[i]
+
+    def parse(self, segment: Segment) -> ast.stmt | None:
+        """
+        Parses segment on its own, with line numbers relative to the whole source.
+        If the scan cut the segment short (e.g. a column-0 line in a string it couldn't
+        tell apart), following segments are joined, up to a few times.
+        Returns None if it still doesn't parse to a single statement of the scanned kind.
+        """
+        i = self.segments.index(segment)
+        for end_segment in self.segments[i : i + 4]:
+            segment_source = "".join(self.lines[segment.start - 1 : end_segment.end])
+            try:
+                module = ast.parse(segment_source)
+            except SyntaxError:
+                continue
+            if len(module.body) != 1:
+                return None
+            [node] = module.body
+            ast.increment_lineno(node, segment.start - 1)
+            is_function = isinstance(node, ast.FunctionDef) and node.name == segment.names[0]
+            is_assign = isinstance(node, ast.Assign)
+            if (segment.kind == "function" and is_function) or (
+                segment.kind == "assign" and is_assign
+            ):
+                return node
+            return None
+        return None
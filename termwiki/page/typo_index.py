@@ -0,0 +1,163 @@
+"""
+A symmetric-delete (SymSpell-like) typo dictionary of page names: each name is stored under
+every string that's at most MAX_DISTANCE deletions away from its prefixes (up to
+PREFIX_LENGTH characters), so finding the names close to a typo is a lookup of the typo's
+own deletions, rather than comparing it with every name.
+
+Comparing prefixes also makes a name a correction of a typo of its beginning
+('delete' -> 'deletion'), which is how page names are usually mistyped or shortened.
+"""
+
+from collections.abc import Iterable
+
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+MIN_TYPO_LENGTH = 3
+"""Shorter terms are too ambiguous to correct."""
+
+
+def allowed_distance(term: str) -> int:
+    """One edit per three characters, up to MAX_DISTANCE."""
+    return min(MAX_DISTANCE, len(term) // 3)
+
+
+def deletions(word: str, max_distance: int) -> set[str]:
+    """word, and every string that's up to max_distance deletions away from it."""
+    variants = {word}
+    edge = {word}
+    for _ in range(max_distance):
+        edge = {
+            variant[:i] + variant[i + 1 :] for variant in edge for i in range(len(variant))
+        } - variants
+        if not edge:
+            break
+        variants |= edge
+    return variants
+
+
+def name_deletions(name: str) -> set[str]:
+    """The deletions of name's prefixes that a lookup could probe."""
+    # Terms are at least MIN_TYPO_LENGTH long, and lose at most len(term) // 3 characters
+    min_length = MIN_TYPO_LENGTH - 1
+    prefix_deletions = deletions(name[:PREFIX_LENGTH], MAX_DISTANCE)
+    for prefix_length in range(MIN_TYPO_LENGTH, min(len(name), PREFIX_LENGTH)):
+        # Only terms this long or shorter are compared with this prefix
+        prefix = name[:prefix_length]
+        prefix_deletions |= deletions(prefix, allowed_distance(prefix))
+    return {deletion for deletion in prefix_deletions if len(deletion) >= min_length}
+
+
+def prefix_distance(term: str, name: str, max_distance: int = MAX_DISTANCE) -> int:
+    """
+    The optimal string alignment distance (Levenshtein, plus transpositions of adjacent
+    characters) between term and the closest of name, and its prefixes that are at least
+    as long as term (so 'sde' is 1 away from 'sed', but not from 'delete').
+    Only distances up to max_distance are computed; farther ones are max_distance + 1.
+    """
+    name = name[: len(term) + max_distance]  # The closest prefix isn't longer than this
+    common_length = 0
+    for term_char, name_char in zip(term, name, strict=False):
+        if term_char != name_char:
+            break
+        common_length += 1
+    term, name = term[common_length:], name[common_length:]
+    too_far = max_distance + 1
+    previous_previous_row = None
+    previous_row = [min(j, too_far) for j in range(len(name) + 1)]
+    for i, term_char in enumerate(term, start=1):
+        row = [too_far] * (len(name) + 1)
+        row[0] = min(i, too_far)
+        row_min = row[0]
+        # Cells farther than max_distance from the diagonal are too far anyway
+        for j in range(max(1, i - max_distance), min(len(name), i + max_distance) + 1):
+            name_char = name[j - 1]
+            distance = previous_row[j - 1] + (term_char != name_char)
+            if previous_row[j] + 1 < distance:
+                distance = previous_row[j] + 1
+            if row[j - 1] + 1 < distance:
+                distance = row[j - 1] + 1
+            if (
+                previous_previous_row is not None
+                and j > 1
+                and term_char == name[j - 2]
+                and term[i - 2] == name_char
+                and previous_previous_row[j - 2] + 1 < distance
+            ):
+                distance = previous_previous_row[j - 2] + 1
+            if distance < too_far:
+                row[j] = distance
+                if distance < row_min:
+                    row_min = distance
+        if row_min == too_far:
+            return too_far
+        previous_previous_row, previous_row = previous_row, row
+    return min(previous_row[min(len(term), len(name)) :])
+
+
+class TypoIndex:
+    """
+    Maps the deletions of each name's prefix to the names. update() adds and removes only
+    the names that changed, so it's kept (and pickled) alongside whatever owns the names.
+    """
+
+    def __init__(self) -> None:
+        self._names: set[str] = set()
+        self._deletions: dict[str, set[str]] = {}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(names={len(self._names)})"
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def update(self, names: Iterable[str]) -> bool:
+        """Makes the index hold exactly 'names'. Returns whether anything changed."""
+        names = set(names)
+        removed_names = self._names - names
+        added_names = names - self._names
+        for name in removed_names:
+            self.remove(name)
+        for name in added_names:
+            self.add(name)
+        return bool(removed_names or added_names)
+
+    def add(self, name: str) -> None:
+        if name in self._names:
+            return
+        self._names.add(name)
+        for deletion in name_deletions(name):
+            self._deletions.setdefault(deletion, set()).add(name)
+
+    def remove(self, name: str) -> None:
+        if name not in self._names:
+            return
+        self._names.remove(name)
+        for deletion in name_deletions(name):
+            names = self._deletions[deletion]
+            names.discard(name)
+            if not names:
+                del self._deletions[deletion]
+
+    def lookup(self, term: str, max_distance: int | None = None) -> list[tuple[int, str]]:
+        """
+        The names whose prefix is within max_distance (allowed_distance(term) if None)
+        of term, as (distance, name) pairs, closest first. term itself isn't included.
+        """
+        if len(term) < MIN_TYPO_LENGTH:
+            return []
+        if max_distance is None:
+            max_distance = allowed_distance(term)
+        candidates = set()
+        for deletion in deletions(term[:PREFIX_LENGTH], max_distance):
+            candidates.update(self._deletions.get(deletion, ()))
+        candidates.discard(term)
+        corrections = []
+        for name in candidates:
+            distance = prefix_distance(term, name, max_distance)
+            if distance <= max_distance:
+                corrections.append((distance, name))
+        corrections.sort(key=lambda correction: (correction[0], len(correction[1]), correction[1]))
+        return corrections
@@ -1,4 +1,6 @@
-from termwiki.util import clean_str, short_repr
+from typing import Callable
+
+from termwiki.util import cached_property, clean_str, short_repr
 
 from .page import Page
 
@@ -6,17 +8,42 @@ from .page import Page
 class VariablePage(Page):
     """Variables within functions, or variables at module level"""
 
-    def __init__(self, value: str, name: str | None = None) -> None:
+    __slots__ = ("_evaluate", "_value", "name")
+    kind = "variable"
+
+    def __init__(
+        self,
+        value: str | None = None,
+        name: str | None = None,
+        *,
+        evaluate: Callable[[], str] | None = None,
+    ) -> None:
+        """
+        If 'evaluate' is given instead of 'value', it's called on first access to self.value,
+        e.g. when the value is an f-string that can only be evaluated after importing its module.
+        Traversal passes an ast_utils.DeferredEvaluation, so only variables that are read
+        are evaluated.
+        """
         super().__init__()
-        self.value = value
+        if evaluate is None:
+            self._value = value
+        self._evaluate = evaluate
         self.name = name
 
     def __repr__(self) -> str:
         # todo: when it's IndentationMarkdown, decoloring value should be less hacky
-        return (
-            f"{self.__class__.__name__}(name={self.name!r},"
-            f" value={short_repr(clean_str(self.value))})"
-        )
+        if self._evaluate is not None:
+            value_repr = "<not evaluated>"
+        else:
+            value_repr = short_repr(clean_str(self.value))
+        return f"{self.__class__.__name__}(name={self.name!r}, value={value_repr})"
+
+    @cached_property
+    def value(self) -> str:
+        # Only called if 'evaluate' was given, once, even if several threads read it at the same time
+        value = self._evaluate()
+        self._evaluate = None
+        return value
 
     def read(self, *args, **kwargs) -> str:
         return str(self.value)
@@ -1,61 +1,41 @@
 from functools import partial, wraps
-from typing import Type
-
-from pygments import highlight as pygments_highlight
-from pygments.formatters import TerminalTrueColorFormatter
-from pygments.lexer import Lexer
-from pygments.lexers import (
-    AutohotkeyLexer,
-    BashLexer,
-    CssLexer,
-    DockerLexer,
-    HtmlLexer,
-    IniLexer,
-    JavascriptLexer,
-    JsonLexer,
-    MarkdownLexer,
-    MySqlLexer,
-    PostgresLexer,
-    PythonLexer,
-    RstLexer,
-    SassLexer,
-    SqlLexer,
-    TOMLLexer,
-    TypeScriptLexer,
-    YamlLexer,
-)
+from typing import TYPE_CHECKING
 
 from termwiki import consts
 from termwiki.common.types import Language, PageFunction, Style
-from termwiki.ipython_lexer import IPython3Lexer
+
+if TYPE_CHECKING:
+    from pygments.formatters import TerminalTrueColorFormatter
+    from pygments.lexer import Lexer
 
 # https://help.farbox.com/pygments.html     <- previews of all styles
 
-formatters: dict[Style, TerminalTrueColorFormatter] = dict.fromkeys(consts.STYLES)
-lexer_classes: dict[Language, Type[Lexer]] = {
-    "ahk": AutohotkeyLexer,
-    "bash": BashLexer,
-    "css": CssLexer,
-    "docker": DockerLexer,
-    "html": HtmlLexer,
-    "ini": IniLexer,
-    "ipython": IPython3Lexer,
-    "js": JavascriptLexer,
-    "json": JsonLexer,
-    "md": MarkdownLexer,
-    "markdown": MarkdownLexer,
-    "mysql": MySqlLexer,
-    "pql": PostgresLexer,
-    "python": PythonLexer,
-    "rst": RstLexer,
-    "sass": SassLexer,
-    "sql": SqlLexer,
-    "toml": TOMLLexer,
-    "ts": TypeScriptLexer,
-    "yaml": YamlLexer,
-    "zsh": BashLexer,
+# pygments.lexers and pygments.formatters are imported on first highlight, not on startup.
+formatters: dict[Style, "TerminalTrueColorFormatter"] = dict.fromkeys(consts.STYLES)
+lexer_classes: dict[Language, str] = {
+    "ahk": "AutohotkeyLexer",
+    "bash": "BashLexer",
+    "css": "CssLexer",
+    "docker": "DockerLexer",
+    "html": "HtmlLexer",
+    "ini": "IniLexer",
+    "ipython": "termwiki.ipython_lexer:IPython3Lexer",
+    "js": "JavascriptLexer",
+    "json": "JsonLexer",
+    "md": "MarkdownLexer",
+    "markdown": "MarkdownLexer",
+    "mysql": "MySqlLexer",
+    "pql": "PostgresLexer",
+    "python": "PythonLexer",
+    "rst": "RstLexer",
+    "sass": "SassLexer",
+    "sql": "SqlLexer",
+    "toml": "TOMLLexer",
+    "ts": "TypeScriptLexer",
+    "yaml": "YamlLexer",
+    "zsh": "BashLexer",
 }
-lexers: dict[Language, Lexer] = dict.fromkeys(consts.LANGUAGES)
+lexers: dict[Language, "Lexer"] = dict.fromkeys(consts.LANGUAGES)
 assert set(lexers) == set(lexer_classes), (
     "lexers and lexer_classes must have same keys. missing in either or both:"
     f" {set(lexers) ^ set(lexer_classes)}"
@@ -63,16 +43,24 @@ assert set(lexers) == set(lexer_classes), (
 
 
 # *** Helper Functions
-def _get_lexer(lang: Language) -> Lexer:
+def _import_lexer_class(lexer_class_path: str) -> type["Lexer"]:
+    import importlib
+
+    module_name, _, class_name = lexer_class_path.rpartition(":")
+    module = importlib.import_module(module_name or "pygments.lexers")
+    return getattr(module, class_name)
+
+
+def _get_lexer(lang: Language) -> "Lexer":
     lexer = lexers.get(lang)
     if lexer is None:
-        lexer_class = lexer_classes[lang]
+        lexer_class = _import_lexer_class(lexer_classes[lang])
         lexer = lexer_class()
         lexers[lang] = lexer
     return lexers[lang]
 
 
-def _get_color_formatter(style: Style) -> TerminalTrueColorFormatter:
+def _get_color_formatter(style: Style) -> "TerminalTrueColorFormatter":
     # default
     # friendly (less bright than native. ipython default)
     # native (like defualt with dark bg)
@@ -83,6 +71,8 @@ def _get_color_formatter(style: Style) -> TerminalTrueColorFormatter:
     # fruity
     formatter = formatters.get(style)
     if formatter is None:
+        from pygments.formatters import TerminalTrueColorFormatter
+
         formatter = TerminalTrueColorFormatter(style=style)
         formatters[style] = formatter
         return formatter
@@ -93,6 +83,8 @@ def syntax_highlight(text: str, lang: Language, style: Style = None) -> str:
     if lang in ("md", "markdown"):
         return highlight_markdown(text)
 
+    from pygments import highlight as pygments_highlight
+
     lexer: Lexer = _get_lexer(lang)
     if not style:
         if lang == "js":
@@ -1,36 +1,60 @@
+import functools
+import heapq
 import logging
 import re
-from collections import defaultdict
 from typing import (
     Callable,
     Collection,
+    Container,
     Dict,
     Generator,
     Generic,
     List,
     Literal,
+    NamedTuple,
     Optional,
+    Pattern,
+    Sequence,
     Tuple,
     TypeVar,
 )
 
-from fuzzysearch import find_near_matches
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    # Optional: without it, fuzzy() computes the same distances one name at a time
+    np = None
 
 T = TypeVar("T")
 
+NAMES_CHUNK_SIZE = 8192
+"""How many names fuzzy() scores per vectorized pass, to bound memory."""
+
+PURE_PYTHON_MAX_NAMES = 10_000
+"""Without NumPy, how many names fuzzy() scores (one at a time: 80k names take seconds)."""
+
 SearchCriteria = Literal["substring", "equals", "startswith", "endswith"]
 
 
 class Matches(Generic[T]):
+    """
+    The best (lowest scoring) `maxsize` items appended, kept in a bounded heap whose top is
+    the worst one, so appending is O(log maxsize). Ties are stable: among equal scores,
+    the items appended first are kept, and listed first.
+    """
+
     def __init__(self, *, maxsize):
-        self.count = 0
-        self.matches: Dict[float, List[T]] = defaultdict(list)
-        self.worst_score = 0
+        self._heap: List[Tuple[float, int, T]] = []
+        """(-score, -appended index, item), so heap[0] is the worst and latest."""
+        self._appended_count = 0
         self.best_score = 999
         self._maxsize = maxsize
 
     def __bool__(self):
-        return bool(self.matches)
+        return bool(self._heap)
+
+    def __len__(self):
+        return len(self._heap)
 
     def __repr__(self):
         matches_repr = ""
@@ -39,53 +63,47 @@ class Matches(Generic[T]):
         return f"""Matches() ({self.count}) | best: {self.best_score} | worst: {self.worst_score}
     {matches_repr}"""
 
-    def _reset_stats(self):
-        # don't update best_score because we're called after discarding only worst scores
-        # print(paint.faint(f'Matches._reset_stats() beforehand: worst {self.worst_score}, count {self.count}'))
+    @property
+    def count(self) -> int:
+        return len(self._heap)
 
-        self.worst_score = 0
-        self.count = 0
-        for score, candidates in self.matches.items():
-            if score > self.worst_score:
-                self.worst_score = score
-            self.count += len(candidates)
+    @property
+    def worst_score(self) -> float:
+        return -self._heap[0][0] if self._heap else 0
+
+    @property
+    def matches(self) -> Dict[float, List[T]]:
+        """The items by score, best score first."""
+        matches = {}
+        for score, item in self.sorted():
+            matches.setdefault(score, []).append(item)
+        return matches
+
+    def sorted(self) -> List[Tuple[float, T]]:
+        """(score, item) pairs, best first, in the order they were appended within a score."""
+        entries = sorted(self._heap, key=lambda entry: (-entry[0], -entry[1]))
+        return [(-negative_score, item) for negative_score, _, item in entries]
 
     def append(self, item: T, score: float):
         # lower score is better
-        if self.count < self._maxsize:
-            # * below maxsize
-            if score > self.worst_score:
-                self.worst_score = score
-            if score < self.best_score:
-                self.best_score = score
-            self.matches[score].append(item)
-            self.count += 1
-            return
-
-        # * reached maxsize
-        if score == self.worst_score:
-            # even if reached max size, append item to [worst_score] because no way to decide what to discard
-            self.matches[self.worst_score].append(item)
-            self.count += 1
+        entry = (-score, -self._appended_count, item)
+        self._appended_count += 1
+        if len(self._heap) < self._maxsize:
+            heapq.heappush(self._heap, entry)
+        elif score < self.worst_score:
+            # better than worst: the worst (the latest of them, if tied) makes room
+            heapq.heapreplace(self._heap, entry)
+        else:
+            # as bad as the worst or worse: the ones that were there first stay
             return
-
-        if score < self.worst_score:
-            # better than worst; discard worst candidates, add current item
-            del self.matches[self.worst_score]
-            self.matches[score].append(item)
-            if score < self.best_score:
-                self.best_score = score
-            self._reset_stats()
-
-        # score is worst than worst: don't let in
+        if score < self.best_score:
+            self.best_score = score
 
     def best(self) -> Optional[List[T]]:
-        if not self.matches:
+        if not self._heap:
             logging.debug(f"no self.matches -> returning None")
             return None
-        ret = self.matches[self.best_score]
-        # print(paint.faint(f'Matches.best() -> {len(ret)} matches with score: {self.best_score}'))
-        return ret
+        return [item for score, item in self.sorted() if score == self.best_score]
 
 
 def _create_is_maybe_predicate(criterion: SearchCriteria) -> Callable[[str, str], bool]:
@@ -104,10 +122,129 @@ def _create_is_maybe_predicate(criterion: SearchCriteria) -> Callable[[str, str]
     return is_maybe
 
 
-def fuzzy(keyword: str, collection: Collection[T], cutoff=2) -> Matches[T]:
+class _EncodedNames(NamedTuple):
+    order: "np.ndarray"
+    """Indices of the names, shortest name first, so chunks of rows have similar widths."""
+    lengths: "np.ndarray"
+    """Name lengths, in 'order'."""
+    code_points: "np.ndarray"
+    """(names, longest name) uint32 matrix of code points, rows in 'order', padded with 0."""
+
+
+@functools.lru_cache(maxsize=4)
+def _encode_names(names: Tuple[str, ...]) -> _EncodedNames:
+    """Cached, since the same names are searched for every keyword."""
+    lengths = np.fromiter(map(len, names), dtype=np.int64, count=len(names))
+    order = np.argsort(lengths, kind="stable")
+    width = int(lengths.max(initial=0))
+    padded_names = "".join(names[i].ljust(width, "\0") for i in order)
+    code_points = np.frombuffer(padded_names.encode("utf-32-le"), dtype=np.uint32)
+    return _EncodedNames(order, lengths[order], code_points.reshape(len(names), width))
+
+
+def _substring_distances(keyword: str, names: Sequence[str]) -> Tuple[List[int], List[int]]:
+    """
+    For each name, the edit distance between keyword and the closest substring of name,
+    and that substring's length (Sellers' algorithm). Among equally close substrings,
+    the one that ends first wins, then the shortest.
+    Vectorized over all names if NumPy is installed. Otherwise only the first
+    PURE_PYTHON_MAX_NAMES are scored, and the rest are as far as can be.
+    """
+    if np is None:
+        if len(names) > PURE_PYTHON_MAX_NAMES:
+            logging.warning(
+                "Fuzzy searching only the first %d of %d names; install termwiki[numpy] to search all",
+                PURE_PYTHON_MAX_NAMES,
+                len(names),
+            )
+        distances, match_lengths = [], []
+        for name in names[:PURE_PYTHON_MAX_NAMES]:
+            distance, match_length = _substring_distance(keyword, name)
+            distances.append(distance)
+            match_lengths.append(match_length)
+        # Deleting all of keyword matches the empty substring of any name
+        unscored_count = len(names) - len(distances)
+        distances.extend([len(keyword)] * unscored_count)
+        match_lengths.extend([0] * unscored_count)
+        return distances, match_lengths
+
+    encoded_names = _encode_names(tuple(names))
+    keyword_code_points = [ord(char) for char in keyword]
+    distances = np.empty(len(names), dtype=np.int64)
+    match_lengths = np.empty(len(names), dtype=np.int64)
+    for chunk_start in range(0, len(names), NAMES_CHUNK_SIZE):
+        chunk = slice(chunk_start, chunk_start + NAMES_CHUNK_SIZE)
+        lengths = encoded_names.lengths[chunk]
+        code_points = encoded_names.code_points[chunk, : int(lengths[-1])]
+        chunk_distances, chunk_match_lengths = _vectorized_substring_distances(
+            keyword_code_points, code_points, lengths
+        )
+        distances[encoded_names.order[chunk]] = chunk_distances
+        match_lengths[encoded_names.order[chunk]] = chunk_match_lengths
+    return distances.tolist(), match_lengths.tolist()
+
+
+def _vectorized_substring_distances(
+    keyword_code_points: List[int], code_points: "np.ndarray", lengths: "np.ndarray"
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    _substring_distance for each row of code_points, one keyword character per pass.
+    Each cell packs (distance, start of the substring) in one integer, so that taking
+    the minimum prefers the smaller distance, then the later start. The row recurrence's
+    dependency on the cell to the left is a running minimum along the row.
+    """
+    rows, width = code_points.shape
+    base = width + 2
+    columns = np.arange(width + 1, dtype=np.int64)
+    column_offsets = columns * base
+    # No keyword characters: distance 0 to the empty substring starting at each column
+    keys = np.broadcast_to(base - 1 - columns, (rows, width + 1)).copy()
+    for i, keyword_code_point in enumerate(keyword_code_points, start=1):
+        costs = (code_points != keyword_code_point) * base
+        candidates = np.empty_like(keys)
+        candidates[:, 0] = i * base + base - 1
+        np.minimum(keys[:, :-1] + costs, keys[:, 1:] + base, out=candidates[:, 1:])
+        keys = np.minimum.accumulate(candidates - column_offsets, axis=1) + column_offsets
+    keys[columns > lengths[:, None]] = np.iinfo(np.int64).max
+    ends = keys.argmin(axis=1)
+    best_keys = keys[np.arange(rows), ends]
+    starts = base - 1 - best_keys % base
+    return best_keys // base, ends - starts
+
+
+def _substring_distance(keyword: str, name: str) -> Tuple[int, int]:
+    """See _substring_distances. Cells are (distance, -start)."""
+    previous_row = [(0, -j) for j in range(len(name) + 1)]
+    for i, keyword_char in enumerate(keyword, start=1):
+        row = [(i, 0)]
+        for j, name_char in enumerate(name, start=1):
+            diagonal_distance, diagonal_start = previous_row[j - 1]
+            up_distance, up_start = previous_row[j]
+            left_distance, left_start = row[j - 1]
+            row.append(
+                min(
+                    (diagonal_distance + (keyword_char != name_char), diagonal_start),
+                    (up_distance + 1, up_start),
+                    (left_distance + 1, left_start),
+                )
+            )
+        previous_row = row
+    end = min(range(len(previous_row)), key=previous_row.__getitem__)
+    distance, negative_start = previous_row[end]
+    return distance, end + negative_start
+
+
+def fuzzy(
+    keyword: str, collection: Collection[T], cutoff=2, *, exclude: Container[T] = ()
+) -> Matches[T]:
     """
     Returns a `Matches` instance, or None if nothing matched.
     Doesn't prompt.
+    Items whose closest substring is within a bounded edit distance of keyword (but isn't
+    an exact match) are scored by that distance, minus how much of the item it covers;
+    the best scoring below cutoff are near matches, the rest far matches.
+    Items in `exclude` aren't matched, but are still encoded with the rest of collection,
+    so its cached encoding is reused.
     """
     if not keyword or re.fullmatch(r'[\'"]+', keyword):  # only quotes
         msg = f"fuzzy({keyword = !r}): bad keyword"
@@ -119,53 +256,23 @@ def fuzzy(keyword: str, collection: Collection[T], cutoff=2) -> Matches[T]:
     far_matches = Matches(maxsize=5)
     max_l_dist = min(len(keyword) - 1, 17)
     # TODO: sometimes cutoff == max_l_dist
-    coll_len = len(collection)
+    items = list(collection)
     logging.debug(
         f"fuzzy(%r, collection (%d), cutoff = %s, max_l_dist = %d)",
         keyword,
-        coll_len,
+        len(items),
         cutoff,
         max_l_dist,
     )
-    printed_progress = -1
-    for i, item in enumerate(collection):
-        progress = round(i / coll_len, 1)
-        if progress > printed_progress:
-            logging.debug(
-                f"%d% (near_matches.count: %d, far_matches.count: %d)",
-                near_matches.count,
-                far_matches.count,
-                progress * 100,
-            )
-            if near_matches.count ^ far_matches.count:
-                # exactly one is Truthy
-                coll = next(filter(bool, [near_matches, far_matches]))
-                logging.debug(repr(coll))
-            printed_progress = progress
-        matches = find_near_matches(keyword, item, max_l_dist=max_l_dist)
-        # don't `continue` even if matches is empty
-        # lower distance is better
-        dists_sum = 0
-        # dists = []
-        match_lengths = 0
-        match_count = 0
-        for m in matches:
-            dists_sum += m.dist
-            # dists.append(m.dist)
-            match_lengths += len(m.matched)
-            match_count += 1
-        if not dists_sum:
+    distances, match_lengths = _substring_distances(keyword, items)
+    for item, distance, match_length in zip(items, distances, match_lengths, strict=True):
+        # lower distance is better. 0 is an exact match, which isn't fuzzy
+        if not 0 < distance <= max_l_dist or item in exclude:
             continue
-
-        # dist_score = sum(dists) / len(dists)
-        dist_score = dists_sum / match_count
-        avg_match_length = match_lengths / match_count
-        relative_factor = avg_match_length / len(item)
+        relative_factor = match_length / len(item)
         relative_factor = -round(-relative_factor - (-relative_factor % 0.2), 2)  # round up
-        # relative_factor = 1 + (dist_score / len(item))
-        # score = dist_score * relative_factor
 
-        score = dist_score - relative_factor
+        score = distance - relative_factor
         if score >= cutoff:
             # * not so good (above cutoff): put into far_matches if within cutoff+1
             far_matches.append(item, score)
@@ -189,14 +296,36 @@ def fuzzy(keyword: str, collection: Collection[T], cutoff=2) -> Matches[T]:
     return far_matches
 
 
+@functools.lru_cache(maxsize=128)
+def _separator_insensitive_pattern(keyword: str) -> Pattern:
+    """
+    Matches keyword regardless of word separators ('foo_bar' matches 'foo-bar', 'foobar'...).
+    keyword may be a regexp: if the separators can't be made optional in it (e.g. 'foo.*bar'),
+    it's used as is. Otherwise, if it doesn't compile, it's matched literally.
+    """
+    try:
+        return re.compile(re.sub(r"[-_./ ]", r"[-_./ ]?", keyword), re.IGNORECASE)
+    except re.error:
+        from termwiki.regexp import has_regex
+
+        if has_regex(keyword):
+            return re.compile(keyword, re.IGNORECASE)
+        literal_parts = map(re.escape, re.split(r"[-_./ ]", keyword))
+        return re.compile("[-_./ ]?".join(literal_parts), re.IGNORECASE)
+
+
 def iter_maybes(
     keyword: str, collection: Collection[T], *extra_options, criterion: SearchCriteria = "substring"
-) -> Generator[Tuple[List[T], bool], None, None]:
+) -> Generator[Tuple[Optional[List[T]], bool], None, None]:
     """
-    Doesn't prompt. Yields three `[matches...], is_last` tuples.
+    Doesn't prompt. Yields up to three `[matches...], is_last` tuples, each without
+    items of the previous ones:
     1st: str method by `criterion`
-    2nd: re.search ignoring word separators
-    3rd: fuzzy search (what `nearest()` uses directly)"""
+    2nd: re.search ignoring word separators (only if it found anything)
+    3rd: fuzzy search (what `nearest()` uses directly), or None if nothing matched.
+    The 1st and 2nd are classified in one pass over collection; the fuzzy search only
+    runs if the 3rd is asked for.
+    """
     is_maybe = _create_is_maybe_predicate(criterion)
 
     logging.debug(
@@ -209,49 +338,37 @@ def iter_maybes(
     )
     if extra_options:
         logging.warning(f"Got extra_options, ignored because not developed: %r", extra_options)
-    maybes = [item for item in collection if is_maybe(item, keyword)]
+    regexp = _separator_insensitive_pattern(keyword)
+    maybes = []
+    separator_insensitive_maybes = []
+    seen = set()
+    for item in collection:
+        if item in seen:
+            continue
+        seen.add(item)
+        if is_maybe(item, keyword):
+            maybes.append(item)
+        elif regexp.search(item):
+            separator_insensitive_maybes.append(item)
     logging.debug(
         f"Yielding %d maybes that are True for `is_maybe(item, keyword = %r)`", len(maybes), keyword
     )
     yield maybes, False
 
-    regexp = None
-    try:
-        regexp_str = re.sub(r"[-_./ ]", r"[-_./ ]?", keyword)
-        regexp = re.compile(regexp_str, re.IGNORECASE)
-    except re.error:
-        # compilation failed, probaby keyword is itself a regexp
-        from termwiki.regexp import has_regex
-
-        if has_regex(keyword):
-            regexp = re.compile(keyword, re.IGNORECASE)
-
-    if regexp is not None:
-        new_maybes = []
-        for item in collection:
-            if regexp.search(item) and item not in maybes:
-                new_maybes.append(item)
-        if new_maybes and new_maybes != maybes:
-            logging.debug(
-                (
-                    f"regexp isn't None (%r) and searching resulted in different maybes. yielding"
-                    f" %d new maybes"
-                ),
-                regexp,
-                len(new_maybes),
-            )
-            yield new_maybes, False
+    if separator_insensitive_maybes:
+        logging.debug(
+            f"Yielding %d maybes that match %r", len(separator_insensitive_maybes), regexp
+        )
+        yield separator_insensitive_maybes, False
 
-    near_matches = fuzzy(keyword, collection)
+    yielded = set(maybes)
+    yielded.update(separator_insensitive_maybes)
+    near_matches = fuzzy(keyword, collection, exclude=yielded)
     if near_matches:
         logging.debug(
             f"Last stop: yielding `(near_matches.best(), True)`. near_matches = %r", near_matches
         )
         yield near_matches.best(), True
     else:
-        logging.warning(
-            f"near_matches is None for fuzzy(%r, collection (%d)). Will throw AttributeError",
-            keyword,
-            len(collection),
-        )
+        logging.warning(f"No near_matches for fuzzy(%r, collection (%d))", keyword, len(collection))
         yield None, True
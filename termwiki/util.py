@@ -1,5 +1,10 @@
 import importlib
+import importlib.util
 import re
+import sys
+import threading
+from pathlib import Path
+from types import ModuleType
 from typing import Callable, Generic, Sized, Type, TypeVar
 
 from termwiki.consts import COLOR_RE
@@ -64,7 +69,8 @@ def lazy_import(importer_name: str, to_import):
 
     to_import is an iterable of the modules to be potentially imported (absolute
     or relative). The `as` form of importing is also supported,
-    e.g. `pkg.mod as spam`.
+    e.g. `pkg.mod as spam`. So is importing an attribute of a module, with a colon,
+    e.g. `pkg.mod:spam`.
 
     This function returns a tuple of two items. The first is the importer
     module for easy reference within itself. The second item is a callable to be
@@ -76,32 +82,146 @@ def lazy_import(importer_name: str, to_import):
         importing, _, binding = name.partition(" as ")
         if not binding:
             _, _, binding = importing.rpartition(".")
+            _, _, binding = binding.rpartition(":")
         import_mapping[binding] = importing
 
     def __getattr__(name):
         if name not in import_mapping:
             message = f"module {importer_name!r} has no attribute {name!r}"
             raise AttributeError(message)
-        importing = import_mapping[name]
+        importing, _, attribute = import_mapping[name].partition(":")
         # imortlib.import_module() implicitly sets submodules on this module as
         # appropriate for direct imports.
         imported = importlib.import_module(importing, module.__spec__.parent)
+        if attribute:
+            imported = getattr(imported, attribute)
         setattr(module, name, imported)
         return imported
 
     return module, __getattr__
 
 
+class LazyModule(ModuleType):
+    """
+    A proxy for the module 'name', which is imported on first attribute access.
+    Accessing a submodule that wasn't imported yet (e.g. a sub-package of a pages package)
+    returns a LazyModule for it too, so `lazy.foo.bar.baz` imports only `foo.bar`.
+
+    __path__ is known without importing, so the module's directory can be walked
+    without executing any of it.
+    """
+
+    def __init__(self, name: str, path: Path | None = None) -> None:
+        super().__init__(name)
+        if path is None:
+            # Finds the module without executing it (parent packages are imported though)
+            spec = importlib.util.find_spec(name)
+            if spec.submodule_search_locations:
+                path = Path(spec.submodule_search_locations[0])
+            else:
+                path = Path(spec.origin)
+        if path.is_dir():
+            self.__path__ = [str(path)]
+            self.__file__ = None
+        else:
+            self.__file__ = str(path)
+        self.__lazy_module__ = None
+
+    def __repr__(self) -> str:
+        state = "imported" if self.__lazy_module__ is not None else "not imported"
+        return f"<{self.__class__.__name__} {self.__name__!r} ({state})>"
+
+    def __getattr__(self, name: str):
+        if name.startswith("__") and name.endswith("__"):
+            raise AttributeError(name)
+        if self.__lazy_module__ is None:
+            if hasattr(self, "__path__"):
+                submodule = self._lazy_submodule(name)
+                if submodule is not None:
+                    setattr(self, name, submodule)
+                    return submodule
+            self.__lazy_module__ = importlib.import_module(self.__name__)
+        return getattr(self.__lazy_module__, name)
+
+    def _lazy_submodule(self, name: str) -> ModuleType | None:
+        submodule_name = f"{self.__name__}.{name}"
+        if submodule_name in sys.modules:
+            return sys.modules[submodule_name]
+        submodule_path = Path(self.__path__[0], name)
+        if submodule_path.is_dir():
+            return LazyModule(submodule_name, submodule_path)
+        if submodule_path.with_suffix(".py").is_file():
+            return LazyModule(submodule_name, submodule_path.with_suffix(".py"))
+        return None
+
+
+class _InFlight:
+    """A cached_property value that's being computed by 'thread'."""
+
+    __slots__ = ("done", "error", "thread", "value")
+
+    def __init__(self) -> None:
+        self.thread = threading.get_ident()
+        self.done = threading.Event()
+        self.value = None
+        self.error: BaseException | None = None
+
+    def wait(self, name: str):
+        if self.thread == threading.get_ident():
+            msg = f"{name} was accessed while computing it"
+            raise RuntimeError(msg)
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+_MISSING = object()
+_in_flight_lock = threading.Lock()
+
+
 class cached_property(Generic[T]):
+    """
+    Computed once per instance, and stored in the instance's '_<name>' attribute, which
+    can be a __slots__ slot, so instances don't need a __dict__.
+    If several threads get it at the same time, the first one computes it,
+    and the others wait for its value.
+    """
+
     instance: T
 
     # method: Callable[[T, ParamSpec], ReturnType]
 
     def __init__(self, method: Callable[..., ReturnType]):
         self.method = method
+        self.name = method.__name__
+        self.attribute_name = f"_{self.name}"
 
     def __get__(self, instance: T, cls: Type[T]) -> ReturnType:
         if instance is None:
             return self
-        value = instance.__dict__[self.method.__name__] = self.method(instance)
-        return value
+        value = getattr(instance, self.attribute_name, _MISSING)
+        if value is not _MISSING and type(value) is not _InFlight:
+            return value
+        # Held only to claim the computation, not while computing
+        with _in_flight_lock:
+            value = getattr(instance, self.attribute_name, _MISSING)
+            computing = value is _MISSING
+            if computing:
+                value = _InFlight()
+                setattr(instance, self.attribute_name, value)
+        if type(value) is not _InFlight:
+            return value
+        if not computing:
+            return value.wait(f"{instance!r}.{self.name}")
+        try:
+            value.value = self.method(instance)
+        except BaseException as e:
+            # Not cached, so the next get tries again
+            delattr(instance, self.attribute_name)
+            value.error = e
+            raise
+        finally:
+            value.done.set()
+        setattr(instance, self.attribute_name, value.value)
+        return value.value
@@ -1,30 +1,91 @@
-from collections.abc import Mapping
-
+import ast
+import functools
+import importlib
+from collections.abc import Callable, Generator, Mapping
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import pytest
 from _pytest.config import Config
+from _pytest.config.argparsing import Parser
 from _pytest.reports import CollectReport, TestReport
 
-from termwiki.log import NON_INTERACTIVE_WIDTH
+from termwiki import consts
+from termwiki.consts import NON_INTERACTIVE_WIDTH
+from termwiki.page import ast_cache
 
 # homedir = os.path.expanduser('~')
 # if homedir not in sys.path:
 #     sys.path.append(homedir)
 
 
-# def pytest_addoption(parser: Parser):
-#     parser.addoption("--skip-slow", action="store_true", default=False, help="Skip slow tests")
-#
-#
-# def pytest_configure(config: Config):
-#     config.addinivalue_line("markers", "slow: mark test as slow to run")
-#
-#
-# def pytest_collection_modifyitems(config: Config, items):
-#     if not config.getoption("--skip-slow"):
-#         return
-#     skip_slow = pytest.mark.skip(reason="Specified --skip-slow")
-#     for item in items:
-#         if "slow" in item.keywords:
-#             item.add_marker(skip_slow)
+def pytest_addoption(parser: Parser):
+    parser.addoption("--benchmark", action="store_true", default=False, help="Run benchmarks")
+
+
+def pytest_configure(config: Config):
+    config.addinivalue_line("markers", "benchmark: timing test, only run with --benchmark")
+
+
+def pytest_collection_modifyitems(config: Config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="Specify --benchmark to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_cache_dir(tmp_path_factory) -> Generator[Path]:
+    """
+    Keeps the tests out of the developer's cache. The caches that were already created
+    when test modules were imported (ast_cache, page_tree's index) are pointed at it too.
+    """
+    cache_dir = tmp_path_factory.mktemp("cache")
+    page_tree_module = importlib.import_module("termwiki.page.page_tree")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("TERMWIKI_CACHE_DIR", str(cache_dir))
+        monkeypatch.setattr(consts, "CACHE_DIR_PATH", cache_dir)
+        monkeypatch.setattr(ast_cache.ast_cache, "cache_dir", cache_dir / "ast")
+        monkeypatch.setattr(page_tree_module.page_tree.index, "cache_dir", cache_dir)
+        yield cache_dir
+
+
+class SpyCall(NamedTuple):
+    args: tuple
+    kwargs: dict[str, Any]
+
+
+Spy = Callable[[object, str], list[SpyCall]]
+
+
+@pytest.fixture
+def spy(monkeypatch) -> Spy:
+    """
+    spy(target, name) wraps target.name (a function, or a method if target is a class)
+    so it records its calls, and returns the list they're recorded in.
+    """
+
+    def spy(target: object, name: str) -> list[SpyCall]:
+        calls = []
+        original = getattr(target, name)
+
+        @functools.wraps(original)
+        def recording(*args, **kwargs):
+            calls.append(SpyCall(args, kwargs))
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(target, name, recording)
+        return calls
+
+    return spy
+
+
+@pytest.fixture
+def parsed_sources(spy) -> list[SpyCall]:
+    """The calls to ast.parse, whose first argument is the parsed source."""
+    return spy(ast, "parse")
 
 
 def pytest_report_teststatus(
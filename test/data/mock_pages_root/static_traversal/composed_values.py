@@ -0,0 +1,23 @@
+"""Values composed of other local variables."""
+
+
+def composed():
+    greeting = "hello"
+    composed_greeting = f"{greeting} world"
+
+
+evaluations = []
+
+
+def _counted(value):
+    evaluations.append(value)
+    return value
+
+
+def chain():
+    _BASE = _counted("base")
+    _DOUBLE = f"{_BASE} {_BASE}"
+    _QUADRUPLE = f"{_DOUBLE} {_DOUBLE}"
+    _OCTUPLE = f"{_QUADRUPLE} {_QUADRUPLE}"
+    _UNRELATED = _counted("unrelated")
+    return f"{_OCTUPLE}"
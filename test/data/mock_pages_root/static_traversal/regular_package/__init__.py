@@ -0,0 +1 @@
+"""Traversing or searching this package shouldn't import it."""
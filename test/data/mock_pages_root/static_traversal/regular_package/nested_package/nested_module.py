@@ -0,0 +1,2 @@
+def nested_function():
+    return "nested function"
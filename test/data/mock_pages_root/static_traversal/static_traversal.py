@@ -0,0 +1,16 @@
+"""Listing or searching the pages in this module shouldn't import it."""
+
+from termwiki.page.decorators import alias
+
+
+def _expensive_helper():
+    return "expensive"
+
+
+@alias("statically_aliased")
+def static_traversal():
+    cheap = "cheap"
+    expensive = f"{_expensive_helper()} value"
+
+
+module_level_constant = "module level constant"
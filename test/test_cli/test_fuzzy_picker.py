@@ -0,0 +1,107 @@
+"""
+The in-process fuzzy picker that cli.fuzzy_search uses instead of shelling out to fzf:
+ranking, incremental narrowing as the query grows, and the interactive key handling.
+"""
+
+import pytest
+
+from termwiki import cli, fuzzy_picker
+from termwiki.fuzzy_picker import FuzzyFilter, Picker
+
+PAGE_NAMES = ["restructuredtext", "sed", "argparse", "python", "pydantic", "validator", "sedx"]
+
+
+@pytest.fixture
+def match_calls(spy) -> list:
+    return spy(fuzzy_picker, "match")
+
+
+@pytest.mark.parametrize(
+    ("query", "expected_best"),
+    [("sed", "sed"), ("apars", "argparse"), ("pyd", "pydantic"), ("valid", "validator")],
+)
+def test_best_match(query, expected_best):
+    assert fuzzy_picker.filter_candidates(PAGE_NAMES, query)[0] == expected_best
+
+
+def test_ranking():
+    # Word starts and runs of consecutive characters beat scattered ones
+    assert fuzzy_picker.filter_candidates(["xaxbxc", "a_x_b_c", "abc_x"], "abc") == [
+        "abc_x",
+        "a_x_b_c",
+        "xaxbxc",
+    ]
+    # Ties go to the shorter candidate, then to the first one
+    assert fuzzy_picker.filter_candidates(["sedx", "sedy", "sed"], "sed") == ["sed", "sedx", "sedy"]
+    assert fuzzy_picker.filter_candidates(PAGE_NAMES, "qqq") == []
+    assert fuzzy_picker.match("SeD", "sed").positions == (0, 1, 2)
+
+
+def test_typing_narrows_previous_matches(match_calls):
+    fuzzy_filter = FuzzyFilter(PAGE_NAMES)
+    fuzzy_filter.set_query("s")
+    s_matches = [candidate for candidate, _ in fuzzy_filter.matches]
+    match_calls.clear()
+    fuzzy_filter.set_query("se")
+    assert [call.args[1] for call in match_calls] == s_matches
+
+    match_calls.clear()
+    fuzzy_filter.set_query("s")
+    assert match_calls == []
+    assert [candidate for candidate, _ in fuzzy_filter.matches] == s_matches
+
+    fuzzy_filter.set_query("pa")
+    assert {candidate for candidate, _ in fuzzy_filter.matches} == {"argparse", "pydantic"}
+
+
+def test_picker_keys():
+    picker = Picker(PAGE_NAMES, "se", header="se not found; did you mean...")
+    keys = fuzzy_picker.split_keys("d\x1b[B\x7f\x7f\x7fpyd\r")
+    assert keys[:2] == ["d", "\x1b[B"]
+    done = [picker.handle_key(key) for key in keys]
+    assert done == [False] * (len(keys) - 1) + [True]
+    assert picker.result == "pydantic"
+
+    picker = Picker(PAGE_NAMES, "sed")
+    assert not picker.handle_key("\x0e")
+    assert picker.selected == 1
+    assert picker.handle_key("\r")
+    assert picker.result == "sedx"
+
+    picker = Picker(PAGE_NAMES, "sed")
+    assert picker.handle_key("\x1b")
+    assert picker.result is None
+
+
+@pytest.mark.parametrize(
+    ("key", "name"),
+    [
+        ("\x1b[3~", "delete"),
+        ("\x1b[1;5A", "ctrl-up"),
+        ("\x1b[1;5D", "ctrl-left"),
+        ("\x1b[5~", "page up"),
+        ("\x1b[6~", "page down"),
+        ("\x1b[15~", "F5"),
+    ],
+)
+def test_multi_byte_escape_sequences_are_one_key(key, name):
+    assert fuzzy_picker.split_keys(f"s{key}e\x1bOB") == ["s", key, "e", "\x1b[B"], name
+    picker = Picker(PAGE_NAMES)
+    for typed_key in fuzzy_picker.split_keys(f"s{key}e"):
+        picker.handle_key(typed_key)
+    assert picker.query == "se"
+
+
+def test_render():
+    picker = Picker(PAGE_NAMES, "sed", header="header", height=1)
+    header, prompt, selected = picker.render()
+    assert header == "header"
+    assert prompt == f"> sed  3/{len(PAGE_NAMES)}"
+    assert selected.startswith("\x1b[7m>")
+    assert "\x1b[1ms\x1b[22m" in selected
+
+
+def test_non_interactive_fuzzy_search():
+    # pytest's stdin isn't a terminal
+    assert cli.fuzzy_search(iter(PAGE_NAMES), "apars") == "argparse"
+    assert cli.fuzzy_search(iter(PAGE_NAMES), "qqq") is None
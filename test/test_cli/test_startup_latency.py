@@ -0,0 +1,54 @@
+"""
+Cold start of `tw PAGE` must not import rich, pygments or click, and must fit in a time budget.
+The budget is in milliseconds, and can be set with TERMWIKI_STARTUP_BUDGET_MS.
+It's a benchmark, so it only runs with --benchmark.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parents[2]
+STARTUP_BUDGET_MS = float(os.getenv("TERMWIKI_STARTUP_BUDGET_MS", 200))
+IMPORTTIME_RE = re.compile(r"import time:\s+\d+ \|\s+(?P<cumulative>\d+) \| (?P<module>.+)$")
+
+
+def import_termwiki_cli() -> tuple[dict[str, int], list[str]]:
+    """Returns the cumulative import time in microseconds of each module, and sys.modules."""
+    code = "import sys, termwiki.cli\nprint(*sys.modules, sep='\\n')"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_import_times = {}
+    for line in result.stderr.splitlines():
+        if match := IMPORTTIME_RE.match(line):
+            cumulative_import_times[match["module"].strip()] = int(match["cumulative"])
+    return cumulative_import_times, result.stdout.splitlines()
+
+
+def test_does_not_import_rendering_dependencies():
+    _, imported_modules = import_termwiki_cli()
+    top_level_modules = {module_name.partition(".")[0] for module_name in imported_modules}
+    assert not top_level_modules & {"rich", "pygments", "click"}
+
+
+@pytest.mark.benchmark
+def test_startup_within_budget():
+    # Best of 3, so a busy machine doesn't fail the test
+    startup_times_ms = []
+    for _ in range(3):
+        cumulative_import_times, _ = import_termwiki_cli()
+        startup_times_ms.append(cumulative_import_times["termwiki.cli"] / 1000)
+    startup_time_ms = min(startup_times_ms)
+    assert startup_time_ms <= STARTUP_BUDGET_MS, (
+        f"'import termwiki.cli' took {startup_time_ms:.0f}ms,"
+        f" over the {STARTUP_BUDGET_MS:.0f}ms budget (TERMWIKI_STARTUP_BUDGET_MS)"
+    )
@@ -0,0 +1,94 @@
+"""
+AstCache: parsed page files and their extracted metadata, persisted by file content.
+"""
+
+import ast
+import inspect
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from termwiki.page import AstCache, ast_cache
+from test.data import mock_pages_root
+
+MOCK_PAGES_ROOT_PATH = Path(mock_pages_root.__path__[0])
+
+
+@pytest.fixture
+def python_file_path(tmp_path) -> Path:
+    python_file_path = tmp_path / "pages.py"
+    shutil.copy(MOCK_PAGES_ROOT_PATH / "pages.py", python_file_path)
+    return python_file_path
+
+
+def touch(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class TestParseFile:
+    def test_loads_without_parsing(self, tmp_path, python_file_path, parsed_sources):
+        python_module_ast = AstCache(tmp_path / "cache").parse_file(python_file_path)
+        assert len(parsed_sources) == 1
+        reloaded_ast = AstCache(tmp_path / "cache").parse_file(python_file_path)
+        assert len(parsed_sources) == 1
+        assert ast.dump(reloaded_ast) == ast.dump(python_module_ast)
+
+    def test_same_content_different_mtime(self, tmp_path, python_file_path, parsed_sources):
+        AstCache(tmp_path / "cache").parse_file(python_file_path)
+        touch(python_file_path)
+        AstCache(tmp_path / "cache").parse_file(python_file_path)
+        assert len(parsed_sources) == 1
+
+    def test_changed_content_is_reparsed(self, tmp_path, python_file_path, parsed_sources):
+        AstCache(tmp_path / "cache").parse_file(python_file_path)
+        with python_file_path.open("a") as f:
+            f.write('\n\ndef added():\n    return "added"\n')
+        touch(python_file_path)
+        python_module_ast = AstCache(tmp_path / "cache").parse_file(python_file_path)
+        assert len(parsed_sources) == 2
+        assert python_module_ast.body[-1].name == "added"
+        # The previous content's ast is evicted
+        assert len(list((tmp_path / "cache").glob("ast-*.pickle"))) == 1
+
+    def test_other_interpreters_cache_is_not_read(
+        self, tmp_path, python_file_path, parsed_sources, monkeypatch
+    ):
+        AstCache(tmp_path / "cache").parse_file(python_file_path)
+        monkeypatch.setattr(ast_cache, "INTERPRETER_TAG", "cpython-399")
+        AstCache(tmp_path / "cache").parse_file(python_file_path)
+        assert len(parsed_sources) == 2
+        assert len(list((tmp_path / "cache").glob("ast-cpython-399-*.pickle"))) == 1
+
+
+def test_file_metadata_is_extracted_once(tmp_path, python_file_path, parsed_sources):
+    def function_names(python_module_ast: ast.Module) -> list[str]:
+        return [node.name for node in python_module_ast.body if hasattr(node, "name")]
+
+    cached_function_names = AstCache(tmp_path / "cache").file_metadata(
+        python_file_path, "function_names", function_names
+    )
+    assert "no_return" in cached_function_names
+
+    def extract_again(_python_module_ast: ast.Module) -> list[str]:
+        raise AssertionError("metadata was extracted although the file didn't change")
+
+    reloaded_cache = AstCache(tmp_path / "cache")
+    reloaded_function_names = reloaded_cache.file_metadata(
+        python_file_path, "function_names", extract_again
+    )
+    assert reloaded_function_names == cached_function_names
+    assert len(parsed_sources) == 1
+    assert not reloaded_cache._asts, "metadata was cached, but the ast was loaded anyway"
+
+
+def test_parse_source_of_function(tmp_path):
+    from test.data.mock_pages_root.static_traversal import static_traversal
+
+    function = static_traversal.static_traversal
+    python_module_ast = AstCache(tmp_path / "cache").parse_source_of(function)
+    assert ast.dump(python_module_ast) == ast.dump(ast.parse(inspect.getsource(function)))
+    # Line numbers are relative to the file, not to the function's source
+    assert python_module_ast.body[0].lineno == inspect.getsourcelines(function)[1] + 1
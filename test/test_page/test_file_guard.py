@@ -0,0 +1,82 @@
+"""
+Binary files aren't read, and files larger than FILE_PAGE_MAX_BYTES are only streamed,
+so reading their directory doesn't load them into memory.
+"""
+
+from pathlib import Path
+
+import pytest
+
+import termwiki
+from termwiki import cli, consts
+from termwiki.page import BinaryFile, DirectoryPage, FilePage, FileTooLarge, NotRegularFile
+
+MAX_BYTES = 100
+
+
+@pytest.fixture(autouse=True)
+def max_bytes(monkeypatch):
+    monkeypatch.setattr(consts, "FILE_PAGE_MAX_BYTES", MAX_BYTES)
+
+
+@pytest.fixture
+def pages_root(tmp_path) -> Path:
+    (tmp_path / "notes.txt").write_text("notes")
+    (tmp_path / "large.txt").write_text("large\n" * MAX_BYTES)
+    (tmp_path / "nul.dat").write_bytes(b"text\0with a NUL")
+    (tmp_path / "elf").write_bytes(b"\x7fELF looks like text")
+    (tmp_path / "empty.txt").touch()
+    return tmp_path
+
+
+def test_binary_files_are_not_read(pages_root):
+    for name in ["nul.dat", "elf"]:
+        file_page = FilePage(pages_root / name)
+        assert file_page.is_binary
+        assert not file_page.readable
+        with pytest.raises(BinaryFile):
+            file_page.read()
+        with pytest.raises(BinaryFile):
+            next(file_page.stream())
+
+
+def test_large_files_are_only_streamed(pages_root):
+    file_page = FilePage(pages_root / "large.txt")
+    assert not file_page.is_binary
+    assert not file_page.readable
+    with pytest.raises(FileTooLarge):
+        file_page.read()
+    chunks = list(file_page.stream(chunk_size=MAX_BYTES))
+    assert len(chunks) == 6
+    assert "".join(chunks) == "large\n" * MAX_BYTES
+
+
+def test_non_regular_files_are_not_read(pages_root):
+    file_page = FilePage(pages_root)
+    assert not file_page.readable
+    with pytest.raises(NotRegularFile):
+        file_page.read()
+
+
+def test_show_unreadable_page(pages_root, monkeypatch, capsys):
+    file_page = FilePage(pages_root / "elf")
+    monkeypatch.setattr(cli, "get_page", lambda *_args: (["elf"], file_page))
+    with pytest.raises(SystemExit) as exit_info:
+        cli.show_page(("elf",))
+    assert exit_info.value.code == 1
+    assert capsys.readouterr().out == ""
+
+
+def test_directory_read_skips_unreadable_files(pages_root):
+    assert FilePage(pages_root / "notes.txt").readable
+    assert not FilePage(pages_root / "empty.txt").readable
+    assert DirectoryPage(pages_root).read() == "notes"
+
+
+@pytest.mark.skipif(
+    not (Path(termwiki.__path__[0]) / "fzf").is_file(), reason="no bundled fzf binary"
+)
+def test_bundled_binary():
+    fzf_page = DirectoryPage(Path(termwiki.__path__[0])).search("fzf")
+    assert fzf_page.is_binary
+    assert not fzf_page.readable
@@ -0,0 +1,50 @@
+"""The page tree is built, and the pages package imported, only when first accessed."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from termwiki.util import LazyModule
+from test.data import mock_pages_root
+
+PROJECT_ROOT = Path(__file__).parents[2]
+
+
+def test_import_termwiki_does_not_import_pages():
+    code = (
+        "import sys, termwiki\n"
+        "print(*(name for name in sys.modules if name.startswith('termwiki.p')), sep='\\n')"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=PROJECT_ROOT, text=True)
+    imported_modules = output.splitlines()
+    assert "termwiki.private_pages" not in imported_modules
+    assert "termwiki.page.page_tree" not in imported_modules
+
+
+def test_page_tree_is_built_on_first_access():
+    code = (
+        "import sys, termwiki\n"
+        "page_tree = termwiki.page_tree\n"
+        "print(type(page_tree).__name__)\n"
+        "print('termwiki.private_pages' in sys.modules)"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=PROJECT_ROOT, text=True)
+    assert output.splitlines()[-2:] == ["DirectoryPage", "False"]
+
+
+def test_lazy_module_imports_only_what_is_accessed():
+    package_name = "test.data.mock_pages_root.static_traversal.regular_package"
+    for module_name in list(sys.modules):
+        if module_name.startswith(package_name):
+            del sys.modules[module_name]
+    regular_package = LazyModule(package_name)
+    assert regular_package.__path__ == [
+        str(Path(mock_pages_root.__path__[0], "static_traversal", "regular_package"))
+    ]
+    nested_module = regular_package.nested_package.nested_module
+    assert isinstance(nested_module, LazyModule)
+    assert package_name not in sys.modules
+
+    assert nested_module.nested_function() == "nested function"
+    assert f"{package_name}.nested_package.nested_module" in sys.modules
+    assert regular_package.__lazy_module__ is None
@@ -0,0 +1,62 @@
+"""
+LocalsGraph: f-strings that reference other locals are evaluated with each local computed once.
+"""
+
+import ast
+import builtins
+from pathlib import Path
+from weakref import WeakKeyDictionary
+
+import pytest
+
+from termwiki.page import PythonFilePage, ast_utils
+from termwiki.page.ast_utils import LocalsGraph
+from test.data import mock_pages_root
+from test.data.mock_pages_root.static_traversal import composed_values
+
+COMPOSED_VALUES_PATH = Path(mock_pages_root.__path__[0]) / "static_traversal" / "composed_values.py"
+
+
+@pytest.fixture(autouse=True)
+def fresh_locals_graphs(monkeypatch):
+    """Evaluated locals are kept with each function's graph, so tests don't share them."""
+    monkeypatch.setattr(ast_utils, "_locals_graphs", WeakKeyDictionary())
+
+
+def test_topological_order():
+    function_def = ast.parse(
+        "def page():\n"
+        "    c = f'{b}{a}'\n"
+        "    a = 'a'\n"
+        "    b = f'{a}'\n"
+        "    cycle = f'{cycle}'\n"
+        "    unrelated = 'unrelated'\n"
+    ).body[0]
+    locals_graph = LocalsGraph(function_def)
+    assert locals_graph.dependencies["c"] == {"a", "b"}
+    order = locals_graph.topological_order(["c"])
+    assert set(order) == {"a", "b", "c"}
+    assert order.index("a") < order.index("b") < order.index("c")
+    assert locals_graph.topological_order(["cycle"]) == ["cycle"]
+    assert locals_graph.evaluate(["c"], {}) == {"a": "a", "b": "a", "c": "aa"}
+
+
+@pytest.mark.parametrize("static", [True, False], ids=["static", "dynamic"])
+def test_each_local_is_evaluated_once(static):
+    composed_values.evaluations.clear()
+    python_file_page = PythonFilePage(COMPOSED_VALUES_PATH, static=static)
+    octuple_page = python_file_page["chain"]["_OCTUPLE"]
+    assert octuple_page.read() == " ".join(["base"] * 8)
+    assert composed_values.evaluations == ["base"]
+
+
+@pytest.mark.parametrize("static", [True, False], ids=["static", "dynamic"])
+def test_reading_each_local_evaluates_it_once(static, spy):
+    composed_values.evaluations.clear()
+    chain_page = PythonFilePage(COMPOSED_VALUES_PATH, static=static)["chain"]
+    eval_calls = spy(builtins, "eval")
+    page_names = ["_BASE", "_DOUBLE", "_QUADRUPLE", "_OCTUPLE", "_UNRELATED"]
+    for page_name in page_names:
+        chain_page[page_name].read()
+    assert composed_values.evaluations == ["base", "unrelated"]
+    assert len(eval_calls) <= 2 * len(page_names)
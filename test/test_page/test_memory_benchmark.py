@@ -0,0 +1,112 @@
+"""
+Memory of a resident page tree, in bytes per node, for synthetic trees of 10k to 1M pages.
+It's a benchmark, so it only runs with --benchmark; the compactness checks always run.
+The budget can be overridden with TERMWIKI_MEMORY_BUDGET_BYTES_PER_NODE.
+"""
+
+import gc
+import os
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from termwiki.page import (
+    DirectoryPage,
+    FunctionPage,
+    Page,
+    PythonFilePage,
+    Traversable,
+    VariablePage,
+)
+from termwiki.page.ast_utils import normalize_page_name
+from termwiki.page.page import EMPTY_PAGES
+
+BYTES_PER_NODE_BUDGET = int(os.environ.get("TERMWIKI_MEMORY_BUDGET_BYTES_PER_NODE", 200))
+FAN_OUT = 10
+VALUE = "a variable's value"
+
+
+def build_tree(page_count: int) -> tuple[DirectoryPage, int]:
+    """
+    A root directory of directories, each with FAN_OUT Python files of FAN_OUT functions
+    of FAN_OUT variables (and one function without variables), like after traversing them.
+    Returns the root and the number of nodes.
+    """
+    root_path = Path("/synthetic")
+    root = DirectoryPage(root_path)
+    node_count = 1
+    directories = {}
+    while node_count < page_count:
+        directory_name = f"directory_{len(directories)}"
+        directory_path = root_path / directory_name
+        directory = DirectoryPage(directory_path)
+        python_files = {}
+        for python_file_index in range(FAN_OUT):
+            python_file = PythonFilePage(directory_path / f"python_file_{python_file_index}.py")
+            functions = {}
+            for function_index in range(FAN_OUT):
+                function = FunctionPage(python_file_page=python_file)
+                function.pages = {
+                    normalize_page_name(f"variable_{i}"): VariablePage(VALUE, f"variable_{i}")
+                    for i in range(FAN_OUT)
+                }
+                functions[normalize_page_name(f"function_{function_index}")] = function
+            functions["empty"] = FunctionPage(python_file_page=python_file)
+            python_file.pages = functions
+            python_files[normalize_page_name(f"python_file_{python_file_index}")] = python_file
+        directory.pages = python_files
+        directories[normalize_page_name(directory_name)] = directory
+        node_count += 1 + FAN_OUT * (1 + FAN_OUT + 1 + FAN_OUT * FAN_OUT)
+    root.pages = directories
+    return root, node_count
+
+
+def measure_bytes_per_node(page_count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        root, node_count = build_tree(page_count)
+        gc.collect()
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del root
+    return allocated / node_count
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("page_count", [10_000, 100_000, 1_000_000])
+def test_bytes_per_node(page_count):
+    bytes_per_node = measure_bytes_per_node(page_count)
+    assert bytes_per_node < BYTES_PER_NODE_BUDGET, (
+        f"{page_count:,} pages: {bytes_per_node:.0f} bytes per node"
+    )
+
+
+@pytest.mark.parametrize(
+    "page",
+    [
+        DirectoryPage(Path("/synthetic")),
+        PythonFilePage(Path("/synthetic.py")),
+        FunctionPage(),
+        VariablePage("value", "name"),
+    ],
+    ids=lambda page: page.kind,
+)
+def test_nodes_are_compact(page: Page):
+    assert not hasattr(page, "__dict__")
+    if isinstance(page, Traversable):
+        assert page._pages is EMPTY_PAGES
+
+
+def test_cached_properties_are_stored_in_slots():
+    evaluated_page = VariablePage(name="name", evaluate=lambda: "evaluated")
+    assert evaluated_page.readable
+    assert evaluated_page._readable is True
+    assert evaluated_page.read() == "evaluated"
+    assert evaluated_page._value == "evaluated"
+
+
+def test_names_are_interned():
+    assert normalize_page_name("Some_Name") is normalize_page_name("some name")
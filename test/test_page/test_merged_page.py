@@ -0,0 +1,98 @@
+"""
+MergedPage is a lazy view of its members: it's built without copying their sub-pages,
+searched and traversed through them, read with one read per member, and merging
+MergedPages flattens them.
+"""
+
+from pathlib import Path
+
+from termwiki.page import (
+    DirectoryPage,
+    FilePage,
+    FunctionPage,
+    MergedPage,
+    ReadOutcome,
+    VariablePage,
+)
+from test.data import mock_pages_root
+
+MOCK_PAGES_ROOT_PATH = Path(mock_pages_root.__path__[0])
+
+
+def test_same_name_pages_are_merged():
+    directory_page = DirectoryPage(MOCK_PAGES_ROOT_PATH)
+    probed_bash_page = directory_page.search("bash")
+    assert isinstance(probed_bash_page, MergedPage)
+    assert [type(member) for member in probed_bash_page.members] == [DirectoryPage, FunctionPage]
+    assert directory_page.sub_pages()["bash"] is probed_bash_page
+
+    traversed_bash_page = DirectoryPage(MOCK_PAGES_ROOT_PATH).sub_pages()["bash"]
+    assert repr(traversed_bash_page) == repr(probed_bash_page)
+
+
+def test_search_does_not_traverse_members():
+    bash_directory_page, bash_function_page = DirectoryPage(MOCK_PAGES_ROOT_PATH)["bash"].members
+    merged_page = MergedPage(bash_directory_page, bash_function_page)
+    assert merged_page.search("foo").read() == "pages.py bash() function"
+    assert not bash_function_page.__traverse_exhaused__
+    assert merged_page.search("xargs").read() == "bash.xargs"
+    assert not bash_function_page.__traverse_exhaused__
+    assert merged_page.search("nonexistent") is None
+
+
+def test_traverse_chains_members():
+    bash_page = DirectoryPage(MOCK_PAGES_ROOT_PATH)["bash"]
+    assert [name for name, _ in bash_page.traverse()] == ["compdef", "foo", "xargs"]
+    assert list(bash_page.sub_pages()) == ["compdef", "foo", "xargs"]
+    assert bash_page.pages == bash_page.sub_pages()
+
+
+def test_nested_merges_are_flattened():
+    first, second, third = (VariablePage(name, name) for name in ("first", "second", "third"))
+    nested_merged_page = MergedPage(MergedPage(first, second), third)
+    assert nested_merged_page.members == (first, second, third)
+    assert nested_merged_page.read() == "first\n\nsecond\n\nthird"
+
+    # Used to raise RuntimeError ("one of the sub-pages is a MergedPage!")
+    bash_page = DirectoryPage(MOCK_PAGES_ROOT_PATH)["bash"]
+    merged_bash_page = MergedPage(bash_page)
+    assert merged_bash_page.members == bash_page.members
+    merged_sub_pages = merged_bash_page.merge_sub_pages()
+    assert [type(member) for member in merged_sub_pages.members] == [
+        FilePage,
+        VariablePage,
+        VariablePage,
+    ]
+
+
+def test_members_are_read_once(tmp_path):
+    calls = []
+
+    def dynamic():
+        calls.append(None)
+        return "dynamic"
+
+    def broken():
+        calls.append(None)
+        raise ValueError("broken")
+
+    empty_file_path = tmp_path / "empty.md"
+    empty_file_path.touch()
+    merged_page = MergedPage(
+        FunctionPage(dynamic),
+        FunctionPage(broken),
+        FilePage(empty_file_path),
+        FilePage(tmp_path / "nonexistent.md"),
+        VariablePage("static", "static"),
+    )
+    assert merged_page.readable
+    assert calls == []
+    assert merged_page.read() == "dynamic\n\nstatic"
+    assert len(calls) == 2
+
+
+def test_try_read():
+    assert VariablePage("value", "name").try_read() == ReadOutcome("value")
+    text, error = FilePage("/nonexistent.md").try_read()
+    assert text is None
+    assert isinstance(error, FileNotFoundError)
@@ -0,0 +1,88 @@
+"""
+NameMap: recursive search in a tree without an index is a lookup in a name → pages map,
+built once, instead of merging sub-pages level by level.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from termwiki.page import DirectoryPage, MergedPage, NameMap, PageIndex, Traversable
+from test.data import mock_pages_root
+
+MOCK_PAGES_ROOT_PATH = Path(mock_pages_root.__path__[0])
+
+
+@pytest.fixture
+def build_calls(spy, monkeypatch) -> list:
+    def merge_sub_pages(self):
+        message = f"{self!r}.merge_sub_pages() was called"
+        raise AssertionError(message)
+
+    monkeypatch.setattr(Traversable, "merge_sub_pages", merge_sub_pages)
+    return spy(NameMap, "_build_next_level")
+
+
+def test_recursive_deep_search(build_calls):
+    directory_page = DirectoryPage(MOCK_PAGES_ROOT_PATH)
+    found_path, only_down_page = directory_page.deep_search("only_down", recursive=True)
+    assert found_path == ["pagebehavior", "onlydown"]
+    assert only_down_page.read() == "only_down"
+
+    found_path, composed_greeting_page = directory_page.deep_search(
+        "composed_values composed_greeting", recursive=True
+    )
+    assert found_path == ["statictraversal", "composedvalues", "composed", "composedgreeting"]
+    assert composed_greeting_page.read() == "hello world"
+
+    assert directory_page.deep_search("nonexistent", recursive=True) == ([], directory_page)
+    # One map, built level by level
+    assert {call.args[0] for call in build_calls} == {directory_page.name_map()}
+
+
+@pytest.mark.parametrize(
+    "page_name", ["only_down", "hard_to_reach", "diet", "readable", "composed_greeting"]
+)
+def test_resolves_like_index(tmp_path, page_name):
+    index = PageIndex(MOCK_PAGES_ROOT_PATH, cache_dir=tmp_path)
+    resolved_path, page = DirectoryPage(MOCK_PAGES_ROOT_PATH).name_map().resolve(page_name)
+    assert resolved_path == index.resolve(page_name, recursive=True)
+    pages = page.members if isinstance(page, MergedPage) else [page]
+    assert [page.kind for page in pages] == [entry.kind for entry in index.lookup(resolved_path)]
+
+
+def test_exact_match_beats_shallower_on_not_found_choice():
+    def on_not_found(page_names, _page_name):
+        on_not_found_calls.append(set(page_names))
+        return "onlydown" if "onlydown" in page_names else None
+
+    on_not_found_calls = []
+    tree_map = DirectoryPage(MOCK_PAGES_ROOT_PATH).name_map()
+    resolved_path, _ = tree_map.resolve("hard_to_reach", on_not_found=on_not_found)
+    assert resolved_path == ("differentname", "noselfnamedfiles", "differentname", "hardtoreach")
+    assert on_not_found_calls == []
+
+    # Out of max_depth, so on_not_found chooses, once, among all the levels' names
+    resolved_path, _ = tree_map.resolve("hard_to_reach", on_not_found=on_not_found, max_depth=3)
+    assert resolved_path == ("pagebehavior", "onlydown")
+    assert len(on_not_found_calls) == 1
+    assert "hardtoreach" not in set.union(*on_not_found_calls)
+
+
+def test_find_lists_shallowest_first():
+    entries = DirectoryPage(MOCK_PAGES_ROOT_PATH).name_map().find("only_down")
+    assert [path for path, _ in entries] == sorted((path for path, _ in entries), key=len)
+    assert entries[0][0] == ("pagebehavior", "onlydown")
+
+
+def test_sub_map_is_relative_to_its_page():
+    directory_page = DirectoryPage(MOCK_PAGES_ROOT_PATH)
+    tree_map = directory_page.name_map()
+    different_name_page = directory_page.search("different_name")
+    sub_map = tree_map.sub_map(("differentname",), different_name_page)
+    resolved_path, hard_to_reach_page = sub_map.resolve("hard_to_reach")
+    assert resolved_path == ("noselfnamedfiles", "differentname", "hardtoreach")
+    assert (resolved_path, hard_to_reach_page) == NameMap(different_name_page).resolve(
+        "hard_to_reach"
+    )
+    assert sub_map.resolve("only_down") is None
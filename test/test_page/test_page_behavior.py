@@ -146,7 +146,7 @@ class TestMergedPage:
         merged_readable_markdown_and_directory: MergedPage = page_behavior_data_dir.search(
             "readable"
         )
-        assert len(merged_readable_markdown_and_directory.pages) == 2
+        assert len(merged_readable_markdown_and_directory.members) == 2
         readable_python_file: PythonFilePage = merged_readable_markdown_and_directory.search(
             "readable"
         )
@@ -162,7 +162,7 @@ class TestMergedPage:
 
         readable_directory: DirectoryPage
         readable_markdown: MarkdownFilePage
-        readable_directory, readable_markdown = merged_readable_markdown_and_directory.pages
+        readable_directory, readable_markdown = merged_readable_markdown_and_directory.members
 
         # * Second, test that DirectoryPage.read() merges all sub-pages recursively and gets to the 'readable' var
         assert isinstance(readable_directory, DirectoryPage), readable_directory
@@ -0,0 +1,142 @@
+"""
+PageIndex: a persistent index of the page tree, validated by directory and file mtimes.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from termwiki.page import DirectoryPage, FunctionPage, PageIndex, VariablePage, page_index
+from test.data import mock_pages_root
+
+MOCK_PAGES_ROOT_PATH = Path(mock_pages_root.__path__[0])
+
+
+@pytest.fixture
+def mock_page_tree(tmp_path) -> DirectoryPage:
+    mock_page_tree = DirectoryPage(mock_pages_root)
+    mock_page_tree.index = PageIndex(MOCK_PAGES_ROOT_PATH, cache_dir=tmp_path)
+    return mock_page_tree
+
+
+@pytest.fixture
+def copied_pages_root(tmp_path) -> Path:
+    copied_pages_root = tmp_path / "pages_root"
+    shutil.copytree(MOCK_PAGES_ROOT_PATH, copied_pages_root)
+    return copied_pages_root
+
+
+class TestIndexEntries:
+    def test_mirrors_traversal(self, tmp_path):
+        index = PageIndex(MOCK_PAGES_ROOT_PATH, cache_dir=tmp_path)
+        assert index.lookup(("pages",))[0].kind == "python_file"
+        [no_return] = index.lookup(("pages", "noreturn"))
+        assert no_return.kind == "function"
+        assert no_return.file == str(MOCK_PAGES_ROOT_PATH / "pages.py")
+        [diet] = index.lookup(("pages", "noreturn", "diet"))
+        assert diet.kind == "variable"
+        assert diet.span[0] > no_return.span[0]
+        assert diet.span[1] < no_return.span[1]
+        cognitive = index.lookup(("pages", "noreturn", "cognitive"))
+        assert cognitive == index.lookup(("pages", "noreturn", "mental"))
+
+        # pages.py pages are also immediate sub-pages of their directory
+        assert index.lookup(("noreturn", "diet")) == [diet]
+        assert index.lookup(("uglydirname", "uglydirname", "uglydirname"))[0].kind == "variable"
+
+    def test_aliases_from_decorator(self, tmp_path):
+        index = PageIndex(MOCK_PAGES_ROOT_PATH, cache_dir=tmp_path)
+        assert index.lookup(("withalias",)) == index.lookup(("withaliasdecorator",))
+        assert index.lookup(("anotheralias",)) == index.lookup(("withaliasdecorator",))
+
+    def test_same_name_same_level(self, tmp_path):
+        index = PageIndex(MOCK_PAGES_ROOT_PATH, cache_dir=tmp_path)
+        kinds = {entry.kind for entry in index.lookup(("pagebehavior", "readable"))}
+        assert kinds == {"directory", "markdown_file"}
+        assert index.children(("pagebehavior",)).count("readable") == 1
+
+
+class TestPersistence:
+    def test_loads_without_parsing(self, tmp_path, monkeypatch):
+        index = PageIndex(MOCK_PAGES_ROOT_PATH, cache_dir=tmp_path)
+        children = index.children()
+        assert index.cache_path.exists()
+
+        def python_file_symbols(python_file_path):
+            msg = f"{python_file_path} was parsed although it didn't change"
+            raise AssertionError(msg)
+
+        monkeypatch.setattr(page_index, "python_file_symbols", python_file_symbols)
+        reloaded_index = PageIndex(MOCK_PAGES_ROOT_PATH, cache_dir=tmp_path)
+        assert reloaded_index.children() == children
+
+    def test_reparses_only_changed_file(self, tmp_path, copied_pages_root, spy):
+        cache_dir = tmp_path / "cache"
+        index = PageIndex(copied_pages_root, cache_dir=cache_dir)
+        assert not index.lookup(("pages", "added"))
+
+        pages_python_file = copied_pages_root / "pages.py"
+        with pages_python_file.open("a") as f:
+            f.write('\n\ndef added():\n    return "added"\n')
+        stat = pages_python_file.stat()
+        os.utime(pages_python_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        parsed_files = spy(page_index, "python_file_symbols")
+        reloaded_index = PageIndex(copied_pages_root, cache_dir=cache_dir)
+        assert reloaded_index.lookup(("pages", "added"))[0].kind == "function"
+        assert reloaded_index.lookup(("added",))
+        assert [call.args[0] for call in parsed_files] == [str(pages_python_file)]
+
+    def test_removed_directory(self, tmp_path, copied_pages_root):
+        cache_dir = tmp_path / "cache"
+        assert PageIndex(copied_pages_root, cache_dir=cache_dir).lookup(("pythonobjects",))
+        shutil.rmtree(copied_pages_root / "python_objects")
+        reloaded_index = PageIndex(copied_pages_root, cache_dir=cache_dir)
+        assert not reloaded_index.lookup(("pythonobjects",))
+        assert not reloaded_index.find("noreturnnoassignment")
+
+
+class TestIndexedSearch:
+    def test_deep_search(self, mock_page_tree):
+        found_path, diet_page = mock_page_tree.deep_search("pages no_return diet")
+        assert found_path == ["pages", "noreturn", "diet"]
+        assert isinstance(diet_page, VariablePage)
+        assert diet_page.read().splitlines()[1].strip() == "Bad: sugary foods"
+
+    def test_recursive_deep_search(self, mock_page_tree):
+        found_path, only_down_page = mock_page_tree.deep_search("only_down", recursive=True)
+        assert found_path == ["pagebehavior", "onlydown"]
+        assert only_down_page.read() == "only_down"
+
+        found_path, hard_to_reach = mock_page_tree.deep_search("hard_to_reach", recursive=True)
+        assert isinstance(hard_to_reach, FunctionPage)
+        assert hard_to_reach.read() == "long way"
+
+    def test_materializes_only_pages_on_path(self, mock_page_tree):
+        mock_page_tree.deep_search("only_down", recursive=True)
+        page_behavior_page = mock_page_tree._pages["pagebehavior"]
+        assert page_behavior_page.index_path == ("pagebehavior",)
+        for name, page in mock_page_tree._pages.items():
+            if name != "pagebehavior":
+                assert not getattr(page, "_pages", None), f"{name} was traversed"
+
+    def test_search_does_not_list_children(self, mock_page_tree, spy):
+        children_calls = spy(PageIndex, "children")
+        assert mock_page_tree.search("pages") is not None
+        assert mock_page_tree.search("nonexistent") is None
+        assert children_calls == []
+        assert mock_page_tree.index.has_child(("pages",), "noreturn")
+        assert not mock_page_tree.index.has_child(("pages",), "nonexistent")
+
+    def test_not_found(self, mock_page_tree):
+        assert mock_page_tree.deep_search("nonexistent", recursive=True) == ([], mock_page_tree)
+        assert mock_page_tree.search("nonexistent") is None
+
+    def test_on_not_found_gets_index_names(self, mock_page_tree):
+        def on_not_found(page_names, _page_name):
+            assert "pages" in page_names
+            return "pages"
+
+        assert mock_page_tree.search("pgaes", on_not_found=on_not_found) is mock_page_tree["pages"]
@@ -0,0 +1,51 @@
+"""
+Searching an immediate sub-page by its exact name creates only that page, and finds
+the same page a full traversal would.
+"""
+
+from pathlib import Path
+
+from termwiki.page import DirectoryPage, FunctionPage, Traversable
+from test.data import mock_pages_root
+
+MOCK_PAGES_ROOT_PATH = Path(mock_pages_root.__path__[0])
+
+
+def iter_directory_pages(directory_page: DirectoryPage):
+    yield directory_page
+    for page in directory_page.pages.values():
+        if isinstance(page, DirectoryPage):
+            yield from iter_directory_pages(page)
+
+
+def test_search_does_not_create_siblings():
+    directory_page = DirectoryPage(MOCK_PAGES_ROOT_PATH)
+    python_objects_page = directory_page.search("python_objects")
+    assert isinstance(python_objects_page, DirectoryPage)
+    assert list(directory_page._pages) == ["pythonobjects"]
+    assert not directory_page.__traverse_exhaused__
+
+
+def test_search_pages_python_file_symbols():
+    directory_page = DirectoryPage(MOCK_PAGES_ROOT_PATH)
+    no_return_page: FunctionPage = directory_page.search("no_return")
+    assert isinstance(no_return_page, FunctionPage)
+    diet_page = no_return_page.search("diet")
+    assert diet_page.read().splitlines()[1].strip() == "Bad: sugary foods"
+    assert list(no_return_page._pages) == ["diet"]
+    assert list(directory_page._pages) == ["noreturn"]
+
+
+def test_same_pages_as_traversal():
+    for traversed_directory_page in iter_directory_pages(DirectoryPage(MOCK_PAGES_ROOT_PATH)):
+        for name, traversed_page in traversed_directory_page.sub_pages().items():
+            directory_page = DirectoryPage(traversed_directory_page.path())
+            probed_page = directory_page.search(name)
+            assert type(probed_page) is type(traversed_page), (directory_page, name)
+            assert repr(probed_page) == repr(traversed_page), (directory_page, name)
+            if isinstance(traversed_page, Traversable) and not isinstance(
+                traversed_page, DirectoryPage
+            ):
+                for sub_name, traversed_sub_page in traversed_page.sub_pages().items():
+                    probed_sub_page = probed_page.search(sub_name)
+                    assert repr(probed_sub_page) == repr(traversed_sub_page)
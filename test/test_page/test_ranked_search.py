@@ -0,0 +1,108 @@
+"""
+Recursive deep_search is best-first: the shallowest exact match wins over anything
+on_not_found would choose, on_not_found is asked once, with the shallowest names first,
+max_depth bounds both, and the tree is traversed only as deep as the match.
+Each test runs with and without an index.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from termwiki.page import DirectoryPage, MergedPage, PageIndex
+
+
+@pytest.fixture
+def pages_root(tmp_path) -> Path:
+    pages_root = tmp_path / "pages_root"
+    for relative_path in [
+        "restructured_text.md",
+        "arg_parsers.md",
+        "bash/sed.md",
+        "bash/deep/deeper/deepest.md",
+        "python/argparse.md",
+        "python/topic.md",
+        "vim/topic.md",
+        "vim/modes/visual/block.md",
+    ]:
+        path = pages_root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(path.stem)
+    return pages_root
+
+
+@pytest.fixture(params=["name_map", "index"])
+def page_tree(request, pages_root, tmp_path) -> DirectoryPage:
+    page_tree = DirectoryPage(pages_root)
+    if request.param == "index":
+        page_tree.index = PageIndex(pages_root, cache_dir=tmp_path / "cache")
+    return page_tree
+
+
+@pytest.fixture
+def on_not_found_calls() -> list[list[str]]:
+    return []
+
+
+@pytest.fixture
+def choose_first(on_not_found_calls):
+    """The least discerning fuzzy search possible."""
+
+    def choose_first(page_names, _page_name):
+        page_names = list(page_names)
+        on_not_found_calls.append(page_names)
+        return page_names[0]
+
+    return choose_first
+
+
+@pytest.mark.parametrize(
+    ("page_name", "expected_path"), [("sed", ["bash", "sed"]), ("argparse", ["python", "argparse"])]
+)
+def test_deeper_exact_match_beats_on_not_found(
+    page_tree, choose_first, on_not_found_calls, page_name, expected_path
+):
+    found_path, page = page_tree.deep_search(page_name, on_not_found=choose_first, recursive=True)
+    assert found_path == expected_path
+    assert page.read() == page_name
+    assert on_not_found_calls == []
+
+
+def test_on_not_found_is_asked_once_shallowest_first(page_tree, on_not_found_calls):
+    def choose_block(page_names, _page_name):
+        page_names = list(page_names)
+        on_not_found_calls.append(page_names)
+        return "block" if "block" in page_names else None
+
+    # Not a typo of any name, so all of them are offered
+    found_path, page = page_tree.deep_search("rectangle", on_not_found=choose_block, recursive=True)
+    assert found_path == ["vim", "modes", "visual", "block"]
+    [page_names] = on_not_found_calls
+    assert page_names.index("bash") < page_names.index("sed") < page_names.index("block")
+
+
+def test_max_depth(page_tree, choose_first, on_not_found_calls):
+    assert page_tree.deep_search("deepest", recursive=True, max_depth=3) == ([], page_tree)
+    found_path, _ = page_tree.deep_search("deepest", recursive=True, max_depth=4)
+    assert found_path == ["bash", "deep", "deeper", "deepest"]
+
+    found_path, _ = page_tree.deep_search(
+        "block", on_not_found=choose_first, recursive=True, max_depth=2
+    )
+    assert len(found_path) == 1
+    assert len(on_not_found_calls) == 1
+
+
+def test_same_depth_exact_matches_are_merged(page_tree):
+    found_path, page = page_tree.deep_search("topic", recursive=True)
+    assert found_path == ["python", "topic"]
+    assert isinstance(page, MergedPage)
+    assert page.read() == "topic\n\ntopic"
+
+
+def test_stops_at_the_shallowest_exact_match(pages_root):
+    page_tree = DirectoryPage(pages_root)
+    page_tree.deep_search("sed", recursive=True)
+    deep_page = page_tree.search("bash").search("deep")
+    assert not deep_page.__traverse_exhaused__
+    assert len(page_tree.name_map()._levels) == 2
@@ -0,0 +1,53 @@
+"""
+Names of the same thing share one page: @alias names of a function, and the targets
+of a chained assignment ('cognitive = mental = ...'), whether they're probed or traversed.
+So their value is evaluated once, and merged reads show it once.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from termwiki.page import MergedPage, PythonFilePage, VariablePage
+from test.data import mock_pages_root
+
+PAGES_PATH = Path(mock_pages_root.__path__[0]) / "pages.py"
+
+
+@pytest.mark.parametrize("static", [True, False])
+def test_traversed_names_share_pages(static):
+    python_file_page = PythonFilePage(PAGES_PATH, static=static)
+    sub_pages = python_file_page.sub_pages()
+    assert sub_pages["withalias"] is sub_pages["withaliasdecorator"]
+    assert sub_pages["anotheralias"] is sub_pages["withaliasdecorator"]
+    no_return_pages = sub_pages["noreturn"].sub_pages()
+    assert no_return_pages["cognitive"] is no_return_pages["mental"]
+
+
+def test_probed_names_share_pages():
+    python_file_page = PythonFilePage(PAGES_PATH)
+    with_alias_page = python_file_page.search("with_alias")
+    assert python_file_page.search("with_alias_decorator") is with_alias_page
+    no_return_page = python_file_page.search("no_return")
+    cognitive_page = no_return_page.search("cognitive")
+    assert no_return_page.search("mental") is cognitive_page
+
+    # And traversing afterwards keeps them
+    assert python_file_page.sub_pages()["anotheralias"] is with_alias_page
+    assert no_return_page.sub_pages()["mental"] is cognitive_page
+
+
+def test_evaluated_and_read_once():
+    no_return_page = PythonFilePage(PAGES_PATH).search("no_return")
+    cognitive_page: VariablePage = no_return_page.search("cognitive")
+    text = no_return_page.read()
+    assert text.count("## Cognitive / Mental") == 1
+    assert cognitive_page._evaluate is None
+    assert cognitive_page.value in text
+
+
+def test_merged_pages_are_deduplicated():
+    first, second = VariablePage("first", "first"), VariablePage("second", "second")
+    merged_page = MergedPage(first, second, first, MergedPage(second, first))
+    assert merged_page.members == (first, second)
+    assert merged_page.read() == "first\n\nsecond"
@@ -0,0 +1,53 @@
+"""
+A Python page file is parsed at most once, and its function and variable pages get their own
+subtree of that parse, instead of re-parsing their source with inspect.
+"""
+
+import inspect
+from pathlib import Path
+
+import pytest
+
+from termwiki.page import PythonFilePage
+from termwiki.page.ast_cache import ast_cache
+from test.data import mock_pages_root
+
+COMPOSED_VALUES_PATH = Path(mock_pages_root.__path__[0]) / "static_traversal" / "composed_values.py"
+
+
+@pytest.fixture(autouse=True)
+def isolated_ast_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(ast_cache, "cache_dir", tmp_path)
+    monkeypatch.setattr(ast_cache, "_records", {})
+    monkeypatch.setattr(ast_cache, "_asts", {})
+
+    def getsource(obj):
+        msg = f"inspect.getsource({obj!r}) was called"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(inspect, "getsource", getsource)
+
+
+def test_dynamic_traversal_parses_once(parsed_sources):
+    python_file_page = PythonFilePage(COMPOSED_VALUES_PATH, static=False)
+    function_page = python_file_page["composed"]
+    assert function_page.read() == "hello\n\nhello world"
+    assert function_page["composed_greeting"].read() == "hello world"
+    assert function_page.python_module_ast().body[0] is python_file_page.python_module_ast().body[1]
+    assert len(parsed_sources) == 1
+
+
+def test_static_search_parses_only_the_function(parsed_sources):
+    python_file_page = PythonFilePage(COMPOSED_VALUES_PATH)
+    function_page = python_file_page["composed"]
+    assert function_page.read() == "hello\n\nhello world"
+    assert function_page["composed_greeting"].read() == "hello world"
+    assert function_page.function_def.lineno == 4
+    [parse_call] = parsed_sources
+    assert parse_call.args[0].startswith("def composed():")
+    assert python_file_page._python_module_ast is None
+
+    # Listing all pages parses the whole file
+    page_names = list(python_file_page.pages)
+    assert {"composed", "chain"} <= set(page_names)
+    assert len(parsed_sources) == 2
@@ -0,0 +1,74 @@
+"""
+SourceSegments: a cheap scan of a Python page file's top-level statements.
+"""
+
+import ast
+
+from termwiki.page.source_segments import SourceSegments, scan_segments
+
+SOURCE = '''"""Docstring"""
+from termwiki.page.decorators import alias
+
+__exclude__ = ["excluded"]
+
+
+@alias("aliased", 'another alias')
+def decorated():
+    text = """
+def not_a_function():
+x = 1
+"""
+    items = [
+"not a statement",
+    ]  # ' unbalanced quote in comment
+
+
+def excluded():
+    return "excluded"
+
+
+first = second = f"{decorated}"
+'''
+
+
+def test_scan_segments():
+    segments = scan_segments(SOURCE)
+    assert [(segment.kind, segment.names) for segment in segments] == [
+        ("other", ()),
+        ("other", ()),
+        ("assign", ("__exclude__",)),
+        ("function", ("decorated", "aliased", "another alias")),
+        ("function", ("excluded",)),
+        ("assign", ("first", "second")),
+    ]
+    decorated_segment = segments[3]
+    assert (
+        SOURCE.splitlines()[decorated_segment.start - 1] == "@alias(\"aliased\", 'another alias')"
+    )
+
+
+def test_find_and_parse():
+    source_segments = SourceSegments(SOURCE)
+    assert source_segments.find("notafunction") is None
+    assert source_segments.find("excluded") is None
+    assert source_segments.find("anotheralias") == source_segments.find("decorated")
+
+    function_def = source_segments.parse(source_segments.find("decorated"))
+    assert isinstance(function_def, ast.FunctionDef)
+    full_function_def = ast.parse(SOURCE).body[3]
+    assert ast.dump(function_def, include_attributes=True) == ast.dump(
+        full_function_def, include_attributes=True
+    )
+
+    assign = source_segments.parse(source_segments.find("second"))
+    assert [target.id for target in assign.targets] == ["first", "second"]
+
+
+def test_segment_cut_short_is_joined():
+    # The scan takes the column-0 line after the backslash for a statement
+    source = "def cut_short():\n    return 1 + \\\n2\n\n\nafter = 1\n"
+    source_segments = SourceSegments(source)
+    assert len(source_segments.segments) == 3
+    function_def = source_segments.parse(source_segments.find("cutshort"))
+    assert isinstance(function_def, ast.FunctionDef)
+    assert function_def.end_lineno == 3
@@ -0,0 +1,121 @@
+"""
+Python pages are traversed from their source's AST alone.
+The module is imported only when reading a page requires executing something.
+"""
+
+import sys
+from pathlib import Path
+
+from termwiki.page import DirectoryPage, FunctionPage, PageIndex, PythonFilePage, VariablePage
+from test.data import mock_pages_root
+
+STATIC_TRAVERSAL_MODULE_NAME = "test.data.mock_pages_root.static_traversal.static_traversal"
+STATIC_TRAVERSAL_DIRECTORY_PATH = Path(mock_pages_root.__path__[0]) / "static_traversal"
+STATIC_TRAVERSAL_PATH = STATIC_TRAVERSAL_DIRECTORY_PATH / "static_traversal.py"
+REGULAR_PACKAGE_NAME = "test.data.mock_pages_root.static_traversal.regular_package"
+
+
+def test_traverse_does_not_import():
+    sys.modules.pop(STATIC_TRAVERSAL_MODULE_NAME, None)
+    python_file_page = PythonFilePage(STATIC_TRAVERSAL_PATH)
+    assert python_file_page.name() == "static_traversal"
+    page_names = [name for name, _page in python_file_page.traverse()]
+    assert page_names == [
+        "expensivehelper",
+        "statictraversal",
+        "staticallyaliased",
+        "modulelevelconstant",
+    ]
+    function_page: FunctionPage = python_file_page.search("static_traversal")
+    assert function_page.name() == "static_traversal"
+    variable_names = [name for name, _page in function_page.traverse()]
+    assert variable_names == ["cheap", "expensive"]
+    assert python_file_page.search("statically_aliased").function_def is function_page.function_def
+    assert STATIC_TRAVERSAL_MODULE_NAME not in sys.modules
+
+
+def test_constants_are_read_without_importing():
+    sys.modules.pop(STATIC_TRAVERSAL_MODULE_NAME, None)
+    python_file_page = PythonFilePage(STATIC_TRAVERSAL_PATH)
+    assert python_file_page["module_level_constant"].read() == "module level constant"
+    assert python_file_page["static_traversal"]["cheap"].read() == "cheap"
+    assert STATIC_TRAVERSAL_MODULE_NAME not in sys.modules
+
+
+def test_read_imports_when_evaluating():
+    sys.modules.pop(STATIC_TRAVERSAL_MODULE_NAME, None)
+    python_file_page = PythonFilePage(STATIC_TRAVERSAL_PATH)
+    expensive_page: VariablePage = python_file_page["static_traversal"]["expensive"]
+    assert STATIC_TRAVERSAL_MODULE_NAME not in sys.modules
+    assert expensive_page.read() == "expensive value"
+    assert STATIC_TRAVERSAL_MODULE_NAME in sys.modules
+    assert python_file_page["static_traversal"].read() == "cheap\n\nexpensive value"
+
+
+def test_dynamic_traversal_imports():
+    sys.modules.pop(STATIC_TRAVERSAL_MODULE_NAME, None)
+    python_file_page = PythonFilePage(STATIC_TRAVERSAL_PATH, static=False)
+    assert python_file_page["static_traversal"]["cheap"].read() == "cheap"
+    assert STATIC_TRAVERSAL_MODULE_NAME in sys.modules
+
+
+class TestDirectory:
+    def _forget_regular_package(self):
+        for module_name in list(sys.modules):
+            if module_name.startswith(REGULAR_PACKAGE_NAME):
+                del sys.modules[module_name]
+
+    def test_deep_search_does_not_import_packages(self, tmp_path):
+        self._forget_regular_package()
+        directory_page = DirectoryPage(STATIC_TRAVERSAL_DIRECTORY_PATH)
+        found_path, nested_function_page = directory_page.deep_search(
+            "regular_package nested_package nested_module nested_function"
+        )
+        assert isinstance(nested_function_page, FunctionPage)
+        assert not any(name.startswith(REGULAR_PACKAGE_NAME) for name in sys.modules)
+
+        directory_page = DirectoryPage(STATIC_TRAVERSAL_DIRECTORY_PATH)
+        directory_page.index = PageIndex(STATIC_TRAVERSAL_DIRECTORY_PATH, cache_dir=tmp_path)
+        found_path, nested_function_page = directory_page.deep_search(
+            "nested_function", recursive=True
+        )
+        assert found_path == ["regularpackage", "nestedpackage", "nestedmodule", "nestedfunction"]
+        assert isinstance(nested_function_page, FunctionPage)
+        assert not any(name.startswith(REGULAR_PACKAGE_NAME) for name in sys.modules)
+
+        assert nested_function_page.read() == "nested function"
+        assert f"{REGULAR_PACKAGE_NAME}.nested_package.nested_module" in sys.modules
+
+    def test_name_and_path_without_importing(self):
+        self._forget_regular_package()
+        regular_package_page = DirectoryPage(STATIC_TRAVERSAL_DIRECTORY_PATH / "regular_package")
+        assert regular_package_page.name() == "regular_package"
+        nested_package_page = regular_package_page["nested_package"]
+        assert isinstance(nested_package_page, DirectoryPage)
+        assert nested_package_page.path() == regular_package_page.path() / "nested_package"
+        assert nested_package_page.imported_package() is None
+        assert REGULAR_PACKAGE_NAME not in sys.modules
+
+
+def test_only_read_variables_are_evaluated(monkeypatch):
+    from test.data.mock_pages_root.static_traversal import static_traversal
+
+    helper_calls = []
+
+    def expensive_helper():
+        helper_calls.append(1)
+        return "expensive"
+
+    monkeypatch.setattr(static_traversal, "_expensive_helper", expensive_helper)
+    for static in (True, False):
+        python_file_page = PythonFilePage(STATIC_TRAVERSAL_PATH, static=static)
+        function_page: FunctionPage = python_file_page["static_traversal"]
+        list(function_page.traverse())
+        assert function_page["cheap"].read() == "cheap"
+        assert not helper_calls
+        expensive_page: VariablePage = function_page["expensive"]
+        assert not helper_calls
+        assert expensive_page.read() == "expensive value"
+        assert expensive_page.read() == "expensive value"
+        assert len(helper_calls) == 1
+        helper_calls.clear()
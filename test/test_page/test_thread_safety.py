@@ -0,0 +1,127 @@
+"""
+Many threads walking the same tree: each node is traversed once, each cached property
+is computed once, and all threads get the same page objects.
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from termwiki.page import DirectoryPage, Page, Traversable, VariablePage
+from termwiki.util import cached_property
+from test.data import mock_pages_root
+
+MOCK_PAGES_ROOT_PATH = Path(mock_pages_root.__path__[0])
+THREADS = 16
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(switch_interval)
+
+
+def hammer(fn, times: int = THREADS * 4) -> list:
+    barrier = threading.Barrier(THREADS)
+
+    def run(_):
+        barrier.wait()
+        return fn()
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        return list(executor.map(run, range(times)))
+
+
+class SlowPage(Traversable):
+    def __init__(self, page_names: list[str]) -> None:
+        super().__init__()
+        self.page_names = page_names
+        self.traversals = 0
+        self.readability_checks = 0
+        self.reads = 0
+
+    def name(self) -> str:
+        return "slow"
+
+    def traverse(self, *args, cache_ok=True, **kwargs):
+        self.traversals += 1
+        for page_name in self.page_names:
+            time.sleep(0.001)
+            yield page_name, VariablePage(page_name, page_name)
+
+    @cached_property
+    def readable(self) -> bool:
+        self.readability_checks += 1
+        time.sleep(0.01)
+        return True
+
+    def read(self, *args, **kwargs) -> str:
+        self.reads += 1
+        time.sleep(0.01)
+        return "slow"
+
+
+def test_single_traversal():
+    slow_page = SlowPage([f"page_{i}" for i in range(20)])
+    traversals = hammer(lambda: list(slow_page.traverse()))
+    assert slow_page.traversals == 1
+    assert all(traversal == traversals[0] for traversal in traversals)
+    assert [name for name, _ in traversals[0]] == slow_page.page_names
+    assert list(slow_page.pages.items()) == traversals[0]
+
+
+def test_single_readable_check():
+    slow_page = SlowPage([])
+    assert all(hammer(lambda: slow_page.readable))
+    assert slow_page.readability_checks == 1
+    assert slow_page.reads == 0
+
+
+def test_single_evaluation():
+    evaluations = []
+
+    def evaluate():
+        evaluations.append(None)
+        time.sleep(0.01)
+        return "evaluated"
+
+    variable_page = VariablePage(name="lazy", evaluate=evaluate)
+    assert set(hammer(variable_page.read)) == {"evaluated"}
+    assert len(evaluations) == 1
+
+
+def walk(page: Page, path: tuple[str, ...] = ()) -> list[tuple[tuple[str, ...], int]]:
+    walked = [(path, id(page))]
+    if isinstance(page, Traversable):
+        # Not traverse(), because an in-progress traversal also yields same-name pages
+        # that a finished one doesn't, and which one a thread gets depends on timing.
+        for name, sub_page in page.sub_pages().items():
+            walked.extend(walk(sub_page, (*path, name)))
+    return walked
+
+
+def test_hammer_one_tree():
+    directory_page = DirectoryPage(MOCK_PAGES_ROOT_PATH)
+    expected_paths = [path for path, _ in walk(DirectoryPage(MOCK_PAGES_ROOT_PATH))]
+
+    def search_then_walk():
+        python_objects_page = directory_page.search("python_objects")
+        no_return_page = directory_page.search("no_return")
+        _, diet_page = directory_page.deep_search("no_return diet")
+        return python_objects_page, no_return_page, diet_page, walk(directory_page)
+
+    results = hammer(search_then_walk)
+    python_objects_page, no_return_page, diet_page, walked = results[0]
+    assert diet_page.readable
+    assert [path for path, _ in walked] == expected_paths
+    for result in results:
+        assert result[0] is python_objects_page
+        assert result[1] is no_return_page
+        assert result[2] is diet_page
+        assert result[3] == walked
@@ -0,0 +1,71 @@
+"""
+A traversal that was stopped early is resumed by the next traverse() call, not restarted.
+"""
+
+import itertools
+
+import pytest
+
+from termwiki.page import Traversable, VariablePage
+
+
+class CountingPage(Traversable):
+    def __init__(self, page_names: list[str], fail_at: str | None = None) -> None:
+        super().__init__()
+        self.page_names = page_names
+        self.fail_at = fail_at
+        self.traversals = 0
+        self.created_pages = []
+
+    def name(self) -> str:
+        return "counting"
+
+    def traverse(self, *args, cache_ok=True, **kwargs):
+        self.traversals += 1
+        for page_name in self.page_names:
+            if page_name == self.fail_at:
+                self.fail_at = None
+                raise RuntimeError(page_name)
+            page = VariablePage(page_name, page_name)
+            self.created_pages.append(page)
+            yield page_name, page
+
+
+def test_resumes_after_stopping_early():
+    counting_page = CountingPage(["a", "b", "c", "d"])
+    first_two = list(itertools.islice(counting_page.traverse(), 2))
+    assert not counting_page.__traverse_exhaused__
+    all_pages = list(counting_page.traverse())
+    assert all_pages[:2] == first_two
+    assert [name for name, _ in all_pages] == ["a", "b", "c", "d"]
+    assert counting_page.traversals == 1
+    assert len(counting_page.created_pages) == 4
+    assert counting_page.__traverse_exhaused__
+    assert list(counting_page.traverse()) == all_pages
+
+
+def test_interleaved_traversals_share_the_generator():
+    counting_page = CountingPage(["a", "b", "c"])
+    first_traversal = counting_page.traverse()
+    second_traversal = counting_page.traverse()
+    interleaved = [
+        next(first_traversal),
+        next(second_traversal),
+        next(second_traversal),
+        next(first_traversal),
+    ]
+    assert [name for name, _ in interleaved] == ["a", "a", "b", "b"]
+    assert interleaved[0][1] is interleaved[1][1]
+    assert list(first_traversal)[-1][0] == "c"
+    assert [name for name, _ in second_traversal] == ["c"]
+    assert counting_page.traversals == 1
+    assert len(counting_page.created_pages) == 3
+    assert list(counting_page.pages) == ["a", "b", "c"]
+
+
+def test_restarts_after_failure():
+    counting_page = CountingPage(["a", "b", "c"], fail_at="b")
+    with pytest.raises(RuntimeError):
+        list(counting_page.traverse())
+    assert [name for name, _ in counting_page.traverse()] == ["a", "b", "c"]
+    assert counting_page.traversals == 2
@@ -0,0 +1,168 @@
+"""
+TypoIndex: symmetric-delete typo corrections of page names, and how PageIndex resolves
+typos (and shortened names) with them: the single closest correction is taken as is, and
+on_not_found chooses only between equally close ones, down to the non-interactive cli.fuzzy_search.
+The TypoIndex has a cache file of its own, loaded only to look up a typo.
+"""
+
+import pickle
+import random
+import string
+import time
+from pathlib import Path
+
+import pytest
+
+from termwiki import cli
+from termwiki.page import DirectoryPage, PageIndex, TypoIndex, typo_index
+
+PAGE_NAMES = ["deletion", "delete", "visual", "validator", "argparse", "sed", "restructuredtext"]
+
+
+@pytest.fixture
+def names_index() -> TypoIndex:
+    names_index = TypoIndex()
+    names_index.update(PAGE_NAMES)
+    return names_index
+
+
+@pytest.mark.parametrize(
+    ("term", "expected"),
+    [
+        ("deletoin", [(1, "deletion")]),  # transposition
+        ("delte", [(1, "delete"), (1, "deletion")]),  # closest, then shortest
+        ("dele", [(0, "delete"), (0, "deletion")]),  # prefixes
+        ("vlaidatr", [(2, "validator")]),
+        ("restaurant", []),  # too far
+        ("resturcturedtext", [(1, "restructuredtext")]),
+        ("sedd", [(1, "sed")]),
+        ("sde", [(1, "sed")]),
+        ("sd", []),  # too short
+    ],
+)
+def test_lookup(names_index, term, expected):
+    assert names_index.lookup(term) == expected
+
+
+def test_prefix_distance():
+    assert typo_index.prefix_distance("delete", "deletion") == 1
+    assert typo_index.prefix_distance("deletion", "delete") == 3
+    assert typo_index.prefix_distance("ab", "ba") == 1
+    assert typo_index.prefix_distance("sde", "sed") == 1
+    assert typo_index.prefix_distance("xyz", "restructuredtext") == 3
+
+
+def test_incremental_update(names_index):
+    assert not names_index.update(PAGE_NAMES)
+    updated_names = [*PAGE_NAMES[1:], "deletions"]
+    assert names_index.update(updated_names)
+    rebuilt_index = TypoIndex()
+    rebuilt_index.update(updated_names)
+    assert names_index._deletions == rebuilt_index._deletions
+    assert "deletion" not in names_index
+    assert names_index.lookup("deletoin") == [(1, "deletions")]
+
+
+@pytest.mark.benchmark
+def test_lookup_is_independent_of_size():
+    rng = random.Random(0)
+    names = {
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 20)))
+        for _ in range(20_000)
+    }
+    large_index = TypoIndex()
+    large_index.update(names)
+    terms = [name[:3] + name[4:] for name in rng.sample(sorted(names), 200)]
+    start = time.perf_counter()
+    for term in terms:
+        large_index.lookup(term)
+    per_lookup = (time.perf_counter() - start) / len(terms)
+    assert per_lookup < 0.005, f"{per_lookup * 1e6:.0f}µs per lookup"
+
+
+@pytest.fixture
+def pages_root(tmp_path) -> Path:
+    pages_root = tmp_path / "pages_root"
+    for relative_path in ["vim/deletion.md", "vim/visual.md", "bash/sed.md", "bash/delete.md"]:
+        path = pages_root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(path.stem)
+    return pages_root
+
+
+def test_deep_search_corrects_typos(pages_root, tmp_path):
+    on_not_found_calls = []
+
+    def choose_deletion(page_names, _page_name):
+        on_not_found_calls.append(sorted(page_names))
+        return "deletion" if "deletion" in page_names else None
+
+    page_tree = DirectoryPage(pages_root)
+    page_tree.index = PageIndex(pages_root, cache_dir=tmp_path / "cache")
+    found_path, page = page_tree.deep_search(
+        "vim delete", on_not_found=choose_deletion, recursive=True
+    )
+    assert found_path == ["vim", "deletion"]
+    assert page.read() == "deletion"
+    # The single closest correction needs no choosing
+    assert on_not_found_calls == []
+
+    # Equally close corrections are for on_not_found to choose, from all depths at once
+    found_path, _ = page_tree.deep_search("delet", on_not_found=choose_deletion, recursive=True)
+    assert found_path == ["vim", "deletion"]
+    assert on_not_found_calls == [["delete", "deletion"]]
+
+    # Without any correction, all the names are offered
+    on_not_found_calls.clear()
+    found_path, _ = page_tree.deep_search("xyzzy", on_not_found=choose_deletion, recursive=True)
+    assert found_path == ["vim", "deletion"]
+    assert on_not_found_calls == [["bash", "delete", "deletion", "sed", "vim", "visual"]]
+
+    # Without on_not_found, only exact matches count
+    assert page_tree.deep_search("vim delete", recursive=True)[0] == ["vim"]
+
+
+@pytest.mark.parametrize(
+    ("page_path", "expected_path"),
+    [
+        ("vim deletoin", ["vim", "deletion"]),
+        ("vim delete", ["vim", "deletion"]),
+        ("bash sde", ["bash", "sed"]),
+        ("visaul", ["vim", "visual"]),
+        ("delet", ["bash", "delete"]),
+    ],
+)
+def test_cli_fuzzy_search_resolves_typos(pages_root, tmp_path, page_path, expected_path):
+    # stdin isn't a terminal under pytest, so cli.fuzzy_search picks the best match itself
+    page_tree = DirectoryPage(pages_root)
+    page_tree.index = PageIndex(pages_root, cache_dir=tmp_path / "cache")
+    found_path, _ = page_tree.deep_search(page_path, on_not_found=cli.fuzzy_search, recursive=True)
+    assert found_path == expected_path
+
+
+def test_persisted_and_updated_incrementally(pages_root, tmp_path, spy):
+    cache_dir = tmp_path / "cache"
+    assert PageIndex(pages_root, cache_dir=cache_dir).find_typos("visaul") == [
+        (1, ("vim", "visual"))
+    ]
+    add_calls = spy(TypoIndex, "add")
+    assert PageIndex(pages_root, cache_dir=cache_dir).find_typos("sedd") == [(1, ("bash", "sed"))]
+    assert add_calls == []
+
+    (pages_root / "vim" / "visual_block.md").write_text("visual_block")
+    reloaded_index = PageIndex(pages_root, cache_dir=cache_dir)
+    assert reloaded_index.find_typos("visualblok") == [(1, ("vim", "visualblock"))]
+    assert [call.args[1] for call in add_calls] == ["visualblock"]
+
+
+def test_loaded_only_to_look_up_typos(pages_root, tmp_path, spy):
+    cache_dir = tmp_path / "cache"
+    PageIndex(pages_root, cache_dir=cache_dir).find_typos("visaul")
+    page_index = PageIndex(pages_root, cache_dir=cache_dir)
+    assert "typo_index" not in pickle.loads(page_index.cache_path.read_bytes())
+    load_calls = spy(pickle, "load")
+    assert page_index.find("visual") == [("vim", "visual")]
+    assert len(load_calls) == 1
+    page_index.find_typos("visaul")
+    page_index.find_typos("sedd")
+    assert len(load_calls) == 2
@@ -0,0 +1,105 @@
+"""
+search.fuzzy scores the whole collection in vectorized passes when NumPy is installed,
+and one name at a time otherwise (up to PURE_PYTHON_MAX_NAMES names); both give the same
+distances and the same near/far split.
+"""
+
+import logging
+import random
+import string
+
+import pytest
+
+from termwiki import search
+
+PAGE_NAMES = ["restructuredtext", "sed", "argparse", "python", "pydantic", "validator", "deletion"]
+
+
+requires_numpy = pytest.mark.skipif(search.np is None, reason="numpy is not installed")
+
+
+@pytest.fixture(params=[pytest.param("numpy", marks=requires_numpy), "python"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(search, "np", None)
+    return request.param
+
+
+def random_names(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    alphabet = string.ascii_lowercase + "_-é"
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 30))) for _ in range(count)]
+
+
+@pytest.mark.parametrize(
+    ("keyword", "name", "expected"),
+    [
+        ("sed", "sed", (0, 3)),
+        ("sed", "use_sed_here", (0, 3)),
+        ("delete", "deletion", (1, 5)),
+        ("valid", "xvalidx", (0, 5)),
+        ("argpasre", "argparse", (2, 6)),
+        ("abc", "", (3, 0)),
+    ],
+)
+@pytest.mark.usefixtures("backend")
+def test_substring_distance(keyword, name, expected):
+    distances, match_lengths = search._substring_distances(keyword, [name])
+    assert (distances[0], match_lengths[0]) == expected
+
+
+@requires_numpy
+def test_backends_agree(monkeypatch):
+    names = random_names(2000) + PAGE_NAMES
+    monkeypatch.setattr(search, "NAMES_CHUNK_SIZE", 300)
+    for keyword in ["delete", "validators", "resturctured", "xé-", "a"]:
+        vectorized = search._substring_distances(keyword, names)
+        with monkeypatch.context() as python_backend:
+            python_backend.setattr(search, "np", None)
+            assert search._substring_distances(keyword, names) == vectorized
+
+
+@pytest.mark.parametrize(
+    ("keyword", "expected_best"),
+    [("validators", "validator"), ("resturctured", "restructuredtext"), ("delete", "deletion")],
+)
+@pytest.mark.usefixtures("backend")
+def test_near_matches(keyword, expected_best):
+    matches = search.fuzzy(keyword, PAGE_NAMES)
+    assert matches.best() == [expected_best]
+    assert matches.best_score < 2
+
+
+@pytest.mark.usefixtures("backend")
+def test_far_matches():
+    # Nothing is closer than cutoff, so the far matches are returned
+    matches = search.fuzzy("pydanticish", PAGE_NAMES, cutoff=0)
+    assert matches.best() == ["pydantic"]
+    assert matches.best_score >= 0
+    # Exact matches aren't fuzzy
+    assert not search.fuzzy("sed", ["sed"])
+
+
+def test_pure_python_is_capped(monkeypatch, caplog):
+    monkeypatch.setattr(search, "np", None)
+    monkeypatch.setattr(search, "PURE_PYTHON_MAX_NAMES", len(PAGE_NAMES))
+    with caplog.at_level(logging.WARNING):
+        distances, match_lengths = search._substring_distances("delete", [*PAGE_NAMES, "deletion"])
+    assert (distances[-2:], match_lengths[-2:]) == ([1, 6], [5, 0])
+    assert "install termwiki[numpy]" in caplog.text
+    # The unscored names are too far to be matched
+    matches = search.fuzzy("delete", [*PAGE_NAMES[:-1], "sed", "deletion"])
+    assert "deletion" not in [item for _, item in matches.sorted()]
+
+
+@requires_numpy
+def test_encoding_is_cached():
+    names = tuple(random_names(100))
+    search._encode_names.cache_clear()
+    search.fuzzy("abc", names)
+    search.fuzzy("xyz", list(names))
+    cache_info = search._encode_names.cache_info()
+    assert (cache_info.misses, cache_info.hits) == (1, 1)
+    encoded_names = search._encode_names(names)
+    assert encoded_names.code_points.shape == (100, max(map(len, names)))
+    assert list(encoded_names.lengths) == sorted(map(len, names))
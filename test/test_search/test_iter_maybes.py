@@ -0,0 +1,63 @@
+"""
+search.iter_maybes classifies the collection into its substring and separator-insensitive
+tiers in one pass, yields them before the fuzzy tier is computed, and never repeats an item.
+"""
+
+from termwiki import search
+
+PAGE_NAMES = ["restructuredtext", "rest_api", "rest-api", "restapi", "resp_api", "sed", "rest_api"]
+
+
+class CountingList(list):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.iterations = 0
+
+    def __iter__(self):
+        self.iterations += 1
+        return super().__iter__()
+
+
+def test_tiers():
+    tiers = list(search.iter_maybes("rest_api", PAGE_NAMES))
+    assert tiers == [(["rest_api"], False), (["rest-api", "restapi"], False), (["resp_api"], True)]
+
+
+def test_lazy_tiers(spy):
+    fuzzy_calls = spy(search, "fuzzy")
+    collection = CountingList(PAGE_NAMES)
+    tiers = search.iter_maybes("rest", collection)
+    assert next(tiers) == (["restructuredtext", "rest_api", "rest-api", "restapi"], False)
+    assert collection.iterations == 1
+    assert fuzzy_calls == []
+
+    # Nothing was left for the separator-insensitive tier, so the next one is the last
+    maybes, is_last = next(tiers)
+    assert is_last
+    assert len(fuzzy_calls) == 1
+    assert set(maybes).isdisjoint(["restructuredtext", "rest_api", "rest-api", "restapi"])
+
+
+def test_patterns_are_cached():
+    search._separator_insensitive_pattern.cache_clear()
+    list(search.iter_maybes("rest.api", PAGE_NAMES))
+    list(search.iter_maybes("rest.api", PAGE_NAMES))
+    assert search._separator_insensitive_pattern.cache_info().misses == 1
+
+
+def test_keyword_regexps():
+    # A keyword that's a valid regexp is used as one
+    tiers = search.iter_maybes("res[pt]_api", PAGE_NAMES)
+    assert next(tiers) == ([], False)
+    assert next(tiers) == (["rest_api", "rest-api", "restapi", "resp_api"], False)
+
+    # So is one whose separators can't be made optional
+    tiers = search.iter_maybes("foo.*bar", ["foo_x_bar", "foobar", "barfoo"])
+    assert next(tiers) == ([], False)
+    assert next(tiers) == (["foo_x_bar", "foobar"], False)
+
+    # Otherwise it's matched literally, with or without separators
+    collection = ["rest(api", "rest(-api", "rest_api"]
+    tiers = search.iter_maybes("rest(_api", collection)
+    assert next(tiers) == ([], False)
+    assert next(tiers) == (["rest(api", "rest(-api"], False)
@@ -0,0 +1,47 @@
+"""
+search.Matches keeps the best (lowest scoring) maxsize items, with stable ties.
+"""
+
+import random
+
+from termwiki.search import Matches
+
+
+def test_keeps_best_within_maxsize():
+    matches = Matches(maxsize=3)
+    for item, score in [("d", 4), ("a", 1), ("e", 5), ("c", 3), ("b", 2)]:
+        matches.append(item, score)
+    assert matches.count == len(matches) == 3
+    assert matches.sorted() == [(1, "a"), (2, "b"), (3, "c")]
+    assert matches.best_score == 1
+    assert matches.worst_score == 3
+    assert matches.best() == ["a"]
+
+
+def test_ties_are_stable_and_bounded():
+    matches = Matches(maxsize=3)
+    for item in ["first", "second", "third", "fourth"]:
+        matches.append(item, 1.0)
+    assert matches.best() == ["first", "second", "third"]
+
+    matches.append("better", 0.5)
+    assert matches.sorted() == [(0.5, "better"), (1.0, "first"), (1.0, "second")]
+    assert matches.best() == ["better"]
+    assert matches.matches == {0.5: ["better"], 1.0: ["first", "second"]}
+
+
+def test_empty():
+    matches = Matches(maxsize=5)
+    assert not matches
+    assert matches.best() is None
+    assert matches.worst_score == 0
+
+
+def test_same_as_sorting_everything():
+    rng = random.Random(0)
+    scored_items = [(f"item_{i}", rng.randint(0, 50) / 10) for i in range(1_000)]
+    matches = Matches(maxsize=10)
+    for item, score in scored_items:
+        matches.append(item, score)
+    expected = sorted(scored_items, key=lambda scored_item: scored_item[1])[:10]
+    assert matches.sorted() == [(score, item) for item, score in expected]
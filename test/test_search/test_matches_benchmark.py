@@ -0,0 +1,39 @@
+"""
+Appending to search.Matches is O(log maxsize), so appending n candidates scales linearly,
+up to 100k candidates. The assertion only catches superlinear scaling.
+A benchmark, so it only runs with --benchmark.
+"""
+
+import random
+import time
+
+import pytest
+
+from termwiki.search import Matches
+
+pytestmark = pytest.mark.benchmark
+
+CANDIDATE_COUNTS = [1_000, 10_000, 100_000]
+
+
+def append_all(scored_items: list[tuple[str, float]], maxsize: int) -> float:
+    """Best of 3, in seconds."""
+    durations = []
+    for _ in range(3):
+        matches = Matches(maxsize=maxsize)
+        start = time.perf_counter()
+        for item, score in scored_items:
+            matches.append(item, score)
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+@pytest.mark.parametrize("maxsize", [5, 100])
+def test_scales_linearly(maxsize):
+    rng = random.Random(0)
+    durations = {}
+    for candidate_count in CANDIDATE_COUNTS:
+        # Few distinct scores, like search.fuzzy's, so there are many ties
+        scored_items = [(f"candidate_{i}", rng.randint(0, 40) / 4) for i in range(candidate_count)]
+        durations[candidate_count] = append_all(scored_items, maxsize)
+    assert durations[100_000] < durations[1_000] * 100 * 3, durations